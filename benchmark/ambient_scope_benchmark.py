@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from meta_di import ContainerBuilder
+
+REQUESTS = 50_000
+
+
+class Config:
+    pass
+
+
+class Session:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class UserRepository:
+    def __init__(self, session: Session) -> None:
+        pass
+
+
+class OrderRepository:
+    def __init__(self, session: Session) -> None:
+        pass
+
+
+def build(ambient_scopes: bool):
+    return (
+        ContainerBuilder(ambient_scopes=ambient_scopes)
+        .add_singleton(Config)
+        .add_scoped(Session)
+        .add_transient(UserRepository)
+        .add_transient(OrderRepository)
+        .build()
+    )
+
+
+async def explicit_request(container) -> None:
+    async with container as scoped_container:
+        await explicit_handler(scoped_container)
+
+
+async def explicit_handler(scoped_container) -> None:
+    scoped_container.get(UserRepository)
+    scoped_container.get(OrderRepository)
+
+
+async def ambient_request(container) -> None:
+    async with container:
+        await ambient_handler(container)
+
+
+async def ambient_handler(container) -> None:
+    container.get(UserRepository)
+    container.get(OrderRepository)
+
+
+async def explicit_scope_only(container) -> None:
+    async with container:
+        pass
+
+
+async def run(request, container) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await request(container)
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+async def main() -> None:
+    explicit_container = build(ambient_scopes=False)
+    ambient_container = build(ambient_scopes=True)
+    print(f"{'scopes':<9} {'enter/exit (us)':>16} {'request (us)':>13}")
+    for name, request, container in (
+        ("explicit", explicit_request, explicit_container),
+        ("ambient", ambient_request, ambient_container),
+    ):
+        print(
+            f"{name:<9} {await run(explicit_scope_only, container):>16.2f} "
+            f"{await run(request, container):>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
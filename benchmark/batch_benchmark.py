@@ -0,0 +1,64 @@
+from timeit import timeit
+
+from meta_di import ContainerBuilder
+
+BATCH_SIZES = (2, 5, 10)
+N = 100_000
+
+
+class Config:
+    pass
+
+
+class Database:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class Session:
+    def __init__(self, database: Database) -> None:
+        pass
+
+
+def _make_handler_dependency(name: str) -> type:
+    def __init__(self, config: Config, session: Session) -> None:
+        pass
+
+    return type(name, (), {"__init__": __init__, "__module__": __name__})
+
+
+HANDLER_DEPENDENCIES = [_make_handler_dependency(f"Service{i}") for i in range(10)]
+globals().update({service.__name__: service for service in HANDLER_DEPENDENCIES})
+
+
+def build():
+    builder = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_singleton(Database)
+        .add_scoped(Session)
+    )
+    for service in HANDLER_DEPENDENCIES:
+        builder.add_transient(service)
+    return builder.build()
+
+
+def per_call_us(func) -> float:
+    return timeit(func, number=N) / N * 1_000_000
+
+
+if __name__ == "__main__":
+    print(
+        f"{'services':>9} {'get (us)':>10} {'get_many (us)':>14} {'compile_batch (us)':>19}"
+    )
+    for batch_size in BATCH_SIZES:
+        service_ids = tuple(HANDLER_DEPENDENCIES[:batch_size])
+        with build() as scoped_container:
+            get = scoped_container.get
+            batch = scoped_container.compile_batch(service_ids)
+            print(
+                f"{batch_size:>9} "
+                f"{per_call_us(lambda: [get(service_id) for service_id in service_ids]):>10.2f} "
+                f"{per_call_us(lambda: scoped_container.get_many(service_ids)):>14.2f} "
+                f"{per_call_us(batch):>19.2f}"
+            )
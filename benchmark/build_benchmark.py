@@ -0,0 +1,44 @@
+import time
+from statistics import median
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+from meta_di.code_formatter import DEFAULT_CODE_FORMATTER
+
+SIZES = (10, 100, 1_000)
+REPEAT = 5
+
+
+def build_formatted(builder: ContainerBuilder):
+    """Previous build path: format the generated code before executing it"""
+    globs = {}
+    exec(compile(builder.get_code(), "<container>", "exec"), globs)
+    return globs["Container"]
+
+
+def build_unformatted(builder: ContainerBuilder):
+    return builder.build_class()
+
+
+def measure_ms(func, builder: ContainerBuilder) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter_ns()
+        func(builder)
+        timings.append(time.perf_counter_ns() - start)
+    return median(timings) / 1_000_000
+
+
+if __name__ == "__main__":
+    if DEFAULT_CODE_FORMATTER is None:
+        print("black is not installed, formatted numbers equal unformatted ones")
+
+    print(f"{'services':>10} {'formatted (ms)':>16} {'unformatted (ms)':>18}")
+    for size in SIZES:
+        builder = make_graph(size).register(ContainerBuilder())
+        print(
+            f"{size:>10} "
+            f"{measure_ms(build_formatted, builder):>16.2f} "
+            f"{measure_ms(build_unformatted, builder):>18.2f}"
+        )
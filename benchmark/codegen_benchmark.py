@@ -0,0 +1,57 @@
+import time
+from statistics import median
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+
+SIZES = (125, 250, 500, 1_000)
+DEPTH = 8
+DIAMOND_DEPTHS = (8, 16, 32, 64)
+REPEAT = 5
+TRANSIENT_ONLY = (("transient", 1),)
+
+
+def measure_ms(func) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    return median(timings) / 1_000_000
+
+
+def build_class(graph):
+    # A new builder every time, builders reuse the class they built while nothing changes
+    return graph.register(ContainerBuilder()).build_class()
+
+
+if __name__ == "__main__":
+    print(
+        f"{'services':>10} {'codegen (ms)':>14} {'build (ms)':>12} {'code (KiB)':>12}"
+    )
+    for size in SIZES:
+        graph = make_graph(size, depth=DEPTH, lifecycle_mix=TRANSIENT_ONLY)
+        builder = graph.register(ContainerBuilder())
+        # pylint: disable=protected-access
+        gen_code = lambda: builder._code_generator._gen_code(
+            builder._service_descriptors_map, "Container"
+        )
+        print(
+            f"{size:>10} "
+            f"{measure_ms(gen_code):>14.2f} "
+            f"{measure_ms(lambda: build_class(graph)):>12.2f} "
+            f"{len(gen_code()) / 1024:>12,.0f}"
+        )
+
+    print()
+    print(f"{'depth':>10} {'build (ms)':>12} {'code (KiB)':>12}")
+    for depth in DIAMOND_DEPTHS:
+        # Both services of each layer depend on both services of the previous one
+        graph = make_graph(2 * depth, depth=depth, lifecycle_mix=TRANSIENT_ONLY)
+        code_size = graph.register(ContainerBuilder()).get_code_size()
+        print(
+            f"{depth:>10} "
+            f"{measure_ms(lambda: build_class(graph)):>12.2f} "
+            f"{code_size.characters / 1024:>12,.0f}"
+        )
@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from meta_di import ContainerBuilder
+
+THREADS = (1, 4, 16)
+RESOLVES_PER_THREAD = 200_000
+COLD_RUNS = 20
+
+
+class Config:
+    pass
+
+
+class ExpensiveService:
+    created = 0
+
+    def __init__(self, config: Config) -> None:
+        time.sleep(0.01)
+        ExpensiveService.created += 1
+
+
+def build(thread_safe: bool):
+    return (
+        ContainerBuilder(thread_safe=thread_safe)
+        .add_singleton(Config)
+        .add_singleton(ExpensiveService, preload=False)
+        .build()
+    )
+
+
+def hot_resolve_ns(thread_safe: bool, threads: int) -> float:
+    """Average latency of resolving an already created singleton"""
+    container = build(thread_safe)
+    container.get(ExpensiveService)
+    get = container.get
+    barrier = threading.Barrier(threads)
+
+    def run(_):
+        barrier.wait()
+        start = time.perf_counter_ns()
+        for _ in range(RESOLVES_PER_THREAD):
+            get(ExpensiveService)
+        return time.perf_counter_ns() - start
+
+    with ThreadPoolExecutor(threads) as executor:
+        elapsed = list(executor.map(run, range(threads)))
+    return sum(elapsed) / (threads * RESOLVES_PER_THREAD)
+
+
+def cold_creations(thread_safe: bool, threads: int) -> float:
+    """Average number of instances created when `threads` race on a cold singleton"""
+    ExpensiveService.created = 0
+    for _ in range(COLD_RUNS):
+        container = build(thread_safe)
+        barrier = threading.Barrier(threads)
+
+        def run(_):
+            barrier.wait()
+            container.get(ExpensiveService)
+
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(run, range(threads)))
+    return ExpensiveService.created / COLD_RUNS
+
+
+if __name__ == "__main__":
+    print(f"{'threads':>8} {'mode':>12} {'hot get (ns)':>14} {'instances created':>18}")
+    for threads in THREADS:
+        for thread_safe in (False, True):
+            print(
+                f"{threads:>8} "
+                f"{'thread_safe' if thread_safe else 'default':>12} "
+                f"{hot_resolve_ns(thread_safe, threads):>14.1f} "
+                f"{cold_creations(thread_safe, threads):>18.1f}"
+            )
@@ -0,0 +1,86 @@
+"""
+Simulates a pre-fork server: the master builds the container, then forks workers
+that resolve every singleton once. Reports the time each worker takes to warm up
+and the memory it does not share with the master (Linux only).
+"""
+import os
+import socket
+import sys
+import time
+
+from meta_di import ContainerBuilder, ForkPolicy
+
+WORKERS = 4
+
+
+class Catalog:
+    """
+    Read-only data, about 40 MiB
+    """
+
+    def __init__(self) -> None:
+        self.products = [f"product-{i}" * 4 for i in range(500_000)]
+
+
+class Connection:
+    def __init__(self) -> None:
+        self.socket = socket.socket()
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+def build(catalog_fork_policy: ForkPolicy):
+    return (
+        ContainerBuilder()
+        .add_singleton(Catalog, fork_policy=catalog_fork_policy)
+        .add_singleton(Connection, fork_policy=ForkPolicy.REINIT)
+        .build()
+    )
+
+
+def private_memory_kib() -> int:
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as file:
+        return sum(
+            int(line.split()[1])
+            for line in file
+            if line.startswith(("Private_Clean:", "Private_Dirty:"))
+        )
+
+
+def run_worker(container, write_fd: int) -> None:
+    start = time.perf_counter()
+    container.get(Catalog)
+    container.get(Connection)
+    warm_up_ms = (time.perf_counter() - start) * 1000
+    os.write(write_fd, f"{warm_up_ms:.3f} {private_memory_kib()}\n".encode())
+
+
+def fork_workers(container):
+    results = []
+    for _ in range(WORKERS):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            run_worker(container, write_fd)
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as file:
+            warm_up_ms, memory_kib = file.read().split()
+        os.waitpid(pid, 0)
+        results.append((float(warm_up_ms), int(memory_kib)))
+    return results
+
+
+if __name__ == "__main__":
+    if not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("requires os.fork and /proc/self/smaps_rollup")
+
+    print(f"{'Catalog':<8} {'warm up (ms)':>13} {'private memory (MiB)':>21}")
+    for policy in (ForkPolicy.REINIT, ForkPolicy.SHARE):
+        results = fork_workers(build(policy))
+        warm_up_ms = sum(result[0] for result in results) / WORKERS
+        memory_mib = sum(result[1] for result in results) / WORKERS / 1024
+        print(f"{policy.name:<8} {warm_up_ms:>13.2f} {memory_mib:>21.1f}")
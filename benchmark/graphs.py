@@ -0,0 +1,85 @@
+"""
+Synthetic service graphs used by the benchmarks.
+
+Service classes are created in this module's namespace so the generated
+container can import them like any other service.
+"""
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from meta_di import ContainerBuilder
+
+DEFAULT_LIFECYCLE_MIX = (("singleton", 1), ("scoped", 1), ("transient", 2))
+
+_graph_ids = itertools.count()
+
+
+@dataclass
+class SyntheticGraph:
+    services: List[type]
+    lifecycles: Dict[type, str]
+    layers: List[List[type]]
+
+    def register(self, builder: ContainerBuilder) -> ContainerBuilder:
+        for service in self.services:
+            getattr(builder, f"add_{self.lifecycles[service]}")(service)
+        return builder
+
+    @property
+    def roots(self) -> List[type]:
+        return self.layers[-1]
+
+
+def _make_service_class(name: str, dependencies: Sequence[type]) -> type:
+    params = "".join(
+        f", dep{index}: {dependency.__name__}"
+        for index, dependency in enumerate(dependencies)
+    )
+    source = f"class {name}:\n    def __init__(self{params}):\n        pass\n"
+    exec(source, globals())  # pylint: disable=exec-used
+    return globals()[name]
+
+
+def make_graph(
+    size: int,
+    depth: int = 4,
+    fan_out: int = 2,
+    lifecycle_mix: Sequence[Tuple[str, int]] = DEFAULT_LIFECYCLE_MIX,
+    seed: int = 0,
+) -> SyntheticGraph:
+    """
+    Creates `size` services split in `depth` layers.
+    Each service depends on up to `fan_out` random services of the previous layer.
+    Lifecycles are assigned round robin following the weights in `lifecycle_mix`.
+    """
+    rng = random.Random(seed)
+    graph_id = next(_graph_ids)
+    lifecycle_cycle = itertools.cycle(
+        [lifecycle for lifecycle, weight in lifecycle_mix for _ in range(weight)]
+    )
+
+    depth = max(1, min(depth, size))
+    layer_sizes = [size // depth + (1 if i < size % depth else 0) for i in range(depth)]
+
+    services: List[type] = []
+    lifecycles: Dict[type, str] = {}
+    layers: List[List[type]] = []
+    for layer_index, layer_size in enumerate(layer_sizes):
+        layer = []
+        for service_index in range(layer_size):
+            dependencies = []
+            if layers:
+                previous = layers[-1]
+                dependencies = rng.sample(previous, min(fan_out, len(previous)))
+
+            service = _make_service_class(
+                f"G{graph_id}L{layer_index}S{service_index}", dependencies
+            )
+            lifecycles[service] = next(lifecycle_cycle)
+            services.append(service)
+            layer.append(service)
+        layers.append(layer)
+
+    return SyntheticGraph(services=services, lifecycles=lifecycles, layers=layers)
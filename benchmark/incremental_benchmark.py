@@ -0,0 +1,43 @@
+import time
+from statistics import median
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+
+SIZES = (100, 400, 1_000)
+REPEAT = 5
+
+
+class Plugin:
+    pass
+
+
+def measure_ms(func) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    return median(timings) / 1_000_000
+
+
+def full_build(graph) -> None:
+    graph.register(ContainerBuilder()).add_transient(Plugin).build_class()
+
+
+def incremental_build(builder: ContainerBuilder) -> None:
+    builder.add_transient(Plugin).build_class()
+
+
+if __name__ == "__main__":
+    print(f"{'services':>10} {'full build (ms)':>16} {'add one service (ms)':>21}")
+    for size in SIZES:
+        graph = make_graph(size)
+        builder = graph.register(ContainerBuilder())
+        builder.build_class()
+        print(
+            f"{size:>10} "
+            f"{measure_ms(lambda: full_build(graph)):>16.2f} "
+            f"{measure_ms(lambda: incremental_build(builder)):>21.2f}"
+        )
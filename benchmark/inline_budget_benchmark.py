@@ -0,0 +1,49 @@
+import time
+from statistics import median
+from timeit import timeit
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+
+SIZE = 400
+DEPTH = 8
+REPEAT = 5
+N = 200
+BUDGETS = (None, 64, 16, 4, 1)
+TRANSIENT_ONLY = (("transient", 1),)
+
+
+def build_ms(builder: ContainerBuilder) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter_ns()
+        builder.build_class()
+        timings.append(time.perf_counter_ns() - start)
+    return median(timings) / 1_000_000
+
+
+def get_roots_us(container, roots) -> float:
+    get = container.get
+    return (
+        timeit(lambda: [get(root) for root in roots], number=N)
+        / (N * len(roots))
+        * 1_000_000
+    )
+
+
+if __name__ == "__main__":
+    graph = make_graph(SIZE, depth=DEPTH, lifecycle_mix=TRANSIENT_ONLY)
+    print(
+        f"{'max size':>9} {'code (KiB)':>11} {'outlined':>9} {'build (ms)':>11} {'get root (us)':>14}"
+    )
+    for budget in BUDGETS:
+        builder = graph.register(ContainerBuilder(inline_max_size=budget))
+        code_size = builder.get_code_size()
+        print(
+            f"{str(budget):>9} "
+            f"{code_size.characters / 1024:>11,.0f} "
+            f"{code_size.outlined_services:>9} "
+            f"{build_ms(builder):>11.2f} "
+            f"{get_roots_us(builder.build(), graph.roots):>14.2f}"
+        )
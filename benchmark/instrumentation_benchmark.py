@@ -0,0 +1,23 @@
+from timeit import timeit
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+
+SIZE = 100
+N = 20_000
+
+
+def get_roots_ns(container, roots) -> float:
+    with container as scoped_container:
+        get = scoped_container.get
+        elapsed = timeit(lambda: [get(root) for root in roots], number=N)
+    return elapsed / (N * len(roots)) * 1_000_000_000
+
+
+if __name__ == "__main__":
+    graph = make_graph(SIZE)
+    print(f"{'instrument':>11} {'get root (ns)':>14}")
+    for instrument in (False, True):
+        container = graph.register(ContainerBuilder(instrument=instrument)).build()
+        print(f"{str(instrument):>11} {get_roots_ns(container, graph.roots):>14.1f}")
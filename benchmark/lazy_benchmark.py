@@ -0,0 +1,92 @@
+"""
+Resolves a transient handler whose heavy dependency (a transient exporter with its own
+transient dependencies) is only used by one request in twenty, injected eagerly or through `Lazy[T]`.
+"""
+from timeit import timeit
+
+from meta_di import ContainerBuilder, Lazy
+
+N = 200_000
+USED_EVERY = 20
+
+
+class Config:
+    pass
+
+
+class Templates:
+    def __init__(self, config: Config) -> None:
+        self.cache = {}
+
+
+class Fonts:
+    def __init__(self, config: Config) -> None:
+        self.cache = {}
+
+
+class Renderer:
+    def __init__(self, templates: Templates, fonts: Fonts) -> None:
+        self.buffer = bytearray(4096)
+
+
+class Exporter:
+    def __init__(self, renderer: Renderer, config: Config) -> None:
+        self.renderer = renderer
+
+
+class Repository:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class EagerHandler:
+    def __init__(self, repository: Repository, exporter: Exporter) -> None:
+        self.exporter = exporter
+
+    def handle(self, export: bool) -> None:
+        if export:
+            self.exporter.renderer.buffer[0] = 1
+
+
+class LazyHandler:
+    def __init__(self, repository: Repository, exporter: Lazy[Exporter]) -> None:
+        self.exporter = exporter
+
+    def handle(self, export: bool) -> None:
+        if export:
+            self.exporter.get().renderer.buffer[0] = 1
+
+
+def build():
+    return (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_transient(Templates)
+        .add_transient(Fonts)
+        .add_transient(Renderer)
+        .add_transient(Exporter)
+        .add_transient(Repository)
+        .add_transient(EagerHandler)
+        .add_transient(LazyHandler)
+        .build()
+    )
+
+
+def per_request_us(container, handler_class) -> float:
+    get = container.get
+    requests = iter(range(N))
+
+    def request():
+        get(handler_class).handle(next(requests) % USED_EVERY == 0)
+
+    return timeit(request, number=N) / N * 1_000_000
+
+
+if __name__ == "__main__":
+    container = build()
+    print(f"{'handler':<8} {'resolve only (us)':>18} {'request (us)':>13}")
+    for name, handler_class in (("eager", EagerHandler), ("lazy", LazyHandler)):
+        get = container.get
+        resolve_us = timeit(lambda: get(handler_class), number=N) / N * 1_000_000
+        request_us = per_request_us(container, handler_class)
+        print(f"{name:<8} {resolve_us:>18.2f} {request_us:>13.2f}")
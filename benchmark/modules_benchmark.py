@@ -0,0 +1,98 @@
+"""
+Simulates a monorepo where 30 teams own 20 services each, all depending on a shared session.
+Compares building every service into one container class with building the module of the team
+that changed and composing it with the prebuilt modules of the other teams.
+Also reports resolving a service of a module that imports the session.
+"""
+from timeit import repeat
+
+from meta_di import CompositeContainer, ContainerBuilder
+
+TEAMS = 30
+SERVICES_PER_TEAM = 20
+N = 200_000
+
+
+class Database:
+    pass
+
+
+class Session:
+    def __init__(self, database: Database) -> None:
+        pass
+
+
+def create_team_services(team):
+    services = []
+    for i in range(SERVICES_PER_TEAM):
+
+        def __init__(self, session: Session) -> None:
+            pass
+
+        service_class = type(
+            f"Team{team}Service{i}",
+            (),
+            {"__module__": __name__, "__init__": __init__},
+        )
+        globals()[service_class.__name__] = service_class
+        services.append(service_class)
+    return services
+
+
+TEAM_SERVICES = [create_team_services(team) for team in range(TEAMS)]
+
+
+def add_team_services(builder, team):
+    for service_class in TEAM_SERVICES[team]:
+        builder.add_transient(service_class)
+    return builder
+
+
+def build_monolith():
+    builder = ContainerBuilder().add_singleton(Database).add_scoped(Session)
+    for team in range(TEAMS):
+        add_team_services(builder, team)
+    return builder.build()
+
+
+def build_database_module():
+    return (
+        ContainerBuilder()
+        .add_singleton(Database)
+        .add_scoped(Session)
+        .build_module("database", exports=[Session])
+    )
+
+
+def build_team_module(team):
+    builder = add_team_services(ContainerBuilder().add_import(Session), team)
+    return builder.build_module(f"team{team}", exports=TEAM_SERVICES[team])
+
+
+if __name__ == "__main__":
+    modules = [build_database_module()] + [
+        build_team_module(team) for team in range(TEAMS)
+    ]
+
+    def rebuild_one_module():
+        modules[1] = build_team_module(0)
+        return CompositeContainer(modules)
+
+    monolith_ms = min(repeat(build_monolith, number=1, repeat=5)) * 1000
+    module_ms = min(repeat(rebuild_one_module, number=1, repeat=5)) * 1000
+    print(f"{'build':<10} {'time (ms)':>10}")
+    print(f"{'monolith':<10} {monolith_ms:>10.1f}")
+    print(f"{'module':<10} {module_ms:>10.1f}")
+    print()
+
+    service_class = TEAM_SERVICES[0][0]
+    print(f"{'container':<10} {'get (us)':>9}")
+    for name, container in (
+        ("monolith", build_monolith()),
+        ("composite", CompositeContainer(modules)),
+    ):
+        get = container.get
+        get_us = (
+            min(repeat(lambda: get(service_class), number=N, repeat=5)) / N * 1_000_000
+        )
+        print(f"{name:<10} {get_us:>9.2f}")
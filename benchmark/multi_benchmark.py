@@ -0,0 +1,80 @@
+"""
+Compares resolving a pipeline of 5 middlewares by requesting each of them by hand
+with resolving the collection registered with `multi=True` in one call,
+with transient and singleton middlewares.
+"""
+from timeit import timeit
+from typing import Sequence
+
+from meta_di import ContainerBuilder
+
+N = 200_000
+
+
+class Config:
+    pass
+
+
+class Middleware:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class Auth(Middleware):
+    pass
+
+
+class Cors(Middleware):
+    pass
+
+
+class Gzip(Middleware):
+    pass
+
+
+class Logging(Middleware):
+    pass
+
+
+class Timing(Middleware):
+    pass
+
+
+MIDDLEWARES = (Auth, Cors, Gzip, Logging, Timing)
+
+
+class Pipeline:
+    def __init__(self, middlewares: Sequence[Middleware]) -> None:
+        self.middlewares = middlewares
+
+
+def build(add_service_name: str):
+    builder = ContainerBuilder().add_singleton(Config).add_transient(Pipeline)
+    for middleware in MIDDLEWARES:
+        getattr(builder, add_service_name)(middleware)
+        getattr(builder, add_service_name)(Middleware, middleware, multi=True)
+    return builder.build()
+
+
+def per_call_us(func) -> float:
+    return timeit(func, number=N) / N * 1_000_000
+
+
+if __name__ == "__main__":
+    print(
+        f"{'middlewares':<12} {'by hand (us)':>13} {'get_all (us)':>13} {'injected (us)':>14}"
+    )
+    for add_service_name in ("add_transient", "add_singleton"):
+        container = build(add_service_name)
+        get = container.get
+
+        def by_hand():
+            Pipeline([get(middleware) for middleware in MIDDLEWARES])
+
+        by_hand_us = per_call_us(by_hand)
+        get_all_us = per_call_us(lambda: Pipeline(container.get_all(Middleware)))
+        injected_us = per_call_us(lambda: get(Pipeline))
+        lifecycle = add_service_name[len("add_") :]
+        print(
+            f"{lifecycle:<12} {by_hand_us:>13.2f} {get_all_us:>13.2f} {injected_us:>14.2f}"
+        )
@@ -0,0 +1,97 @@
+"""
+Simulates a test suite that swaps the repository of a 30 service graph for a fake in every test:
+by building a new container with the fake, or by overriding it in instances of one class built
+with `overrides=True`. Also reports what overrides cost when resolving a service.
+"""
+from timeit import repeat, timeit
+from typing import Any, Callable
+
+from meta_di import ContainerBuilder
+
+TESTS = 50
+N = 200_000
+
+
+class Config:
+    pass
+
+
+class Repository:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class FakeRepository:
+    pass
+
+
+def create_fake_repository() -> FakeRepository:
+    return FakeRepository()
+
+
+def create_services(count):
+    services = []
+    for i in range(count):
+
+        def __init__(self, repository: Repository, config: Config) -> None:
+            pass
+
+        service_class = type(
+            f"Service{i}", (), {"__module__": __name__, "__init__": __init__}
+        )
+        globals()[service_class.__name__] = service_class
+        services.append(service_class)
+    return services
+
+
+SERVICES = create_services(28)
+
+
+def create_handler_class():
+    def __init__(self, service0, service1) -> None:
+        pass
+
+    __init__.__annotations__.update(service0=SERVICES[0], service1=SERVICES[1])
+    return type("Handler", (), {"__module__": __name__, "__init__": __init__})
+
+
+Handler = create_handler_class()
+
+
+def create_builder(repository_provider: Callable[..., Any] = Repository, **options):
+    builder = ContainerBuilder(**options)
+    builder.add_singleton(Config).add_transient(Repository, repository_provider)
+    for service_class in SERVICES:
+        builder.add_transient(service_class)
+    return builder.add_transient(Handler)
+
+
+def run_tests_with_build():
+    for _ in range(TESTS):
+        container = create_builder(create_fake_repository).build()
+        container.get(Handler)
+
+
+def run_tests_with_override(container_class):
+    for _ in range(TESTS):
+        container = container_class()
+        with container.override(Repository, FakeRepository()):
+            container.get(Handler)
+
+
+if __name__ == "__main__":
+    build_ms = timeit(run_tests_with_build, number=1) * 1000
+    container_class = create_builder(overrides=True).build_class()
+    override_ms = (
+        timeit(lambda: run_tests_with_override(container_class), number=1) * 1000
+    )
+    print(f"{'suite':<10} {f'{TESTS} tests (ms)':>14}")
+    print(f"{'build':<10} {build_ms:>14.1f}")
+    print(f"{'override':<10} {override_ms:>14.2f}")
+    print()
+
+    print(f"{'overrides':<10} {'get(Handler) (us)':>18}")
+    for overrides in (False, True):
+        get = create_builder(overrides=overrides).build().get
+        get_us = min(repeat(lambda: get(Handler), number=N, repeat=5)) / N * 1_000_000
+        print(f"{str(overrides):<10} {get_us:>18.2f}")
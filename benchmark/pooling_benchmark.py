@@ -0,0 +1,46 @@
+from timeit import timeit
+
+from meta_di import ContainerBuilder
+
+N = 50_000
+
+
+class Parser:
+    """
+    Expensive to create, e.g. it compiles a grammar and preallocates buffers
+    """
+
+    def __init__(self) -> None:
+        self.tables = [[0] * 64 for _ in range(64)]
+        self.buffer = bytearray(16 * 1024)
+
+
+def reset_parser(parser: Parser) -> None:
+    parser.buffer[:16] = bytes(16)
+
+
+def build(lifecycle: str):
+    builder = ContainerBuilder()
+    if lifecycle == "pooled":
+        return builder.add_pooled(Parser, reset=reset_parser).build()
+    return builder.add_scoped(Parser).build()
+
+
+def per_request_us(container) -> float:
+    def request():
+        with container as scoped_container:
+            scoped_container.get(Parser)
+
+    return timeit(request, number=N) / N * 1_000_000
+
+
+if __name__ == "__main__":
+    print(f"{'lifecycle':<10} {'request (us)':>13} {'misses':>7}")
+    for lifecycle in ("scoped", "pooled"):
+        container = build(lifecycle)
+        elapsed = per_request_us(container)
+        misses = N
+        if lifecycle == "pooled":
+            # Generated by containers with pooled services, ContainerProto does not declare it
+            misses = container.pool_stats()[Parser].misses  # type: ignore
+        print(f"{lifecycle:<10} {elapsed:>13.2f} {misses:>7}")
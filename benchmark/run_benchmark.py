@@ -92,6 +92,7 @@ class Benchmark:
             .add_singleton(Config)
             .build()
         )
+        self.meta_di_foo_service_resolver = self.meta_di_container.resolver(FooService)
 
     def _setup_simple_container(self):
         self._simple_container = SimpleContaner(
@@ -157,6 +158,9 @@ class Benchmark:
     def meta_di(self):
         return self.meta_di_container.get(FooService)
 
+    def meta_di_resolver(self):
+        return self.meta_di_foo_service_resolver()
+
     def rodi(self):
         return self.rodi_container.resolve(FooService)
 
@@ -183,6 +187,11 @@ if __name__ == "__main__":
         (timeit(b.meta_di, number=N, timer=CLOCK)) / N,
         "ns",
     )
+    print(
+        "MetaDI Container resolver (Pure Python)",
+        (timeit(b.meta_di_resolver, number=N, timer=CLOCK)) / N,
+        "ns",
+    )
     print(
         "Dependency Injector Container (Cython)",
         (timeit(b.dependency_injector, number=N, timer=CLOCK)) / N,
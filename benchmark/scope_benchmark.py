@@ -0,0 +1,31 @@
+import sys
+from timeit import timeit
+
+from graphs import make_graph
+
+from meta_di import ContainerBuilder
+
+SIZES = (10, 100, 400, 1_000)
+N = 100_000
+
+
+def enter_and_exit_scope(container):
+    with container as scoped_container:
+        return scoped_container
+
+
+def scopes_per_second(container) -> float:
+    return N / timeit(lambda: enter_and_exit_scope(container), number=N)
+
+
+if __name__ == "__main__":
+    pool_sizes = (0, 8) if "--no-pool" not in sys.argv else (0,)
+    print(f"{'services':>10} {'pool':>6} {'scopes/s':>12}")
+    for size in SIZES:
+        graph = make_graph(size)
+        for pool_size in pool_sizes:
+            builder = ContainerBuilder()
+            if pool_size:
+                builder = ContainerBuilder(scope_pool_size=pool_size)
+            container = graph.register(builder).build()
+            print(f"{size:>10} {pool_size:>6} {scopes_per_second(container):>12,.0f}")
@@ -0,0 +1,65 @@
+"""
+Compares dict and slot storage of cached instances: resolving a cached singleton and a cached scoped
+service from a scope, and the memory taken by scopes that created 20 scoped services each.
+"""
+import tracemalloc
+from timeit import repeat
+
+from meta_di import ContainerBuilder
+
+N = 500_000
+SCOPES = 1_000
+
+
+class Config:
+    pass
+
+
+def create_services(count):
+    services = []
+    for i in range(count):
+        service_class = type(f"Service{i}", (), {"__module__": __name__})
+        globals()[service_class.__name__] = service_class
+        services.append(service_class)
+    return services
+
+
+SERVICES = create_services(20)
+
+
+def create_container(slots):
+    builder = ContainerBuilder(slots=slots).add_singleton(Config)
+    for service_class in SERVICES:
+        builder.add_scoped(service_class)
+    return builder.build()
+
+
+def measure_scopes_kib(container):
+    scopes = []
+    tracemalloc.start()
+    for _ in range(SCOPES):
+        scope = container.create_scope()
+        for service_class in SERVICES:
+            scope.get(service_class)
+        scopes.append(scope)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / 1024
+
+
+if __name__ == "__main__":
+    print(
+        f"{'storage':<8} {'singleton (us)':>15} {'scoped (us)':>12} {f'{SCOPES} scopes (KiB)':>18}"
+    )
+    for slots in (False, True):
+        container = create_container(slots)
+        scope = container.create_scope()
+        get_config = scope.resolver(Config)
+        get_service = scope.resolver(SERVICES[0])
+        get_service()
+        singleton_us = min(repeat(get_config, number=N, repeat=5)) / N * 1_000_000
+        scoped_us = min(repeat(get_service, number=N, repeat=5)) / N * 1_000_000
+        scopes_kib = measure_scopes_kib(container)
+        print(
+            f"{'slots' if slots else 'dict':<8} {singleton_us:>15.3f} {scoped_us:>12.3f} {scopes_kib:>18.1f}"
+        )
@@ -0,0 +1,305 @@
+"""
+Scaling benchmark suite.
+
+Measures every phase of building and using a container for synthetic graphs of
+increasing size, and writes the results as JSON. Results can be compared with a
+stored baseline, exiting with 1 when a metric regressed:
+
+    PYTHONPATH=.. python suite.py --output results.json
+    PYTHONPATH=.. python suite.py --baseline results.json --tolerance 0.25
+
+Only results of the same configuration and Python implementation are compared.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from statistics import median
+from timeit import timeit
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from graphs import DEFAULT_LIFECYCLE_MIX, SyntheticGraph, make_graph
+
+from meta_di import ContainerBuilder
+from meta_di.code_formatter import DEFAULT_CODE_FORMATTER
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000)
+# black takes seconds per thousand services, formatting is skipped for bigger graphs
+DEFAULT_MAX_FORMAT_SIZE = 1_000
+GET_SAMPLE_SIZE = 100
+GET_CALLS = 100_000
+SCOPES = 20_000
+
+# Metrics where a higher value is better, every other metric is a cost
+HIGHER_IS_BETTER = ("scopes_per_s",)
+# Keys of the results that must be equal to the baseline's for the metrics to be comparable
+COMPARABLE_KEYS = ("implementation", "config")
+
+
+def parse_lifecycle_mix(value: str) -> Tuple[Tuple[str, int], ...]:
+    """
+    Parses a lifecycle mix such as `singleton=1,scoped=1,transient=2`
+    """
+    mix = []
+    for item in value.split(","):
+        lifecycle, _, weight = item.partition("=")
+        if lifecycle not in ("singleton", "scoped", "transient"):
+            raise argparse.ArgumentTypeError(f"unknown lifecycle {lifecycle!r}")
+        mix.append((lifecycle, int(weight or 1)))
+    return tuple(mix)
+
+
+def measure_ms(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    return median(timings) / 1_000_000
+
+
+def new_builder(graph: SyntheticGraph) -> ContainerBuilder:
+    # The formatter is only used by get_code, which is measured as codegen here
+    return graph.register(ContainerBuilder(code_formatter=None))
+
+
+def measure_peak_memory_kib(graph: SyntheticGraph) -> float:
+    """
+    Peak memory allocated while registering, building and instantiating a container
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        new_builder(graph).build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure_get_ns(container: Any, graph: SyntheticGraph) -> float:
+    """
+    Average latency of `get`, for a sample of services of every layer, from a scoped container
+    """
+    step = max(1, len(graph.services) // GET_SAMPLE_SIZE)
+    service_ids = graph.services[::step]
+    number = max(1, GET_CALLS // len(service_ids))
+    with container as scoped_container:
+        get = scoped_container.get
+        elapsed = timeit(
+            lambda: [get(service_id) for service_id in service_ids], number=number
+        )
+    return elapsed / (number * len(service_ids)) * 1_000_000_000
+
+
+def measure_scopes_per_s(container: Any) -> float:
+    def enter_and_exit_scope():
+        with container as scoped_container:
+            return scoped_container
+
+    return SCOPES / timeit(enter_and_exit_scope, number=SCOPES)
+
+
+def run_size(
+    size: int,
+    depth: int,
+    fan_out: int,
+    lifecycle_mix: Sequence[Tuple[str, int]],
+    repeat: int,
+    max_format_size: int,
+) -> Dict[str, Optional[float]]:
+    graph = make_graph(size, depth=depth, fan_out=fan_out, lifecycle_mix=lifecycle_mix)
+    builder = new_builder(graph)
+    code = builder.get_code()
+    code_object = compile(code, "<container>", "exec")
+
+    def exec_code():
+        exec(code_object, {})  # pylint: disable=exec-used
+
+    container_class = builder.build_class()
+
+    format_ms = None
+    if DEFAULT_CODE_FORMATTER is not None and size <= max_format_size:
+        format_ms = measure_ms(lambda: DEFAULT_CODE_FORMATTER.format(code), repeat)
+
+    container = container_class()
+    return {
+        "register_ms": measure_ms(lambda: new_builder(graph), repeat),
+        "codegen_ms": measure_ms(builder.get_code, repeat),
+        "format_ms": format_ms,
+        "compile_ms": measure_ms(lambda: compile(code, "<container>", "exec"), repeat),
+        "exec_ms": measure_ms(exec_code, repeat),
+        "preload_ms": measure_ms(container_class, repeat),
+        "scopes_per_s": measure_scopes_per_s(container),
+        "get_ns": measure_get_ns(container, graph),
+        "peak_memory_kib": measure_peak_memory_kib(graph),
+        "code_kib": len(code) / 1024,
+    }
+
+
+def get_mismatches(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Returns a description of every setting of the results that differs from the baseline,
+    whose metrics are not comparable then
+    """
+    return [
+        f"{key}: {results.get(key)!r} (baseline {baseline.get(key)!r})"
+        for key in COMPARABLE_KEYS
+        if results.get(key) != baseline.get(key)
+    ]
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Returns a description of every metric that regressed more than `tolerance` (a ratio)
+    with respect to the baseline. Only sizes and metrics present in both are compared.
+
+    Raises ValueError if the results and the baseline have different settings, see `get_mismatches`
+    """
+    mismatches = get_mismatches(results, baseline)
+    if mismatches:
+        raise ValueError(f"results are not comparable, {'; '.join(mismatches)}")
+
+    baseline_by_size = {str(run["size"]): run["metrics"] for run in baseline["runs"]}
+    regressions = []
+    for run in results["runs"]:
+        baseline_metrics = baseline_by_size.get(str(run["size"]))
+        if baseline_metrics is None:
+            continue
+
+        for metric, value in run["metrics"].items():
+            baseline_value = baseline_metrics.get(metric)
+            if value is None or not baseline_value:
+                continue
+
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < baseline_value / (1 + tolerance)
+            else:
+                regressed = value > baseline_value * (1 + tolerance)
+
+            if regressed:
+                regressions.append(
+                    f"{metric} for {run['size']} services: "
+                    f"{value:,.2f} (baseline {baseline_value:,.2f})"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    metrics = list(results["runs"][0]["metrics"]) if results["runs"] else []
+    print(f"{'services':>10} " + " ".join(f"{metric:>16}" for metric in metrics))
+    for run in results["runs"]:
+        values = (
+            f"{'-':>16}" if value is None else f"{value:>16,.2f}"
+            for value in run["metrics"].values()
+        )
+        print(f"{run['size']:>10} " + " ".join(values))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__ and __doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated number of services of each graph",
+    )
+    parser.add_argument("--depth", type=int, default=4, help="Layers of each graph")
+    parser.add_argument(
+        "--fan-out", type=int, default=2, help="Dependencies of each service"
+    )
+    parser.add_argument(
+        "--lifecycle-mix",
+        type=parse_lifecycle_mix,
+        default=DEFAULT_LIFECYCLE_MIX,
+        help="Lifecycle weights, e.g. singleton=1,scoped=1,transient=2",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs of each timing, the median is kept"
+    )
+    parser.add_argument(
+        "--max-format-size",
+        type=int,
+        default=DEFAULT_MAX_FORMAT_SIZE,
+        help="Biggest graph whose code is formatted",
+    )
+    parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "--baseline",
+        help="JSON results to compare with, exits with 1 on regressions and 2 when "
+        "the configuration or Python implementation differs",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed regression with respect to the baseline, as a ratio",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    settings: Dict[str, Any] = {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "config": {
+            "depth": args.depth,
+            "fan_out": args.fan_out,
+            "lifecycle_mix": dict(args.lifecycle_mix),
+            "repeat": args.repeat,
+        },
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        # Checked before running, a mismatch would make every comparison meaningless
+        mismatches = get_mismatches(settings, baseline)
+        if mismatches:
+            for mismatch in mismatches:
+                print(f"MISMATCH {mismatch}", file=sys.stderr)
+            print("results are not comparable with the baseline", file=sys.stderr)
+            return 2
+
+    results: Dict[str, Any] = {
+        **settings,
+        "runs": [
+            {
+                "size": size,
+                "metrics": run_size(
+                    size,
+                    args.depth,
+                    args.fan_out,
+                    args.lifecycle_mix,
+                    args.repeat,
+                    args.max_format_size,
+                ),
+            }
+            for size in sizes
+        ],
+    }
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
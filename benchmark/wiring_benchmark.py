@@ -0,0 +1,79 @@
+from timeit import timeit
+
+from meta_di import ContainerBuilder
+
+N = 200_000
+
+
+class Config:
+    pass
+
+
+class Database:
+    def __init__(self, config: Config) -> None:
+        pass
+
+
+class Session:
+    def __init__(self, database: Database) -> None:
+        pass
+
+
+class UserRepository:
+    def __init__(self, session: Session) -> None:
+        pass
+
+
+class OrderRepository:
+    def __init__(self, session: Session, config: Config) -> None:
+        pass
+
+
+class Request:
+    pass
+
+
+def handler(
+    request: Request,
+    config: Config,
+    users: UserRepository,
+    orders: OrderRepository,
+):
+    pass
+
+
+def build():
+    return (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_singleton(Database)
+        .add_scoped(Session)
+        .add_transient(UserRepository)
+        .add_transient(OrderRepository)
+        .build()
+    )
+
+
+def per_call_us(func) -> float:
+    return timeit(func, number=N) / N * 1_000_000
+
+
+if __name__ == "__main__":
+    request = Request()
+    with build() as scoped_container:
+        get = scoped_container.get
+
+        def handler_with_get():
+            handler(
+                request,
+                config=get(Config),
+                users=get(UserRepository),
+                orders=get(OrderRepository),
+            )
+
+        wired_handler = scoped_container.wire(handler)
+        print(f"{'get (us)':>10} {'wire (us)':>10}")
+        print(
+            f"{per_call_us(handler_with_get):>10.2f} "
+            f"{per_call_us(lambda: wired_handler(request)):>10.2f}"
+        )
@@ -1,13 +1,29 @@
 from .builder import ContainerBuilder
+from .code_cache import CodeCacheProto, FileCodeCache
 from .container_proto import ContainerProto
 from .exceptions import MetaDIException
-from .inspector import ArgNameInspector, InspectorProto, TypeHintInspector
+from .inspector import (
+    ArgNameInspector,
+    CachingInspector,
+    InspectorProto,
+    TypeHintInspector,
+)
+from .lazy import Lazy
+from .modules import CompositeContainer, ContainerModule
+from .service_descriptor import ForkPolicy
 
 __all__ = [
     "ContainerBuilder",
+    "CodeCacheProto",
+    "FileCodeCache",
     "ContainerProto",
     "MetaDIException",
     "InspectorProto",
     "TypeHintInspector",
     "ArgNameInspector",
+    "CachingInspector",
+    "ForkPolicy",
+    "Lazy",
+    "CompositeContainer",
+    "ContainerModule",
 ]
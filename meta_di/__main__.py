@@ -0,0 +1,5 @@
+import sys
+
+from meta_di.cli import main
+
+sys.exit(main())
@@ -0,0 +1,23 @@
+from typing import Any, Callable, Mapping, Sequence, Tuple
+
+from meta_di.exceptions import MissingServiceError
+
+
+def create_batch(
+    getter_map: Mapping[Any, Callable[[Any], Any]], service_ids: Sequence[Any]
+) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Creates a function that resolves all `service_ids` with their getters and returns them as a tuple.
+
+    Used by container classes that were not created by a CodeGenerator, e.g. ahead-of-time compiled
+    modules, which cannot generate fused batch functions.
+    """
+    try:
+        getters = tuple(getter_map[service_id] for service_id in service_ids)
+    except KeyError as error:
+        raise MissingServiceError(error.args[0]) from None
+
+    def batch(container: Any) -> Tuple[Any, ...]:
+        return tuple(getter(container) for getter in getters)
+
+    return batch
@@ -1,11 +1,20 @@
-from typing import Any, Dict, Generic, Optional, Set, Type
+import typing
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Type
 
+from meta_di.code_cache import CodeCacheProto
 from meta_di.code_formatter import DEFAULT_CODE_FORMATTER, CodeFormatterProto
-from meta_di.code_generator import CodeGenerator
+from meta_di.code_generator import CodeGenerator, CodeSizeReport
 from meta_di.container_proto import ContainerProto
-from meta_di.exceptions import CannotInferProvider
-from meta_di.inspector import InspectorProto, TypeHintInspector
-from meta_di.service_descriptor import ServiceDescriptor, ServiceLifecycle
+from meta_di.exceptions import (
+    CannotInferProvider,
+    MissingServiceError,
+    ServiceConflictError,
+)
+from meta_di.inspector import DEFAULT_INSPECTOR, InspectorProto
+from meta_di.lazy import Lazy, is_lazy_hint
+from meta_di.modules import ContainerModule, imported_service
+from meta_di.multi import get_collection_id, get_member_id
+from meta_di.service_descriptor import ForkPolicy, ServiceDescriptor, ServiceLifecycle
 from meta_di.typing import Provider_T, ServiceId_T
 
 
@@ -16,28 +25,78 @@ class ContainerBuilder(Generic[ServiceId_T]):
 
     def __init__(
         self,
-        inspector: InspectorProto[ServiceId_T] = TypeHintInspector(),
+        inspector: InspectorProto[ServiceId_T] = DEFAULT_INSPECTOR,
         code_formatter: Optional[CodeFormatterProto] = DEFAULT_CODE_FORMATTER,
         preload_singleton_instances: bool = True,
         container_svc_ids: Optional[Set[Any]] = None,
+        code_cache: Optional[CodeCacheProto] = None,
+        preload_workers: int = 0,
+        thread_safe: bool = False,
+        scope_pool_size: int = 0,
+        inline_max_depth: Optional[int] = 32,
+        inline_max_size: Optional[int] = None,
+        instrument: bool = False,
+        ambient_scopes: bool = False,
+        overrides: bool = False,
+        slots: bool = False,
     ) -> None:
         """
-        inspector: InspectorProto to use to inspect the dependencies of services. Defaults to TypeHintInspector
+        inspector: InspectorProto to use to inspect the dependencies of services.
+            Defaults to a TypeHintInspector wrapped in a CachingInspector shared by every builder
         code_formatter: CodeFormatterProto to use to format the generated code. Defaults to black if installed
-        preload_singleton_instances: If true, singleton instances will be created when the container is instantiated. Defaults to True
+        preload_singleton_instances: If true, singleton instances will be created when the container is instantiated. Can be overridden per service. Defaults to True
         container_svc_ids: Set of service identifiers that identify the container. Defaults to {ContainerProto, "di_container"}
+        code_cache: CodeCacheProto used to reuse compiled container code between processes, e.g. FileCodeCache. Defaults to None (no caching)
+        preload_workers: Number of threads used to preload independent singletons concurrently. Defaults to 0 (preload sequentially)
+        thread_safe: If true, singleton/scoped instances are created under a lock, so concurrent threads never create the same instance twice. Defaults to False
+        scope_pool_size: Maximum number of closed scoped containers kept to be reused by `create_scope`.
+            A scoped container must not be used after it is closed when this is set. Defaults to 0 (no pooling)
+        inline_max_depth: Maximum nesting of inlined transient constructors in a generated expression.
+            Deeper transients are created by calling their getter instead. None means no limit. Defaults to 32
+        inline_max_size: Maximum number of constructor calls inlined in a generated expression.
+            Bigger transients are created by calling their getter instead. Defaults to None (no limit)
+        instrument: If true, getters count resolutions and time the creation of instances, exposed by `container.stats()`.
+            The generated code is not changed at all when false. Defaults to False
+        ambient_scopes: If true, entering a scope with `with container:` or `async with container:` also makes it
+            the scope of the current context (thread or asyncio task): services requested to the root container
+            are resolved by that scope, so it does not have to be passed around. Defaults to False
+        overrides: If true, containers get an `override(service_id, instance_or_provider)` context manager,
+            e.g. to replace services with fakes in tests without building a new class. Getters check for overrides
+            and transients are not inlined, so it should not be enabled in production. Defaults to False
+        slots: If true, singleton and scoped instances are stored in a list with a fixed slot per service instead of
+            a dict keyed by service id, and containers have `__slots__`: cached instances are loaded by index and
+            scoped containers take less memory. Defaults to False
         """
         self._service_descriptors_map: Dict[
             ServiceId_T, ServiceDescriptor[ServiceId_T]
         ] = {}
 
         self._inspector = inspector
+        self._preload_singleton_instances = preload_singleton_instances
+        # Last class created from scratch and the services it was created with,
+        # later builds derive from it when only a few services changed
+        self._base_class: Optional[Type[ContainerProto]] = None
+        self._base_service_descriptors_map: Dict[
+            ServiceId_T, ServiceDescriptor[ServiceId_T]
+        ] = {}
+        self._changed_service_ids: Set[ServiceId_T] = set()
+        # Ids of the services registered with `multi=True` as each service id
+        self._member_ids: Dict[Any, List[Any]] = {}
 
         self._code_generator = CodeGenerator(
             inspector=inspector,
             code_formatter=code_formatter,
-            preload_singleton_instances=preload_singleton_instances,
             container_svc_ids=container_svc_ids,
+            code_cache=code_cache,
+            preload_workers=preload_workers,
+            thread_safe=thread_safe,
+            scope_pool_size=scope_pool_size,
+            inline_max_depth=inline_max_depth,
+            inline_max_size=inline_max_size,
+            instrument=instrument,
+            ambient_scopes=ambient_scopes,
+            overrides=overrides,
+            slots=slots,
         )
 
     def _add_service(
@@ -45,6 +104,11 @@ class ContainerBuilder(Generic[ServiceId_T]):
         service_id: ServiceId_T,
         provider: Optional[Provider_T] = None,
         lifecycle: ServiceLifecycle = ServiceLifecycle.TRANSIENT,
+        preload: bool = False,
+        pool_size: int = 0,
+        reset: Optional[Callable[[Any], Any]] = None,
+        fork_policy: ForkPolicy = ForkPolicy.SHARE,
+        multi: bool = False,
     ) -> "ContainerBuilder[ServiceId_T]":
         if provider is None:
             if not isinstance(service_id, type):
@@ -52,48 +116,271 @@ class ContainerBuilder(Generic[ServiceId_T]):
 
             provider = service_id
 
+        # str ids are their own collection id, so they cannot be both a service and a collection
+        if multi:
+            registered = self._service_descriptors_map.get(
+                get_collection_id(service_id)
+            )
+            if registered is not None and not registered.is_collection:
+                raise ServiceConflictError(
+                    service_id, "it is registered without multi=True"
+                )
+
+            member_ids = self._member_ids.setdefault(service_id, [])
+            member_id = get_member_id(service_id, len(member_ids))
+            self._add_descriptor(
+                member_id,
+                provider,
+                lifecycle,
+                preload,
+                pool_size,
+                reset,
+                fork_policy,
+                member_of=service_id,
+            )
+            member_ids.append(member_id)
+            self._add_collection(service_id)
+            return self
+
+        registered = self._service_descriptors_map.get(service_id)
+        if registered is not None and registered.is_collection:
+            raise ServiceConflictError(
+                service_id,
+                "it is the collection of services registered with multi=True",
+            )
+
+        self._add_descriptor(
+            service_id, provider, lifecycle, preload, pool_size, reset, fork_policy
+        )
+        return self
+
+    def _add_descriptor(
+        self,
+        service_id: Any,
+        provider: Provider_T,
+        lifecycle: ServiceLifecycle,
+        preload: bool,
+        pool_size: int,
+        reset: Optional[Callable[[Any], Any]],
+        fork_policy: ForkPolicy,
+        member_of: Any = None,
+    ) -> None:
         dependency_kwargs = self._inspector.get_dependencies(provider)
+        for dep in dependency_kwargs.values():
+            if is_lazy_hint(dep) and dep not in self._service_descriptors_map:
+                self._add_lazy(dep)
+
+        self._changed_service_ids.add(service_id)
         self._service_descriptors_map[service_id] = ServiceDescriptor(
             service_id=service_id,
             provider=provider,
             dependency_kwargs=dependency_kwargs,
             lifecycle=lifecycle,
+            preload=preload,
+            pool_size=pool_size,
+            reset=reset,
+            fork_policy=fork_policy,
+            member_of=member_of,
         )
 
-        return self
+    def _add_collection(self, service_id: Any) -> None:
+        """
+        Registers the collection of the services registered with `multi=True` as `service_id`.
+        The collection is cached like its members when they allow it: as a singleton when all of them are
+        singletons, or per scope when none of them is transient. Otherwise it is created on every request
+        """
+        members = [
+            self._service_descriptors_map[member_id]
+            for member_id in self._member_ids[service_id]
+        ]
+        lifecycle = ServiceLifecycle.TRANSIENT
+        if all(member.is_singleton for member in members):
+            lifecycle = ServiceLifecycle.SINGLETON
+        elif not any(member.is_transient for member in members):
+            lifecycle = ServiceLifecycle.SCOPED
+
+        collection_id = get_collection_id(service_id)
+        self._changed_service_ids.add(collection_id)
+        self._service_descriptors_map[collection_id] = ServiceDescriptor(
+            service_id=collection_id,
+            provider=tuple,
+            dependency_kwargs={
+                f"member{index}": member.service_id
+                for index, member in enumerate(members)
+            },
+            lifecycle=lifecycle,
+            preload=all(member.preload for member in members),
+            collection_of=service_id,
+        )
+
+    def _add_lazy(self, lazy_id: Any) -> None:
+        """
+        Registers the `Lazy[T]` handle injected into lazy dependencies on T.
+        Handles are transient, each dependent gets its own and resolves T on first use
+        """
+        self._changed_service_ids.add(lazy_id)
+        self._service_descriptors_map[lazy_id] = ServiceDescriptor(
+            service_id=lazy_id,
+            provider=Lazy,
+            dependency_kwargs={},
+            lifecycle=ServiceLifecycle.TRANSIENT,
+            lazy_of=typing.get_args(lazy_id)[0],
+        )
 
     def add_transient(
-        self, service_id: ServiceId_T, provider: Optional[Provider_T] = None
+        self,
+        service_id: ServiceId_T,
+        provider: Optional[Provider_T] = None,
+        multi: bool = False,
     ):
         """
         Register service_id as a transient service.
         This means that a new instance of this service will be created every time it is requested.
+
+        multi: If true, the service is added to the collection of services registered as service_id,
+            instead of replacing the service registered before. See `ContainerProto.get_all`. Defaults to False
         """
-        return self._add_service(service_id, provider, ServiceLifecycle.TRANSIENT)
+        return self._add_service(
+            service_id, provider, ServiceLifecycle.TRANSIENT, multi=multi
+        )
 
     def add_scoped(
-        self, service_id: ServiceId_T, provider: Optional[Provider_T] = None
+        self,
+        service_id: ServiceId_T,
+        provider: Optional[Provider_T] = None,
+        multi: bool = False,
     ):
         """
         Register service_id as a scoped service.
         This means that an instance of this container will only have one instance of this service within the same scope.
+
+        multi: If true, the service is added to the collection of services registered as service_id. Defaults to False
         """
-        return self._add_service(service_id, provider, ServiceLifecycle.SCOPED)
+        return self._add_service(
+            service_id, provider, ServiceLifecycle.SCOPED, multi=multi
+        )
 
     def add_singleton(
-        self, service_id: ServiceId_T, provider: Optional[Provider_T] = None
+        self,
+        service_id: ServiceId_T,
+        provider: Optional[Provider_T] = None,
+        preload: Optional[bool] = None,
+        fork_policy: ForkPolicy = ForkPolicy.SHARE,
+        multi: bool = False,
     ):
         """
         Register service_id as a singleton.
         This means that an instance of this container will only have one instance of this service.
+
+        preload: If true, the instance is created when the container is instantiated, otherwise on first use.
+        Singletons that preloaded singletons depend on are always preloaded. Defaults to preload_singleton_instances
+        fork_policy: With ForkPolicy.REINIT, processes forked from the one that created the instance drop it
+            and create their own on first use, along with the singletons that depend on it.
+            Defaults to ForkPolicy.SHARE (forked processes keep using the same instance)
+        multi: If true, the service is added to the collection of services registered as service_id. Defaults to False
         """
-        return self._add_service(service_id, provider, ServiceLifecycle.SINGLETON)
+        if preload is None:
+            preload = self._preload_singleton_instances
+        return self._add_service(
+            service_id,
+            provider,
+            ServiceLifecycle.SINGLETON,
+            preload,
+            fork_policy=fork_policy,
+            multi=multi,
+        )
+
+    def add_pooled(
+        self,
+        service_id: ServiceId_T,
+        provider: Optional[Provider_T] = None,
+        pool_size: int = 8,
+        reset: Optional[Callable[[Any], Any]] = None,
+        multi: bool = False,
+    ):
+        """
+        Register service_id as a pooled service.
+        This means that, like scoped services, there is only one instance of this service within the same scope,
+        but instances are reused: when the scope is closed its instance goes back to a pool shared by every scope,
+        and later scopes take it from there instead of creating a new one.
+        Pooled instances should not depend on scoped services, since they outlive their scope.
+
+        pool_size: Maximum number of idle instances kept in the pool, extra ones are disposed. Defaults to 8
+        reset: Called with each instance before it goes back to the pool, e.g. to clear a buffer.
+            It must be importable by the generated code, like providers. Defaults to None
+        multi: If true, the service is added to the collection of services registered as service_id. Defaults to False
+        """
+        return self._add_service(
+            service_id,
+            provider,
+            ServiceLifecycle.POOLED,
+            pool_size=pool_size,
+            reset=reset,
+            multi=multi,
+        )
+
+    def add_import(self, service_id: ServiceId_T):
+        """
+        Register service_id as a service provided by another module, see `build_module`.
+        Its instances are resolved by the module that exports it, with the lifecycle it has there
+        """
+        self._changed_service_ids.add(service_id)
+        self._service_descriptors_map[service_id] = ServiceDescriptor(
+            service_id=service_id,
+            provider=imported_service,
+            dependency_kwargs={},
+            lifecycle=ServiceLifecycle.SCOPED,
+            imported=True,
+        )
+        return self
 
     def build_class(self) -> Type[ContainerProto]:
         """
         Returns a new container *class* with all the services registered in this builder.
+
+        After the first build, services added or replaced in the builder are built incrementally:
+        the new class derives from the previous one and only the getters affected by the changes are generated.
         """
-        return self._code_generator.create_class(self._service_descriptors_map)
+        if self._base_class is not None:
+            container_class = self._code_generator.update_class(
+                self._base_class,
+                self._base_service_descriptors_map,
+                self._service_descriptors_map,
+                self._changed_service_ids,
+            )
+            if container_class is not None:
+                return container_class
+
+        self._base_class = self._code_generator.create_class(
+            self._service_descriptors_map
+        )
+        self._base_service_descriptors_map = dict(self._service_descriptors_map)
+        self._changed_service_ids = set()
+        return self._base_class
+
+    def build_module(
+        self, name: str, exports: Iterable[ServiceId_T]
+    ) -> ContainerModule:
+        """
+        Returns a module with the services registered in this builder, compiled into its own container class,
+        to be composed with other modules by a CompositeContainer.
+        Only `exports` can be resolved from the composite container or imported by other modules.
+        """
+        exports = tuple(exports)
+        for service_id in exports:
+            if service_id not in self._service_descriptors_map:
+                raise MissingServiceError(service_id)
+
+        return ContainerModule(
+            name=name,
+            container_class=self.build_class(),
+            imports=tuple(
+                svc_desc.service_id
+                for svc_desc in self._service_descriptors_map.values()
+                if svc_desc.imported
+            ),
+            exports=exports,
+        )
 
     def build(self) -> ContainerProto:
         """
@@ -102,9 +389,28 @@ class ContainerBuilder(Generic[ServiceId_T]):
         """
         return self.build_class()()
 
-    def get_code(self) -> str:
+    async def abuild(self) -> ContainerProto:
+        """
+        Returns a new container *instance* with all the services registered in this builder,
+        after preloading its async singletons.
+        NOTE: This method will generate a new class every time it is called.
+        """
+        container = self.build()
+        await container.apreload()
+        return container
+
+    def get_code(self, class_name: str = "Container") -> str:
         """
         Returns the code to generate the container class.
         You can use this to save the generated code to a file or print it out.
         """
-        return self._code_generator.get_code(self._service_descriptors_map)
+        return self._code_generator.get_code(self._service_descriptors_map, class_name)
+
+    def get_code_size(self, class_name: str = "Container") -> CodeSizeReport:
+        """
+        Returns the size of the code generated for the container class,
+        useful to tune `inline_max_depth` and `inline_max_size`.
+        """
+        return self._code_generator.get_code_size(
+            self._service_descriptors_map, class_name
+        )
@@ -0,0 +1,106 @@
+import argparse
+import importlib
+import sys
+from typing import Any, List, Optional
+
+from meta_di.builder import ContainerBuilder
+from meta_di.exceptions import InvalidBuilderTarget, MetaDIException
+
+HEADER = """# This file was generated by meta-di, do not edit it by hand.
+# Regenerate it with: python -m meta_di compile {target}
+"""
+
+
+def load_builder(target: str) -> ContainerBuilder[Any]:
+    """
+    Loads a ContainerBuilder from a `module:attribute` target.
+    If the attribute is a callable other than a builder it is called without arguments
+    and must return a builder.
+    """
+    module_name, _, attribute_path = target.partition(":")
+    if not module_name or not attribute_path:
+        raise InvalidBuilderTarget(target, "expected the format 'module:attribute'")
+
+    obj: Any = importlib.import_module(module_name)
+    for attribute in attribute_path.split("."):
+        try:
+            obj = getattr(obj, attribute)
+        except AttributeError as error:
+            raise InvalidBuilderTarget(target, f"{attribute!r} not found") from error
+
+    if not isinstance(obj, ContainerBuilder) and callable(obj):
+        obj = obj()
+
+    if not isinstance(obj, ContainerBuilder):
+        raise InvalidBuilderTarget(target, "it is not a ContainerBuilder")
+
+    return obj
+
+
+def get_module_code(target: str, class_name: str) -> str:
+    """
+    Returns the code of an importable module containing the container class for `target`
+    """
+    builder = load_builder(target)
+    header = HEADER.format(target=target)
+    return f"{header}\n{builder.get_code(class_name).lstrip()}"
+
+
+def _compile(args: argparse.Namespace) -> int:
+    code = get_module_code(args.target, args.class_name)
+
+    if args.check:
+        try:
+            with open(args.output, encoding="utf-8") as file:
+                current_code = file.read()
+        except FileNotFoundError:
+            current_code = None
+
+        if current_code != code:
+            print(
+                f"{args.output} is stale, regenerate it with: "
+                f"python -m meta_di compile {args.target} -o {args.output}",
+                file=sys.stderr,
+            )
+            return 1
+        return 0
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(code)
+    else:
+        sys.stdout.write(code)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m meta_di")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser(
+        "compile", help="Write the generated container class to an importable module"
+    )
+    compile_parser.add_argument(
+        "target", help="ContainerBuilder to compile, as 'module:attribute'"
+    )
+    compile_parser.add_argument(
+        "-o", "--output", help="Module file to write. Defaults to stdout"
+    )
+    compile_parser.add_argument(
+        "--class-name", default="Container", help="Name of the generated class"
+    )
+    compile_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Do not write anything, exit with 1 if the output file is stale",
+    )
+
+    args = parser.parse_args(argv)
+    if args.check and not args.output:
+        parser.error("--check requires --output")
+
+    try:
+        return _compile(args)
+    except MetaDIException as error:
+        print(error, file=sys.stderr)
+        return 2
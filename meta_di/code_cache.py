@@ -0,0 +1,61 @@
+import marshal
+import os
+import tempfile
+from types import CodeType
+from typing import Optional, Protocol
+
+
+class CodeCacheProto(Protocol):
+    """
+    Stores compiled container code objects keyed by a registration fingerprint
+    """
+
+    def load(self, key: str) -> Optional[CodeType]:
+        """
+        Returns the code object stored under `key` or None if there is none
+        """
+        ...
+
+    def store(self, key: str, code: CodeType) -> None:
+        """
+        Stores `code` under `key`
+        """
+        ...
+
+
+class FileCodeCache(CodeCacheProto):
+    """
+    Persists compiled code objects as marshal files inside `directory`.
+
+    Entries are written atomically so concurrent workers booting from the
+    same directory never observe a partially written file.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.marshal")
+
+    def load(self, key: str) -> Optional[CodeType]:
+        try:
+            with open(self._get_path(key), "rb") as file:
+                code = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if not isinstance(code, CodeType):
+            return None
+        return code
+
+    def store(self, key: str, code: CodeType) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                marshal.dump(code, file)
+            os.replace(tmp_path, self._get_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
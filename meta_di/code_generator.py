@@ -1,11 +1,190 @@
-from typing import Any, Mapping, Optional, Set, Type, Union
+import functools
+import hashlib
+import inspect
+import os
+import re
+import sys
+import weakref
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
+from meta_di.batch import create_batch
+from meta_di.code_cache import CodeCacheProto
 from meta_di.code_formatter import CodeFormatterProto
 from meta_di.container_proto import ContainerProto
-from meta_di.exceptions import MissingServiceError
-from meta_di.inspector import InspectorProto
-from meta_di.service_descriptor import ServiceDescriptor
+from meta_di.disposal import adispose, dispose, is_disposable, pop_disposables
+from meta_di.exceptions import (
+    AsyncServiceError,
+    CircularDependencyError,
+    MissingServiceError,
+)
+from meta_di.forking import drop_instances, reinit_after_fork
+from meta_di.inspector import CachingInspector, InspectorProto
+from meta_di.instrumentation import (
+    get_stats,
+    new_stats,
+    record_creation,
+    record_transient,
+)
+from meta_di.lazy import Lazy, is_lazy_hint
+from meta_di.multi import is_collection_hint
+from meta_di.overrides import get_dependent_ids, override
+from meta_di.pooling import ServicePool, get_pool_stats
+from meta_di.preload import preload_in_threads
+from meta_di.scopes import exit_scope
+from meta_di.service_descriptor import ForkPolicy, ServiceDescriptor
+from meta_di.slots import drop_slots
 from meta_di.typing import ServiceId_T
+from meta_di.wiring import create_wiring, get_keyword_positions
+
+
+@functools.lru_cache(maxsize=None)
+def _get_meta_di_stamp() -> str:
+    """
+    Returns a stamp of the installed meta_di sources.
+    Cached code is invalidated whenever meta_di itself changes.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    stamp = []
+    for file_name in sorted(os.listdir(package_dir)):
+        if file_name.endswith(".py"):
+            stat = os.stat(os.path.join(package_dir, file_name))
+            stamp.append(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ";".join(stamp)
+
+
+def _get_fingerprint_reference(obj: Any) -> str:
+    """
+    Cheap, stable textual reference used for fingerprinting.
+    Unlike InspectorProto.get_reference this never needs to walk sys.modules
+    """
+    if isinstance(obj, str) or is_collection_hint(obj) or is_lazy_hint(obj):
+        return repr(obj)
+
+    module = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if module and qualname:
+        return f"{module}.{qualname}"
+    return repr(obj)
+
+
+@dataclass
+class CodeSizeReport:
+    """
+    Size of the code generated for a container class
+    """
+
+    characters: int
+    lines: int
+    getter_methods: int
+    # Transient services created by calling their getter because they exceed the inlining budget
+    # or are big and used by several services
+    outlined_services: int
+    # Provider calls inlined in the largest expression
+    largest_inline_size: int
+    # Nesting of provider calls in the deepest expression
+    deepest_inline_depth: int
+
+
+# Transients used by several services are only inlined while they take up to this number of provider calls,
+# bigger ones are created by calling their getter, so the code of shared subgraphs is not repeated
+_SHARED_INLINE_MAX_SIZE = 4
+
+# Slot indices of singleton and scoped services, see `CodeGenerator._get_slot_indices`
+_SlotIndices = Tuple[Dict[Any, int], Dict[Any, int]]
+
+
+def _get_class_slot_indices(container_class: Type[ContainerProto]) -> _SlotIndices:
+    """
+    Returns the slot indices of a container class generated with slots, which ContainerProto does not declare
+    """
+    return (
+        getattr(container_class, "_singleton_slot_indices"),
+        getattr(container_class, "_scoped_slot_indices"),
+    )
+
+
+@dataclass
+class _GenerationContext(Generic[ServiceId_T]):
+    """
+    Information shared by every piece of code generated for one container class
+    """
+
+    service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]]
+    preload_layers: List[List[ServiceDescriptor[ServiceId_T]]] = field(
+        default_factory=list
+    )
+    async_service_ids: Set[ServiceId_T] = field(default_factory=set)
+    # When set, references to scoped/singleton dependencies are hoisted into local variables:
+    # maps the service id to the local variable name and the code that initializes it
+    hoisted_references: Optional[Dict[ServiceId_T, Tuple[str, str]]] = None
+    # Code that creates each transient service, generated once and reused everywhere it is inlined
+    transient_instance_code: Dict[ServiceId_T, str] = field(default_factory=dict)
+    # Number of provider calls and nesting depth of the code that creates each transient service
+    transient_inline_sizes: Dict[ServiceId_T, Tuple[int, int]] = field(
+        default_factory=dict
+    )
+    # Transient services created by calling their getter because they exceed the inlining budget
+    # or are big and used by several services
+    outlined_service_ids: Set[ServiceId_T] = field(default_factory=set)
+    # Ids of the services that depend directly on each service, see `CodeGenerator._get_dependents`
+    dependents: Mapping[ServiceId_T, Sequence[ServiceId_T]] = field(
+        default_factory=dict
+    )
+    # Singletons dropped in forked child processes, see `_get_reinit_singleton_ids`
+    reinit_singleton_ids: Set[ServiceId_T] = field(default_factory=set)
+    # With slots, index of the slot of each singleton and scoped service in the list that stores its instances
+    singleton_slot_indices: Dict[ServiceId_T, int] = field(default_factory=dict)
+    scoped_slot_indices: Dict[ServiceId_T, int] = field(default_factory=dict)
+    preloaded_singleton_ids: Set[ServiceId_T] = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Only sync singletons are preloaded when the container is instantiated,
+        # async ones are preloaded by `apreload`
+        self.preloaded_singleton_ids = {
+            svc_desc.service_id
+            for layer in self.get_preload_layers(is_async=False)
+            for svc_desc in layer
+        }
+
+    def is_async(self, svc_desc: ServiceDescriptor[ServiceId_T]) -> bool:
+        return svc_desc.service_id in self.async_service_ids
+
+    def get_preload_layers(
+        self, is_async: bool
+    ) -> List[List[ServiceDescriptor[ServiceId_T]]]:
+        layers = (
+            [svc_desc for svc_desc in layer if self.is_async(svc_desc) == is_async]
+            for layer in self.preload_layers
+        )
+        return [layer for layer in layers if layer]
+
+
+@dataclass
+class _ClassAnalysis(Generic[ServiceId_T]):
+    """
+    Dependency analysis of the services of a generated class, reused by `update_class`
+    to find out what changes, without analyzing every service again
+    """
+
+    async_service_ids: Set[ServiceId_T]
+    preload_layer_ids: List[List[ServiceId_T]]
+    dependents: Dict[ServiceId_T, List[ServiceId_T]]
+    reinit_singleton_ids: Set[ServiceId_T]
 
 
 class CodeGenerator:
@@ -16,28 +195,64 @@ class CodeGenerator:
     _singleton_instances_attr = "self._singleton_instances"
     _scoped_instances_attr = "self._scoped_instances"
     _service_getter_map_attr = "self._service_getter_map"
+    _async_service_getter_map_attr = "self._async_service_getter_map"
+    _singleton_locks_attr = "self._singleton_locks"
+    _scoped_locks_attr = "self._scoped_locks"
+    _singleton_async_locks_attr = "self._singleton_async_locks"
+    _scoped_async_locks_attr = "self._scoped_async_locks"
+    _singleton_disposables_attr = "self._singleton_disposables"
+    _scoped_disposables_attr = "self._disposables"
+    _stats_attr = "self._stats"
+    _pools_attr = "self._pools"
 
     def __init__(
         self,
         code_formatter: Optional[CodeFormatterProto],
         inspector: InspectorProto[Any],
-        preload_singleton_instances: bool,
         container_svc_ids: Optional[Set[Any]],
+        code_cache: Optional[CodeCacheProto] = None,
+        preload_workers: int = 0,
+        thread_safe: bool = False,
+        scope_pool_size: int = 0,
+        inline_max_depth: Optional[int] = 32,
+        inline_max_size: Optional[int] = None,
+        instrument: bool = False,
+        ambient_scopes: bool = False,
+        overrides: bool = False,
+        slots: bool = False,
     ) -> None:
         self._code_formatter = code_formatter
+        self._code_cache = code_cache
         self._inspector = inspector
-        self._preload_singleton_instances = preload_singleton_instances
+        self._preload_workers = preload_workers
+        self._thread_safe = thread_safe
+        self._scope_pool_size = scope_pool_size
+        self._inline_max_depth = inline_max_depth
+        self._inline_max_size = inline_max_size
+        self._instrument = instrument
+        self._ambient_scopes = ambient_scopes
+        self._overrides = overrides
+        self._slots = slots
+        self._class_analyses: "weakref.WeakKeyDictionary[type, _ClassAnalysis[Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
         self._container_svc_ids = container_svc_ids or {ContainerProto, "di_container"}
 
-    def _get_getter_method_name(self, svc_desc: ServiceDescriptor[Any]) -> str:
+    def _get_getter_method_name(
+        self, svc_desc: ServiceDescriptor[Any], is_async: bool = False
+    ) -> str:
         """
         Get the name of the getter method for the given service
         """
+        return self._get_method_name("aget" if is_async else "get", svc_desc)
+
+    def _get_method_name(self, prefix: str, svc_desc: ServiceDescriptor[Any]) -> str:
         if isinstance(svc_desc.service_id, str):
-            return f"get_{svc_desc.service_id}"
-        return f"get_{self._inspector.get_reference(svc_desc.service_id)}".replace(
-            ".", "_"
-        )
+            name = f"{prefix}_{svc_desc.service_id}"
+        else:
+            name = f"{prefix}_{self._inspector.get_reference(svc_desc.service_id)}"
+        # References of collections and ids of their members are not valid identifiers
+        return re.sub(r"\W", "_", name)
 
     def _is_container_reference(self, svc_id: Union[str, type]) -> bool:
         """
@@ -45,82 +260,599 @@ class CodeGenerator:
         """
         return svc_id in self._container_svc_ids
 
-    def _gen_imports_code(
+    def _get_singleton_dependencies(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        through_lazy: bool = False,
+    ) -> List[ServiceDescriptor[ServiceId_T]]:
+        """
+        Returns the singletons required to create the given service,
+        either directly or through transient/scoped dependencies.
+        With `through_lazy`, singletons resolved later by `Lazy[T]` handles are included as well
+        """
+        singleton_deps: Dict[ServiceId_T, ServiceDescriptor[ServiceId_T]] = {}
+        visited: Set[ServiceId_T] = set()
+        stack = [svc_desc]
+        while stack:
+            current = stack.pop()
+            deps = list(current.dependency_kwargs.values())
+            if through_lazy and current.lazy_of is not None:
+                deps.append(current.lazy_of)
+            for dep in deps:
+                if (
+                    self._is_container_reference(dep)
+                    or dep in visited
+                    or dep not in service_descriptors_map
+                ):
+                    continue
+
+                visited.add(dep)
+                dep_svc_desc = service_descriptors_map[dep]
+                if dep_svc_desc.is_singleton:
+                    singleton_deps[dep] = dep_svc_desc
+                else:
+                    stack.append(dep_svc_desc)
+
+        return list(singleton_deps.values())
+
+    def _check_circular_dependencies(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        root_service_ids: Optional[Iterable[ServiceId_T]] = None,
+    ) -> None:
+        """
+        Raises CircularDependencyError, with the path of the cycle, if a service depends on itself
+        either directly or through other services.
+        Only the services reachable from `root_service_ids` are checked when given
+        """
+        if root_service_ids is None:
+            root_service_ids = service_descriptors_map.keys()
+
+        done: Set[ServiceId_T] = set()
+        for root_service_id in root_service_ids:
+            svc_desc = service_descriptors_map[root_service_id]
+            if svc_desc.service_id in done:
+                continue
+
+            # Services from the current root to the one being visited,
+            # along with the dependencies of each one that are left to visit
+            path = [svc_desc.service_id]
+            in_path = {svc_desc.service_id}
+            pending_deps = [list(svc_desc.dependency_kwargs.values())]
+            while path:
+                if not pending_deps[-1]:
+                    in_path.remove(path[-1])
+                    done.add(path.pop())
+                    pending_deps.pop()
+                    continue
+
+                dep = pending_deps[-1].pop()
+                if (
+                    dep in done
+                    or self._is_container_reference(dep)
+                    or dep not in service_descriptors_map
+                ):
+                    continue
+
+                if dep in in_path:
+                    raise CircularDependencyError(path[path.index(dep) :] + [dep])
+
+                path.append(dep)
+                in_path.add(dep)
+                pending_deps.append(
+                    list(service_descriptors_map[dep].dependency_kwargs.values())
+                )
+
+    def _get_preload_layers(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        async_service_ids: Set[ServiceId_T],
+    ) -> List[List[ServiceDescriptor[ServiceId_T]]]:
+        """
+        Groups the singletons that must be preloaded by dependency depth.
+
+        Singletons marked for preloading and every singleton they depend on are preloaded.
+        Singletons in a layer only depend on singletons of previous layers, so each layer
+        can be created once the previous one is done, in any order or concurrently.
+
+        Sync singletons are all preloaded before async ones, so the depth of async singletons
+        only accounts for their async dependencies.
+        """
+        singleton_deps = {
+            svc_desc.service_id: self._get_singleton_dependencies(
+                svc_desc, service_descriptors_map
+            )
+            for svc_desc in service_descriptors_map.values()
+            if svc_desc.is_singleton
+        }
+
+        depths: Dict[ServiceId_T, int] = {}
+        visiting: Set[ServiceId_T] = set()
+        for svc_desc in service_descriptors_map.values():
+            if not svc_desc.is_singleton or not svc_desc.preload:
+                continue
+
+            stack = [(svc_desc, False)]
+            while stack:
+                current, expanded = stack.pop()
+                if current.service_id in depths:
+                    continue
+
+                if expanded:
+                    is_async = current.service_id in async_service_ids
+                    depths[current.service_id] = 1 + max(
+                        (
+                            depths.get(dep.service_id, 0)
+                            for dep in singleton_deps[current.service_id]
+                            if (dep.service_id in async_service_ids) == is_async
+                        ),
+                        default=0,
+                    )
+                    continue
+
+                if current.service_id in visiting:
+                    continue
+
+                visiting.add(current.service_id)
+                stack.append((current, True))
+                stack.extend(
+                    (dep, False)
+                    for dep in singleton_deps[current.service_id]
+                    if dep.service_id not in depths
+                )
+
+        layers: List[List[ServiceDescriptor[ServiceId_T]]] = [
+            [] for _ in range(max(depths.values(), default=0))
+        ]
+        for svc_desc in service_descriptors_map.values():
+            if svc_desc.service_id in depths:
+                layers[depths[svc_desc.service_id] - 1].append(svc_desc)
+
+        return layers
+
+    def _get_reinit_singleton_ids(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+    ) -> Set[ServiceId_T]:
+        """
+        Returns the ids of the singletons that forked child processes must create again:
+        singletons with the REINIT fork policy, and the singletons that depend on them,
+        since they keep a reference to the instance created by the parent, even through a `Lazy[T]` handle
+        """
+        reinit_singleton_ids = {
+            svc_desc.service_id
+            for svc_desc in service_descriptors_map.values()
+            if svc_desc.is_singleton and svc_desc.fork_policy == ForkPolicy.REINIT
+        }
+        if not reinit_singleton_ids:
+            return reinit_singleton_ids
+
+        singleton_dependents: Dict[ServiceId_T, List[ServiceId_T]] = {}
+        for svc_desc in service_descriptors_map.values():
+            if svc_desc.is_singleton:
+                for dep_svc_desc in self._get_singleton_dependencies(
+                    svc_desc, service_descriptors_map, through_lazy=True
+                ):
+                    singleton_dependents.setdefault(dep_svc_desc.service_id, []).append(
+                        svc_desc.service_id
+                    )
+
+        stack = list(reinit_singleton_ids)
+        while stack:
+            for dependent in singleton_dependents.get(stack.pop(), ()):
+                if dependent not in reinit_singleton_ids:
+                    reinit_singleton_ids.add(dependent)
+                    stack.append(dependent)
+
+        return reinit_singleton_ids
+
+    def _get_dependents(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+    ) -> Dict[ServiceId_T, List[ServiceId_T]]:
+        """
+        Returns the ids of the services that depend directly on each service
+        """
+        dependents: Dict[ServiceId_T, List[ServiceId_T]] = {}
+        for svc_desc in service_descriptors_map.values():
+            for dep in svc_desc.dependency_kwargs.values():
+                if not self._is_container_reference(dep):
+                    dependents.setdefault(dep, []).append(svc_desc.service_id)
+        return dependents
+
+    def _get_async_service_ids(
         self,
         service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+    ) -> Set[ServiceId_T]:
+        """
+        Returns the ids of services that can only be created asynchronously,
+        because their provider is a coroutine function or they depend on such a service
+        """
+        dependents = self._get_dependents(service_descriptors_map)
+        stack = [
+            svc_desc.service_id
+            for svc_desc in service_descriptors_map.values()
+            if inspect.iscoroutinefunction(svc_desc.provider)
+        ]
+        async_service_ids = set(stack)
+        while stack:
+            for dependent in dependents.get(stack.pop(), ()):
+                if dependent not in async_service_ids:
+                    async_service_ids.add(dependent)
+                    stack.append(dependent)
+
+        return async_service_ids
+
+    def _is_parallel_preload(self, ctx: _GenerationContext[Any]) -> bool:
+        return self._preload_workers > 0 and any(
+            len(layer) > 1 for layer in ctx.get_preload_layers(is_async=False)
+        )
+
+    def _gen_imports_code(
+        self,
+        ctx: _GenerationContext[ServiceId_T],
+        svc_descs: Optional[Iterable[ServiceDescriptor[ServiceId_T]]] = None,
     ) -> str:
         """
-        Generates the code that imports all necessary services and providers
+        Generates the code that imports all necessary services and providers,
+        or only the ones of `svc_descs` when given
         """
+        if svc_descs is None:
+            svc_descs = ctx.service_descriptors_map.values()
+
         imports = set()
-        for svc_desc in service_descriptors_map.values():
+        for svc_desc in svc_descs:
             if self._inspector.requires_import(svc_desc.service_id):
                 imports.add(
                     f"import {self._inspector.get_module_name(svc_desc.service_id)}"
                 )
             imports.add(f"import {self._inspector.get_module_name(svc_desc.provider)}")
+            if svc_desc.reset is not None:
+                imports.add(f"import {self._inspector.get_module_name(svc_desc.reset)}")
+            if svc_desc.is_collection and self._inspector.requires_import(
+                svc_desc.collection_of
+            ):
+                imports.add(
+                    f"import {self._inspector.get_module_name(svc_desc.collection_of)}"
+                )
+            if svc_desc.is_lazy and self._inspector.requires_import(svc_desc.lazy_of):
+                imports.add(
+                    f"import {self._inspector.get_module_name(svc_desc.lazy_of)}"
+                )
+
+        for svc_id in self._container_svc_ids:
+            if self._inspector.requires_import(svc_id):
+                imports.add(f"import {self._inspector.get_module_name(svc_id)}")
 
         imports.add(f"import {self._inspector.get_module_name(MissingServiceError)}")
         imports.add(f"import {self._inspector.get_module_name(ContainerProto)}")
+        imports.add(f"import {self._inspector.get_module_name(dispose)}")
+        imports.add(f"import {self._inspector.get_module_name(create_batch)}")
+        imports.add(f"import {self._inspector.get_module_name(create_wiring)}")
+        imports.add("import contextvars")
+        imports.add(f"import {self._inspector.get_module_name(exit_scope)}")
+        if self._thread_safe:
+            imports.add("import threading")
+        if ctx.async_service_ids:
+            imports.add("import asyncio")
+        if self._is_parallel_preload(ctx):
+            imports.add(f"import {self._inspector.get_module_name(preload_in_threads)}")
+        if any(svc_desc.is_pooled for svc_desc in ctx.service_descriptors_map.values()):
+            imports.add(f"import {self._inspector.get_module_name(ServicePool)}")
+        if ctx.reinit_singleton_ids:
+            imports.add(f"import {self._inspector.get_module_name(reinit_after_fork)}")
+        if self._slots:
+            imports.add(f"import {self._inspector.get_module_name(drop_slots)}")
+        if self._overrides:
+            imports.add(f"import {self._inspector.get_module_name(override)}")
+            imports.add(f"import {self._inspector.get_module_name(drop_instances)}")
+            imports.add("import weakref")
+        if self._instrument:
+            imports.add("import time")
+            imports.add(f"import {self._inspector.get_module_name(record_creation)}")
 
-        return "\n".join(imports)
+        return "\n".join(sorted(imports))
 
     def _gen_create_instance_code(
         self,
         svc_desc: ServiceDescriptor[ServiceId_T],
-        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        ctx: _GenerationContext[ServiceId_T],
     ) -> str:
         """
         Generates the code that is capable of instantiating the given service
 
-        For transient dependencies we will recursively call this function in order to "inline"
-        and minimize the amount of function calls
+        Transient dependencies are "inlined" in order to minimize the amount of function calls.
+        The code of each transient service is generated once per container class and reused
+        everywhere it is inlined, dependencies first, without recursion.
+        Transient dependencies that would exceed the inlining budget, or that are used by several
+        services and take more than `_SHARED_INLINE_MAX_SIZE` provider calls, are created by calling
+        their getter instead, so their code is shared rather than repeated. Otherwise the code
+        would grow exponentially with the depth of diamond shaped graphs
 
         For scoped/singleton dependencies we will call the container method that gets that service, which
         will be responsible for checking if we need to create a new instance or not
 
         For container references will simply use `self`
+
+        For async services the generated code must run inside a coroutine, async providers and
+        getters are awaited
+        """
+        if svc_desc.service_id in ctx.transient_instance_code:
+            return ctx.transient_instance_code[svc_desc.service_id]
+
+        code = ""
+        stack = [(svc_desc, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current.service_id in ctx.transient_instance_code:
+                continue
+
+            if not expanded:
+                stack.append((current, True))
+                stack.extend(
+                    (ctx.service_descriptors_map[dep], False)
+                    for dep in current.dependency_kwargs.values()
+                    if dep in ctx.service_descriptors_map
+                    and not self._is_container_reference(dep)
+                    and ctx.service_descriptors_map[dep].is_transient
+                )
+                continue
+
+            code = self._gen_provider_call_code(current, ctx)
+            if current.is_transient:
+                ctx.transient_instance_code[current.service_id] = code
+
+        return code
+
+    def _gen_provider_call_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        """
+        Generates the call to the provider of the given service,
+        the code of its transient dependencies must have been generated already
+
+        Collections of services registered with `multi=True` are created by a tuple display of their members.
+        `Lazy[T]` handles are created with the bound getter of T, which is only called on first use
         """
-        deps_kwargs = []
+        deps_kwargs: List[Tuple[str, str]] = []
+        inline_size, inline_depth = 1, 1
 
         for kwarg, dep in svc_desc.dependency_kwargs.items():
             if self._is_container_reference(dep):
-                deps_kwargs.append(f"\n{kwarg}=self,")
+                deps_kwargs.append((kwarg, "self"))
                 continue
 
-            if dep not in service_descriptors_map:
+            if dep not in ctx.service_descriptors_map:
                 raise MissingServiceError(dep)
 
-            dep_svc_desc = service_descriptors_map[dep]
+            dep_svc_desc = ctx.service_descriptors_map[dep]
             if dep_svc_desc.is_transient:
-                # For transient dependencies we will recursively call this function in order to "inline"
-                deps_kwargs.append(
-                    f"\n{kwarg}={self._gen_create_instance_code(dep_svc_desc, service_descriptors_map)},"
-                )
-            elif (
-                self._preload_singleton_instances
-                and dep_svc_desc.is_singleton
-                and not svc_desc.is_singleton
-            ):
-                # When singletons deps are preloaded we can inline them
-                # by getting them directly from the instances dict
-                deps_kwargs.append(
-                    f"\n{kwarg}={self._singleton_instances_attr}[{self._inspector.get_reference(dep_svc_desc.service_id)}],"
-                )
+                dep_size, dep_depth = ctx.transient_inline_sizes[dep]
+                if (
+                    not self._overrides
+                    and self._fits_inline_budget(inline_size + dep_size, dep_depth + 1)
+                    and (
+                        dep_size <= _SHARED_INLINE_MAX_SIZE
+                        or len(ctx.dependents.get(dep, ())) <= 1
+                    )
+                ):
+                    inline_size += dep_size
+                    inline_depth = max(inline_depth, dep_depth + 1)
+                    deps_kwargs.append((kwarg, ctx.transient_instance_code[dep]))
+                else:
+                    ctx.outlined_service_ids.add(dep)
+                    deps_kwargs.append(
+                        (kwarg, self._gen_getter_call_code(dep_svc_desc, ctx))
+                    )
             else:
                 deps_kwargs.append(
-                    f"\n{kwarg}=self.{self._get_getter_method_name(dep_svc_desc)}(),"
+                    (
+                        kwarg,
+                        self._gen_instance_reference_code(
+                            dep_svc_desc,
+                            ctx,
+                            inline_preloaded=not svc_desc.is_singleton,
+                        ),
+                    )
                 )
 
-        deps_kwargs_str = "".join(deps_kwargs)
+        if svc_desc.is_transient:
+            ctx.transient_inline_sizes[svc_desc.service_id] = (
+                inline_size,
+                inline_depth,
+            )
+
+        if svc_desc.is_collection:
+            call_code = f"({''.join(f'{chr(10)}{code},' for _, code in deps_kwargs)}\n)"
+        elif svc_desc.is_lazy:
+            call_code = self._gen_lazy_code(svc_desc, ctx)
+        else:
+            deps_kwargs_str = "".join(
+                f"\n{kwarg}={code}," for kwarg, code in deps_kwargs
+            )
+            await_code = (
+                "await " if inspect.iscoroutinefunction(svc_desc.provider) else ""
+            )
+            call_code = f"{await_code}{self._inspector.get_reference(svc_desc.provider)}({deps_kwargs_str}\n)"
+        if not self._instrument:
+            return call_code
+
+        # The start time is evaluated before the call and its arguments,
+        # so the recorded time includes creating the dependencies
+        record = record_transient if svc_desc.is_transient else record_creation
+        return f"{self._inspector.get_full_name(record)}({self._stats_attr}[{self._inspector.get_reference(svc_desc.service_id)}], time.perf_counter_ns(), {call_code})"
+
+    def _gen_requested_transient_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        """
+        Generates the code that creates a transient requested by a batch or a wiring.
+        It is inlined, unless overrides are enabled: then its getter is called, since it checks for overrides
+        """
+        if self._overrides:
+            return self._gen_getter_call_code(svc_desc, ctx)
+        return self._gen_create_instance_code(svc_desc, ctx)
+
+    def _gen_lazy_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        lazy_of = svc_desc.lazy_of
+        if lazy_of is None or lazy_of not in ctx.service_descriptors_map:
+            raise MissingServiceError(lazy_of)
+
+        lazy_svc_desc = ctx.service_descriptors_map[lazy_of]
+        if ctx.is_async(lazy_svc_desc):
+            raise AsyncServiceError(lazy_of)
+
+        return f"{self._inspector.get_full_name(Lazy)}(self.{self._get_getter_method_name(lazy_svc_desc)})"
+
+    def _fits_inline_budget(self, inline_size: int, inline_depth: int) -> bool:
         return (
-            f"{self._inspector.get_reference(svc_desc.provider)}({deps_kwargs_str}\n)"
-        )
+            self._inline_max_size is None or inline_size <= self._inline_max_size
+        ) and (self._inline_max_depth is None or inline_depth <= self._inline_max_depth)
+
+    def _gen_getter_call_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        if ctx.is_async(svc_desc):
+            return (
+                f"await self.{self._get_getter_method_name(svc_desc, is_async=True)}()"
+            )
+        return f"self.{self._get_getter_method_name(svc_desc)}()"
+
+    def _gen_instance_reference_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+        inline_preloaded: bool,
+    ) -> str:
+        """
+        Generates the code that gets the instance of a scoped/singleton service
+
+        When singletons are preloaded and `inline_preloaded` is true, we get them directly
+        from the instances dict, otherwise we call their getter.
+        When overrides are enabled getters are always called, since they check for overrides,
+        and when instrumenting, since they count resolutions.
+        Singletons dropped in forked child processes are always got through their getter
+        """
+        if ctx.is_async(svc_desc):
+            code = (
+                f"await self.{self._get_getter_method_name(svc_desc, is_async=True)}()"
+            )
+        elif (
+            inline_preloaded
+            and not self._overrides
+            and not self._instrument
+            and svc_desc.service_id in ctx.preloaded_singleton_ids
+            and svc_desc.service_id not in ctx.reinit_singleton_ids
+        ):
+            code = self._gen_instance_storage_code(svc_desc, ctx)
+        else:
+            code = f"self.{self._get_getter_method_name(svc_desc)}()"
+
+        if ctx.hoisted_references is None:
+            return code
+
+        if svc_desc.service_id not in ctx.hoisted_references:
+            ctx.hoisted_references[svc_desc.service_id] = (
+                f"_instance{len(ctx.hoisted_references)}",
+                code,
+            )
+        return ctx.hoisted_references[svc_desc.service_id][0]
+
+    def _get_instances_attribute(self, svc_desc: ServiceDescriptor[ServiceId_T]) -> str:
+        if svc_desc.is_singleton:
+            return self._singleton_instances_attr
+        return self._scoped_instances_attr
+
+    def _gen_instance_storage_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        """
+        Generates the expression where the instance of a singleton/scoped service is stored:
+        its key in the instances dict, or its slot in the instances list when slots are enabled
+        """
+        if not self._slots:
+            key = self._inspector.get_reference(svc_desc.service_id)
+        elif svc_desc.is_singleton:
+            key = str(ctx.singleton_slot_indices[svc_desc.service_id])
+        else:
+            key = str(ctx.scoped_slot_indices[svc_desc.service_id])
+        return f"{self._get_instances_attribute(svc_desc)}[{key}]"
+
+    def _gen_cached_instance_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+        indent: str,
+    ) -> str:
+        """
+        Generates the statements that return the instance of a singleton/scoped service if it was created already.
+        Slots of instances that were not created yet hold the `_EMPTY` sentinel
+        """
+        storage_code = self._gen_instance_storage_code(svc_desc, ctx)
+        if not self._slots:
+            return f"""if {self._inspector.get_reference(svc_desc.service_id)} in {self._get_instances_attribute(svc_desc)}:
+{indent}    return {storage_code}"""
+
+        return f"""instance = {storage_code}
+{indent}if instance is not _EMPTY:
+{indent}    return instance"""
+
+    def _gen_store_instance_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+        indent: str,
+    ) -> str:
+        """
+        Generates the code that stores a newly created singleton/scoped `instance`.
+
+        Instances that can be disposed are also tracked so they can be disposed when the scope,
+        or the container for singletons, is closed.
+        Pooled instances are tracked by a lease instead, which gives them back to their pool.
+        If the provider is a class we know statically if its instances can be disposed,
+        otherwise the instance is checked once after being created.
+        """
+        service_reference = self._inspector.get_reference(svc_desc.service_id)
+        disposables_attribute = self._singleton_disposables_attr
+        if not svc_desc.is_singleton:
+            disposables_attribute = self._scoped_disposables_attr
+
+        code = f"\n{indent}{self._gen_instance_storage_code(svc_desc, ctx)} = instance"
+        if svc_desc.is_collection:
+            return code
+
+        if svc_desc.is_pooled:
+            return (
+                code
+                + f"\n{indent}{disposables_attribute}.append({self._pools_attr}[{service_reference}].lease(instance))"
+            )
+
+        if not isinstance(svc_desc.provider, type):
+            code += f"""
+{indent}if {self._inspector.get_full_name(is_disposable)}(instance):
+{indent}    {disposables_attribute}.append(instance)"""
+        elif is_disposable(svc_desc.provider):
+            code += f"\n{indent}{disposables_attribute}.append(instance)"
+
+        return code
 
     def _gen_getter_method_code(
         self,
         svc_desc: ServiceDescriptor[ServiceId_T],
-        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        ctx: _GenerationContext[ServiceId_T],
     ) -> str:
         """
         Generates the getter method code.
@@ -130,122 +862,1124 @@ class CodeGenerator:
         For singleton/scoped services we first check if we already have an isntance to decide if
         we will create a new instance or not.
 
+        When thread_safe is enabled, creation is guarded by double-checked locking with a lock per service,
+        created on first use, so the fast path for existing instances stays lock free and unrelated
+        services are created concurrently. Locks are taken in dependency order, so they cannot deadlock.
+
+        Async services get an async getter instead, their sync getter raises AsyncServiceError
+
         To see how we instantiate services see _gen_create_instance_code
         """
-        new_instance_code = self._gen_create_instance_code(
-            svc_desc, service_descriptors_map
-        )
         method_name = self._get_getter_method_name(svc_desc)
+        override_code = self._gen_override_check_code(svc_desc)
+        if svc_desc.imported:
+            return self._gen_import_getter_method_code(svc_desc, override_code)
+
+        if ctx.is_async(svc_desc):
+            return f"""
+    def {method_name}(self):{override_code}
+        raise {self._inspector.get_full_name(AsyncServiceError)}({self._inspector.get_reference(svc_desc.service_id)})
+{self._gen_async_getter_method_code(svc_desc, ctx)}"""
+
+        new_instance_code = self._gen_create_instance_code(svc_desc, ctx)
 
         if svc_desc.is_transient:
             return f"""
-    def {method_name}(self):
+    def {method_name}(self):{override_code}
         return {new_instance_code}
 """
-        service_reference = self._inspector.get_reference(svc_desc.service_id)
-        instances_attribute = self._singleton_instances_attr
-        if svc_desc.is_scoped:
-            instances_attribute = self._scoped_instances_attr
+        resolve_count_code = self._gen_resolve_count_code(svc_desc)
+        if self._thread_safe:
+            service_reference = self._inspector.get_reference(svc_desc.service_id)
+            locks_attribute = self._singleton_locks_attr
+            if not svc_desc.is_singleton:
+                locks_attribute = self._scoped_locks_attr
 
-        return f"""
-    def {method_name}(self):
-        if {service_reference} in {instances_attribute}:
-            return {instances_attribute}[{service_reference}]
+            # dict.setdefault is atomic, so threads racing to create the lock of a service all get the same one
+            return f"""
+    def {method_name}(self):{resolve_count_code}
+        {self._gen_cached_instance_code(svc_desc, ctx, " " * 8)}
 
-        instance = {new_instance_code}
-        {instances_attribute}[{service_reference}] = instance
+        lock = {locks_attribute}.get({service_reference})
+        if lock is None:
+            lock = {locks_attribute}.setdefault({service_reference}, threading.RLock())
+        with lock:
+            {self._gen_cached_instance_code(svc_desc, ctx, " " * 12)}
+{self._gen_override_instance_code(svc_desc, ctx, " " * 12)}
+            {self._gen_new_instance_code(svc_desc, new_instance_code, " " * 12)}{self._gen_store_instance_code(svc_desc, ctx, " " * 12)}
+            return instance
+"""
+
+        return f"""
+    def {method_name}(self):{resolve_count_code}
+        {self._gen_cached_instance_code(svc_desc, ctx, " " * 8)}
+{self._gen_override_instance_code(svc_desc, ctx, " " * 8)}
+        {self._gen_new_instance_code(svc_desc, new_instance_code, " " * 8)}{self._gen_store_instance_code(svc_desc, ctx, " " * 8)}
         return instance
 """
 
-    def _gen_class_code(
-        self,
-        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
-        class_name: str,
+    def _gen_import_getter_method_code(
+        self, svc_desc: ServiceDescriptor[ServiceId_T], override_code: str
     ) -> str:
         """
-        Generates class code
-
-        Uses the given class_name and inherit from ContainerProto
-
-        Inits `self._service_getter_map_attr` to be a map for service_id to the container getter methods
-        for that service id
+        Generates the getter of an imported service, which delegates to the resolver linked by the
+        composite container, see `meta_di.modules`
         """
-        container_proto_reference = self._inspector.get_reference(ContainerProto)
-        class_code = f"""
-class {class_name}({container_proto_reference}):
-
-    def __init__(
-        self,
-        singleton_instances = None,
-    ) -> None:
-        self._scoped_instances = {{}}
-        self._singleton_instances = singleton_instances or {{}}
-        {self._service_getter_map_attr} = {{
-            {", ".join(f"{self._inspector.get_reference(svc_desc.service_id)}: self.{self._get_getter_method_name(svc_desc)}" for svc_desc in service_descriptors_map.values())}
-        }}
+        service_reference = self._inspector.get_reference(svc_desc.service_id)
+        return f"""
+    def {self._get_getter_method_name(svc_desc)}(self):{override_code}
+        try:
+            resolve = self._imports[{service_reference}]
+        except KeyError:
+            raise {self._inspector.get_full_name(MissingServiceError)}({service_reference}) from None
+        return resolve()
 """
 
-        if self._preload_singleton_instances:
-            class_code += f"""
-        if not singleton_instances:
-            self._preload_singletons()
-
-    def _preload_singletons(self):
-        {self._singleton_instances_attr}.update({{
-            {", ".join(f"{self._inspector.get_reference(svc_desc.service_id)}: self.{self._get_getter_method_name(svc_desc)}()" for svc_desc in service_descriptors_map.values() if svc_desc.is_singleton)}
-        }})
-"""
+    def _gen_new_instance_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        new_instance_code: str,
+        indent: str,
+    ) -> str:
+        """
+        Generates the statements that assign a new `instance` of a scoped/singleton service in its getter.
+        Pooled services take an idle instance from their pool first, and only create one when it is empty
+        """
+        if not svc_desc.is_pooled:
+            return f"instance = {new_instance_code}"
 
-        class_code += f"""
-    def get(self, service_id):
-        if service_id not in {self._service_getter_map_attr}:
-            raise {self._inspector.get_full_name(MissingServiceError)}(service_id)
-        return {self._service_getter_map_attr}[service_id]()
+        return f"""instance = {self._pools_attr}[{self._inspector.get_reference(svc_desc.service_id)}].acquire()
+{indent}if instance is None:
+{indent}    instance = {new_instance_code}"""
 
-    def create_scope(self):
-        return self.__class__(singleton_instances=self._singleton_instances)
+    def _gen_override_check_code(self, svc_desc: ServiceDescriptor[ServiceId_T]) -> str:
+        """
+        Generates the statements that resolve an overridden transient or imported service with its override,
+        when overrides are enabled
+        """
+        if not self._overrides:
+            return ""
 
-    def __getitem__(self, service_id):
-        return self.get(service_id)
+        service_reference = self._inspector.get_reference(svc_desc.service_id)
+        return f"""
+        if {service_reference} in self._overrides:
+            return self._overrides[{service_reference}](self)"""
 
-    def __enter__(self):
-        return self.create_scope()
+    def _gen_override_instance_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+        indent: str,
+        is_async: bool = False,
+    ) -> str:
+        """
+        Generates the statements that create the instance of an overridden singleton/scoped service with its
+        override, when overrides are enabled. The instance is cached like the instances of the service, and
+        dropped when the override is entered and exited. Overrides are owned by the caller, they are not disposed
+        """
+        if not self._overrides:
+            return ""
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        service_reference = self._inspector.get_reference(svc_desc.service_id)
+        await_code = ""
+        if is_async:
+            await_code = f"""
+{indent}    if asyncio.iscoroutine(instance):
+{indent}        instance = await instance"""
+        return f"""
+{indent}if {service_reference} in self._overrides:
+{indent}    instance = self._overrides[{service_reference}](self){await_code}
+{indent}    {self._gen_instance_storage_code(svc_desc, ctx)} = instance
+{indent}    return instance
 """
 
+    def _gen_resolve_count_code(self, svc_desc: ServiceDescriptor[ServiceId_T]) -> str:
+        """
+        Generates the statement that counts the resolutions of a scoped/singleton service when instrumenting.
+        Transient resolutions are counted along with their creation
+        """
+        if not self._instrument:
+            return ""
+        return f"\n        {self._stats_attr}[{self._inspector.get_reference(svc_desc.service_id)}][0] += 1"
+
+    def _gen_async_getter_method_code(
+        self,
+        svc_desc: ServiceDescriptor[ServiceId_T],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> str:
+        """
+        Generates the async getter method code, used for services that must be created asynchronously.
+        Works like the sync getter, except singleton/scoped instances are created under an asyncio.Lock
+        per service, created on first use, so concurrent tasks never create the same instance twice.
+        """
+        new_instance_code = self._gen_create_instance_code(svc_desc, ctx)
+        method_name = self._get_getter_method_name(svc_desc, is_async=True)
+        override_code = self._gen_override_check_code(svc_desc)
+
+        if svc_desc.is_transient:
+            return f"""
+    async def {method_name}(self):{override_code}
+        return {new_instance_code}
+"""
+        service_reference = self._inspector.get_reference(svc_desc.service_id)
+        locks_attribute = self._singleton_async_locks_attr
+        if not svc_desc.is_singleton:
+            locks_attribute = self._scoped_async_locks_attr
+
+        return f"""
+    async def {method_name}(self):{self._gen_resolve_count_code(svc_desc)}
+        {self._gen_cached_instance_code(svc_desc, ctx, " " * 8)}
+
+        lock = {locks_attribute}.get({service_reference})
+        if lock is None:
+            lock = {locks_attribute}[{service_reference}] = asyncio.Lock()
+        async with lock:
+            {self._gen_cached_instance_code(svc_desc, ctx, " " * 12)}
+{self._gen_override_instance_code(svc_desc, ctx, " " * 12, is_async=True)}
+            {self._gen_new_instance_code(svc_desc, new_instance_code, " " * 12)}{self._gen_store_instance_code(svc_desc, ctx, " " * 12)}
+            return instance
+"""
+
+    def _gen_apreload_code(self, ctx: _GenerationContext[Any]) -> str:
+        """
+        Generates the method that preloads async singletons, layer by layer.
+        The singletons of a layer are created concurrently with asyncio.gather
+        """
+        layers_code = ""
+        for layer in ctx.get_preload_layers(is_async=True):
+            getter_calls = [
+                f"self.{self._get_getter_method_name(svc_desc, is_async=True)}()"
+                for svc_desc in layer
+            ]
+            if len(getter_calls) == 1:
+                layers_code += f"\n        await {getter_calls[0]}"
+            else:
+                layers_code += (
+                    f"\n        await asyncio.gather({', '.join(getter_calls)})"
+                )
+
+        return f"""
+    async def apreload(self):{layers_code or f"{chr(10)}        pass"}
+"""
+
+    def _gen_preload_singletons_code(self, ctx: _GenerationContext[Any]) -> str:
+        """
+        Generates the method that preloads singletons, layer by layer.
+
+        When preload_workers is set, singletons in the same layer are created concurrently
+        in a thread pool, otherwise they are created one after the other
+        """
+        if self._is_parallel_preload(ctx):
+            layers_code = "".join(
+                f"\n({''.join(f'self.{self._get_getter_method_name(svc_desc)},' for svc_desc in layer)}),"
+                for layer in ctx.get_preload_layers(is_async=False)
+            )
+            return f"""
+    def _preload_singletons(self):
+        {self._inspector.get_full_name(preload_in_threads)}(
+            ({layers_code}
+            ),
+            max_workers={self._preload_workers},
+        )
+"""
+
+        getter_calls_code = "".join(
+            f"\n        self.{self._get_getter_method_name(svc_desc)}()"
+            for layer in ctx.get_preload_layers(is_async=False)
+            for svc_desc in layer
+        )
+        return f"""
+    def _preload_singletons(self):{getter_calls_code}
+"""
+
+    def _gen_aget_body_code(self, ctx: _GenerationContext[Any]) -> str:
+        """
+        Generates the body of `aget`, sync services are simply resolved with `get`
+        """
+        if not ctx.async_service_ids:
+            return """
+        return self.get(service_id)"""
+
+        return f"""
+        async_getter = {self._async_service_getter_map_attr}.get(service_id)
+        if async_getter is not None:
+            return await async_getter({self._gen_resolving_container_code()})
+        return self.get(service_id)"""
+
+    def _gen_class_code(
+        self,
+        ctx: _GenerationContext[ServiceId_T],
+        class_name: str,
+    ) -> str:
+        """
+        Generates class code
+
+        Uses the given class_name and inherit from ContainerProto
+
+        Scoped containers are created by `create_scope` without calling `__init__`: they only allocate
+        their own scoped storage and share everything else with the container they were created from.
+        When scope_pool_size is set, closed scoped containers are recycled by `create_scope`.
+        """
+        container_proto_reference = self._inspector.get_reference(ContainerProto)
+        # Attributes of the root container that are shared with its scoped containers
+        shared_attributes = ["_singleton_instances", "_singleton_disposables"]
+        # Attributes of each scoped container
+        scope_attributes = [
+            "_is_scope",
+            "_scoped_instances",
+            "_disposables",
+            "_exit_token",
+        ]
+        singleton_lock_param_code = ""
+        init_extra_code = ""
+        scope_extra_code = ""
+        if self._thread_safe:
+            shared_attributes.append("_singleton_locks")
+            singleton_lock_param_code = "\n        singleton_locks = None,"
+            init_extra_code += f"""
+        {self._singleton_locks_attr} = {{}} if singleton_locks is None else singleton_locks
+        {self._scoped_locks_attr} = {{}}"""
+            scope_extra_code += "\n        scope._scoped_locks = {}"
+            scope_attributes.append("_scoped_locks")
+        if ctx.async_service_ids:
+            shared_attributes.append("_singleton_async_locks")
+            singleton_lock_param_code += "\n        singleton_async_locks = None,"
+            init_extra_code += f"""
+        {self._singleton_async_locks_attr} = {{}} if singleton_async_locks is None else singleton_async_locks
+        {self._scoped_async_locks_attr} = {{}}"""
+            scope_extra_code += "\n        scope._scoped_async_locks = {}"
+            scope_attributes.append("_scoped_async_locks")
+        if self._instrument:
+            shared_attributes.append("_stats")
+            singleton_lock_param_code += "\n        stats = None,"
+            init_extra_code += f"\n        {self._stats_attr} = {self._inspector.get_full_name(new_stats)}() if stats is None else stats"
+        pooled_svc_descs = [
+            svc_desc
+            for svc_desc in ctx.service_descriptors_map.values()
+            if svc_desc.is_pooled
+        ]
+        if pooled_svc_descs:
+            shared_attributes.append("_pools")
+            singleton_lock_param_code += "\n        pools = None,"
+            init_extra_code += f"""
+        if pools is None:
+            {self._pools_attr} = {{{"".join(f"{chr(10)}                {self._inspector.get_reference(svc_desc.service_id)}: {self._gen_pool_code(svc_desc)}," for svc_desc in pooled_svc_descs)}
+            }}
+            # Idle pooled instances are disposed along with singletons
+            {self._singleton_disposables_attr}.extend({self._pools_attr}.values())
+        else:
+            {self._pools_attr} = pools"""
+        if ctx.reinit_singleton_ids:
+            init_extra_code += f"""
+        if not self._is_scope:
+            {self._inspector.get_full_name(reinit_after_fork)}(self)"""
+        entered_scope_attribute = "self._entered_scope"
+        if self._ambient_scopes:
+            shared_attributes.append("_ambient_scope")
+            init_extra_code += f"""
+        if not self._is_scope:
+            self._ambient_scope = contextvars.ContextVar("{class_name}._ambient_scope")"""
+            entered_scope_attribute = "self._ambient_scope"
+        if any(svc_desc.imported for svc_desc in ctx.service_descriptors_map.values()):
+            shared_attributes.append("_imports")
+            singleton_lock_param_code += "\n        imports = None,"
+            init_extra_code += (
+                "\n        self._imports = {} if imports is None else imports"
+            )
+        if self._overrides:
+            shared_attributes.extend(("_overrides", "_override_containers"))
+            init_extra_code += """
+        if not self._is_scope:
+            self._overrides = {}
+            self._override_containers = weakref.WeakSet((self,))"""
+            scope_extra_code += "\n        self._override_containers.add(scope)"
+        if self._scope_pool_size:
+            shared_attributes.append("_scope_pool")
+            init_extra_code += "\n        self._scope_pool = []"
+            scope_extra_code += "\n        scope._is_pooled = False"
+            scope_attributes.append("_is_pooled")
+        slots_code = ""
+        if self._slots:
+            slots_code = f"""
+    __slots__ = ({"".join(f'"{attribute}", ' for attribute in scope_attributes + shared_attributes)}"__weakref__")
+"""
+
+        class_code = f"""
+class {class_name}({container_proto_reference}):
+{slots_code}
+    _entered_scope = contextvars.ContextVar("{class_name}._entered_scope")
+
+    def __init__(
+        self,
+        singleton_instances = None,
+        singleton_disposables = None,{singleton_lock_param_code}
+    ) -> None:
+        self._is_scope = singleton_instances is not None
+        {self._scoped_instances_attr} = {self._gen_new_instances_code("self._scoped_slot_indices")}
+        {self._singleton_instances_attr} = {self._gen_new_instances_code("self._singleton_slot_indices")} if singleton_instances is None else singleton_instances
+        {self._scoped_disposables_attr} = []
+        {self._singleton_disposables_attr} = [] if singleton_disposables is None else singleton_disposables{init_extra_code}
+"""
+
+        if ctx.preloaded_singleton_ids:
+            class_code += f"""
+        if singleton_instances is None:
+            self._preload_singletons()
+{self._gen_preload_singletons_code(ctx)}"""
+
+        class_code += f"""
+    def get(self, service_id):
+        try:
+            getter = {self._service_getter_map_attr}[service_id]
+        except KeyError:
+            raise {self._inspector.get_full_name(MissingServiceError)}(service_id) from None
+        return getter({self._gen_resolving_container_code()})
+
+    __getitem__ = get
+
+    def resolver(self, service_id):
+        try:
+            getter = {self._service_getter_map_attr}[service_id]
+        except KeyError:
+            raise {self._inspector.get_full_name(MissingServiceError)}(service_id) from None{self._gen_bind_code("getter")}
+
+    async def aget(self, service_id):{self._gen_aget_body_code(ctx)}
+
+    def get_all(self, service_id):
+        try:
+            getter = self._collection_getter_map[service_id]
+        except KeyError:
+            raise {self._inspector.get_full_name(MissingServiceError)}(service_id) from None
+        return getter({self._gen_resolving_container_code()})
+
+    _batch_compiler = None
+    _batches = {{}}
+
+    def get_many(self, service_ids):
+        try:
+            batch = self._batches[service_ids]
+        except (KeyError, TypeError):
+            batch = self._compile_batch(tuple(service_ids))
+        return batch({self._gen_resolving_container_code()})
+
+    def compile_batch(self, service_ids):
+        batch = self._compile_batch(tuple(service_ids)){self._gen_bind_code("batch")}
+
+    @classmethod
+    def _compile_batch(cls, service_ids):
+        batch = cls._batches.get(service_ids)
+        if batch is None:
+            if cls._batch_compiler is None:
+                batch = {self._inspector.get_full_name(create_batch)}(cls._service_getter_map, service_ids)
+            else:
+                batch = cls._batch_compiler(service_ids)
+            cls._batches[service_ids] = batch
+        return batch
+
+    _wiring_compiler = None
+    _wirings = {{}}
+    _container_service_ids = ({"".join(f"{reference}, " for reference in sorted(self._inspector.get_reference(svc_id) for svc_id in self._container_svc_ids))})
+
+    def wire(self, func):
+        wiring = self._wirings.get(func)
+        if wiring is None:
+            if self._wiring_compiler is None:
+                wiring = {self._inspector.get_full_name(create_wiring)}(
+                    self._service_getter_map.keys(), func, self._container_service_ids
+                )
+            else:
+                wiring = self._wiring_compiler(func)
+            self._wirings[func] = wiring
+        return wiring(self, func)
+
+    def create_scope(self):{self._gen_recycled_scope_code()}
+        scope = object.__new__(self.__class__)
+        scope._is_scope = True
+        scope._scoped_instances = {self._gen_new_instances_code("self._scoped_slot_indices")}
+        scope._disposables = []{"".join(f"{chr(10)}        scope.{attribute} = self.{attribute}" for attribute in shared_attributes)}{scope_extra_code}
+        return scope
+
+{self._gen_close_code()}
+    def _pop_disposables(self):
+        disposables = {self._scoped_disposables_attr}
+        {self._scoped_disposables_attr} = []
+        {self._scoped_instances_attr} = {self._gen_new_instances_code("self._scoped_slot_indices")}
+        if not self._is_scope:
+            disposables = {self._inspector.get_full_name(pop_disposables)}({self._singleton_disposables_attr}) + disposables
+        return disposables
+
+    def __enter__(self):
+        scope = self.create_scope()
+        scope._exit_token = {entered_scope_attribute}.set(scope)
+        return scope
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        {self._inspector.get_full_name(exit_scope)}({entered_scope_attribute}).close()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await {self._inspector.get_full_name(exit_scope)}({entered_scope_attribute}).aclose()
+{self._gen_apreload_code(ctx)}{self._gen_stats_code()}{self._gen_pool_stats_code(pooled_svc_descs)}{self._gen_reinit_after_fork_code(ctx)}{self._gen_override_code()}"""
+
         return class_code
 
-    def get_code(
+    def _gen_resolving_container_code(self) -> str:
+        """
+        Generates the expression of the container that resolves services requested to `self`.
+        With ambient scopes, services requested to the root container are resolved by the scope
+        entered in the current context, if any
+        """
+        if not self._ambient_scopes:
+            return "self"
+        return "self if self._is_scope else self._ambient_scope.get(self)"
+
+    def _gen_bind_code(self, function_name: str) -> str:
+        """
+        Generates the statements that return `function_name`, which takes a container, bound to the
+        container that resolves services requested to `self`.
+        With ambient scopes, the root container is bound to the scope entered when the function is called
+        """
+        if not self._ambient_scopes:
+            return f"""
+        return {function_name}.__get__(self, self.__class__)"""
+
+        return f"""
+        if self._is_scope:
+            return {function_name}.__get__(self, self.__class__)
+        ambient_scope = self._ambient_scope
+        return lambda: {function_name}(ambient_scope.get(self))"""
+
+    def _gen_stats_code(self) -> str:
+        if not self._instrument:
+            return ""
+
+        return f"""
+    def stats(self):
+        return {self._inspector.get_full_name(get_stats)}({self._stats_attr})
+"""
+
+    def _gen_override_code(self) -> str:
+        """
+        Generates `override` and `_drop_overridden`, which drops the scoped/singleton instances of an overridden
+        service and of the services that depend on it, in the root container and every scoped container created from it that
+        is still alive. Dependents are set by `_set_runtime_compilers`, classes that were not
+        created by a CodeGenerator keep their instances
+        """
+        if not self._overrides:
+            return ""
+
+        return f"""
+    _dependents = {{}}
+
+    def override(self, service_id, instance_or_provider):
+        if service_id not in {self._service_getter_map_attr}:
+            raise {self._inspector.get_full_name(MissingServiceError)}(service_id)
+        return {self._inspector.get_full_name(override)}(self, service_id, instance_or_provider)
+
+    def _drop_overridden(self, service_id):
+        dependent_ids = {self._inspector.get_full_name(get_dependent_ids)}(self._dependents, service_id)
+        dependent_ids.add(service_id)
+        {self._gen_drop_instances_code(self._singleton_instances_attr, self._singleton_disposables_attr, "self._singleton_slot_indices", "dependent_ids")}
+        for container in self._override_containers:
+            {self._gen_drop_instances_code("container._scoped_instances", "container._disposables", "self._scoped_slot_indices", "dependent_ids")}
+"""
+
+    def _gen_pool_code(self, svc_desc: ServiceDescriptor[ServiceId_T]) -> str:
+        reset_code = ""
+        if svc_desc.reset is not None:
+            reset_code = f", {self._inspector.get_reference(svc_desc.reset)}"
+        return f"{self._inspector.get_full_name(ServicePool)}({svc_desc.pool_size}{reset_code})"
+
+    def _gen_pool_stats_code(
+        self, pooled_svc_descs: Sequence[ServiceDescriptor[ServiceId_T]]
+    ) -> str:
+        if not pooled_svc_descs:
+            return ""
+
+        return f"""
+    def pool_stats(self):
+        return {self._inspector.get_full_name(get_pool_stats)}({self._pools_attr})
+"""
+
+    def _gen_reinit_after_fork_code(self, ctx: _GenerationContext[ServiceId_T]) -> str:
+        """
+        Generates `_reinit_after_fork`, called in forked child processes to drop the singletons
+        that must be created again, their getters create them on next use
+        """
+        if not ctx.reinit_singleton_ids:
+            return ""
+
+        service_references = "".join(
+            f"{self._inspector.get_reference(svc_desc.service_id)}, "
+            for svc_desc in ctx.service_descriptors_map.values()
+            if svc_desc.service_id in ctx.reinit_singleton_ids
+        )
+        return f"""
+    def _reinit_after_fork(self):
+        {self._gen_drop_instances_code(self._singleton_instances_attr, self._singleton_disposables_attr, "self._singleton_slot_indices", f"({service_references})")}
+"""
+
+    def _gen_drop_instances_code(
+        self,
+        instances_attribute: str,
+        disposables_attribute: str,
+        slot_indices_attribute: str,
+        service_ids_code: str,
+    ) -> str:
+        if not self._slots:
+            return f"{self._inspector.get_full_name(drop_instances)}({instances_attribute}, {disposables_attribute}, {service_ids_code})"
+        return f"{self._inspector.get_full_name(drop_slots)}({instances_attribute}, {disposables_attribute}, {slot_indices_attribute}, {service_ids_code})"
+
+    def _gen_new_instances_code(self, slot_indices_attribute: str) -> str:
+        """
+        Generates the creation of empty instance storage: a dict keyed by service id,
+        or with slots a list with an empty slot per service
+        """
+        if not self._slots:
+            return "{}"
+        return f"[_EMPTY] * len({slot_indices_attribute})"
+
+    def _gen_empty_slot_code(self) -> str:
+        """
+        Generates the module level `_EMPTY` sentinel, loaded by getters as a global when slots are enabled
+        """
+        if not self._slots:
+            return ""
+        return f"_EMPTY = {self._inspector.get_module_name(drop_slots)}.EMPTY\n"
+
+    def _gen_recycled_scope_code(self) -> str:
+        """
+        Generates the start of `create_scope`, which reuses a recycled scoped container if there is one
+        """
+        if not self._scope_pool_size:
+            return ""
+
+        return """
+        try:
+            scope = self._scope_pool.pop()
+        except IndexError:
+            pass
+        else:
+            scope._is_pooled = False
+            return scope
+"""
+
+    def _gen_close_code(self) -> str:
+        """
+        Generates `close`/`aclose`.
+        When scope_pool_size is set, closed scoped containers are given back to the pool
+        """
+        if not self._scope_pool_size:
+            return f"""
+    def close(self):
+        {self._inspector.get_full_name(dispose)}(self._pop_disposables())
+
+    async def aclose(self):
+        await {self._inspector.get_full_name(adispose)}(self._pop_disposables())
+"""
+
+        return f"""
+    def close(self):
+        try:
+            {self._inspector.get_full_name(dispose)}(self._pop_disposables())
+        finally:
+            self._recycle()
+
+    async def aclose(self):
+        try:
+            await {self._inspector.get_full_name(adispose)}(self._pop_disposables())
+        finally:
+            self._recycle()
+
+    def _recycle(self):
+        if self._is_scope and not self._is_pooled and len(self._scope_pool) < {self._scope_pool_size}:
+            self._is_pooled = True
+            self._scope_pool.append(self)
+"""
+
+    def _gen_dispatch_tables_code(
+        self, ctx: _GenerationContext[ServiceId_T], class_name: str
+    ) -> str:
+        """
+        Generates the class level tables mapping service ids to the getter functions of the class,
+        shared by every container instance
+        """
+        code = f"""
+{class_name}._service_getter_map = {{
+    {", ".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {class_name}.{self._get_getter_method_name(svc_desc)}" for svc_desc in ctx.service_descriptors_map.values() if svc_desc.member_of is None)}
+}}
+{class_name}._collection_getter_map = {{
+    {", ".join(f"{self._inspector.get_reference(svc_desc.collection_of)}: {class_name}.{self._get_getter_method_name(svc_desc)}" for svc_desc in ctx.service_descriptors_map.values() if svc_desc.is_collection)}
+}}
+"""
+        if self._slots:
+            code += f"""
+{class_name}._singleton_slot_indices = {{
+    {", ".join(f"{self._inspector.get_reference(service_id)}: {index}" for service_id, index in ctx.singleton_slot_indices.items())}
+}}
+{class_name}._scoped_slot_indices = {{
+    {", ".join(f"{self._inspector.get_reference(service_id)}: {index}" for service_id, index in ctx.scoped_slot_indices.items())}
+}}
+"""
+        if ctx.async_service_ids:
+            code += f"""
+{class_name}._async_service_getter_map = {{
+    {", ".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {class_name}.{self._get_getter_method_name(svc_desc, is_async=True)}" for svc_desc in ctx.service_descriptors_map.values() if ctx.is_async(svc_desc) and svc_desc.member_of is None)}
+}}
+"""
+        return code
+
+    def _gen_derived_dispatch_tables_code(
+        self,
+        ctx: _GenerationContext[ServiceId_T],
+        svc_descs: Sequence[ServiceDescriptor[ServiceId_T]],
+        class_name: str,
+    ) -> str:
+        """
+        Generates the dispatch tables of a class derived by `update_class`,
+        the getters of `svc_descs` replace the ones inherited from the base class
+        """
+        code = f"""
+{class_name}._batches = {{}}
+{class_name}._wirings = {{}}
+{class_name}._service_getter_map = {{
+    **{class_name}._service_getter_map,
+    {"".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {class_name}.{self._get_getter_method_name(svc_desc)}," for svc_desc in svc_descs if svc_desc.member_of is None)}
+}}
+{class_name}._collection_getter_map = {{
+    **{class_name}._collection_getter_map,
+    {"".join(f"{self._inspector.get_reference(svc_desc.collection_of)}: {class_name}.{self._get_getter_method_name(svc_desc)}," for svc_desc in svc_descs if svc_desc.is_collection)}
+}}
+"""
+        if self._slots:
+            code += f"""
+{class_name}._singleton_slot_indices = {{
+    **{class_name}._singleton_slot_indices,
+    {"".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {ctx.singleton_slot_indices[svc_desc.service_id]}," for svc_desc in svc_descs if svc_desc.service_id in ctx.singleton_slot_indices)}
+}}
+{class_name}._scoped_slot_indices = {{
+    **{class_name}._scoped_slot_indices,
+    {"".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {ctx.scoped_slot_indices[svc_desc.service_id]}," for svc_desc in svc_descs if svc_desc.service_id in ctx.scoped_slot_indices)}
+}}
+"""
+        if ctx.async_service_ids:
+            code += f"""
+{class_name}._async_service_getter_map = {{
+    **{class_name}._async_service_getter_map,
+    {"".join(f"{self._inspector.get_reference(svc_desc.service_id)}: {class_name}.{self._get_getter_method_name(svc_desc, is_async=True)}," for svc_desc in svc_descs if ctx.is_async(svc_desc) and svc_desc.member_of is None)}
+}}
+"""
+        return code
+
+    def _get_affected_service_ids(
         self,
+        analysis: _ClassAnalysis[ServiceId_T],
         service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
-        class_name: str = "Container",
-    ):
+        changed_service_ids: Sequence[ServiceId_T],
+    ) -> Set[ServiceId_T]:
         """
-        Generates and returns the code for a Container class with the services in `service_descriptors_map`
+        Returns the ids of the services whose getter code changes: the changed services,
+        the services that depend on them, and the dependents of those that are transient,
+        since transients are inlined in the getters of their dependents.
+
+        Only changed services can depend on services that were added,
+        so the dependents in the analysis of the base class are enough
         """
+        affected = set(changed_service_ids)
+        stack = list(changed_service_ids)
+        while stack:
+            for dependent in analysis.dependents.get(stack.pop(), ()):
+                if dependent in affected:
+                    continue
+                affected.add(dependent)
+                if service_descriptors_map[dependent].is_transient:
+                    stack.append(dependent)
 
-        imports_code = self._gen_imports_code(service_descriptors_map)
-        class_code = self._gen_class_code(service_descriptors_map, class_name)
+        return affected
 
-        getter_methods_code = ""
-        for svc_desc in service_descriptors_map.values():
-            getter_methods_code += self._gen_getter_method_code(
+    def _get_updated_dependents(
+        self,
+        analysis: _ClassAnalysis[ServiceId_T],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        changed_service_ids: Sequence[ServiceId_T],
+    ) -> Dict[ServiceId_T, List[ServiceId_T]]:
+        """
+        Returns the dependents in the analysis of the base class plus the dependencies of changed services.
+        Dependencies that changed services dropped are kept, which can only outline more transients
+        """
+        dependents = dict(analysis.dependents)
+        for service_id in changed_service_ids:
+            for dep in service_descriptors_map[service_id].dependency_kwargs.values():
+                if not self._is_container_reference(dep):
+                    dependents[dep] = [*dependents.get(dep, ()), service_id]
+        return dependents
+
+    def _get_updated_async_service_ids(
+        self,
+        analysis: _ClassAnalysis[ServiceId_T],
+        previous_service_descriptors_map: Mapping[
+            ServiceId_T, ServiceDescriptor[ServiceId_T]
+        ],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        changed_service_ids: Sequence[ServiceId_T],
+    ) -> Optional[Set[ServiceId_T]]:
+        """
+        Returns the ids of the services that must be created asynchronously after the changes,
+        or None if a service that already existed changes from sync to async or vice versa,
+        since that changes the code of every service that depends on it.
+
+        Unchanged services keep the same kind as long as changed ones do, so only changed services
+        are checked, dependencies first
+        """
+        changed = set(changed_service_ids)
+        is_async: Dict[ServiceId_T, bool] = {}
+        for service_id in changed_service_ids:
+            stack = [(service_id, False)]
+            while stack:
+                current, expanded = stack.pop()
+                if current in is_async:
+                    continue
+
+                deps = [
+                    dep
+                    for dep in service_descriptors_map[
+                        current
+                    ].dependency_kwargs.values()
+                    if not self._is_container_reference(dep)
+                ]
+                if not expanded:
+                    stack.append((current, True))
+                    stack.extend(
+                        (dep, False)
+                        for dep in deps
+                        if dep in changed and dep not in is_async
+                    )
+                    continue
+
+                is_async[current] = inspect.iscoroutinefunction(
+                    service_descriptors_map[current].provider
+                ) or any(
+                    is_async[dep]
+                    if dep in changed
+                    else dep in analysis.async_service_ids
+                    for dep in deps
+                )
+
+        async_service_ids = set(analysis.async_service_ids)
+        for service_id, service_is_async in is_async.items():
+            if service_id in previous_service_descriptors_map:
+                if service_is_async != (service_id in async_service_ids):
+                    return None
+            elif service_is_async:
+                # A new async service needs the async dispatch of the base class
+                if not async_service_ids:
+                    return None
+                async_service_ids.add(service_id)
+
+        return async_service_ids
+
+    def _keeps_reinit_singletons(
+        self,
+        analysis: _ClassAnalysis[ServiceId_T],
+        previous_service_descriptors_map: Mapping[
+            ServiceId_T, ServiceDescriptor[ServiceId_T]
+        ],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        changed_service_ids: Sequence[ServiceId_T],
+    ) -> bool:
+        """
+        Returns true if the changes keep the singletons created again after forking:
+        no changed service is one of them or has the REINIT fork policy, and if there are any,
+        no singleton changed, since it could depend on them
+        """
+        for service_id in changed_service_ids:
+            svc_desc = service_descriptors_map[service_id]
+            previous_svc_desc = previous_service_descriptors_map.get(service_id)
+            if (
+                service_id in analysis.reinit_singleton_ids
+                or svc_desc.fork_policy == ForkPolicy.REINIT
+                or (
+                    previous_svc_desc is not None
+                    and previous_svc_desc.fork_policy == ForkPolicy.REINIT
+                )
+                or (analysis.reinit_singleton_ids and svc_desc.is_singleton)
+            ):
+                return False
+
+        return True
+
+    def _keeps_preload_layers(
+        self,
+        previous_service_descriptors_map: Mapping[
+            ServiceId_T, ServiceDescriptor[ServiceId_T]
+        ],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        changed_service_ids: Sequence[ServiceId_T],
+    ) -> bool:
+        """
+        Returns true if the changes keep the singletons to preload and their layers,
+        that is, no preloaded singleton was added and changed services are still singletons or not,
+        with the same preload flag and the same singleton dependencies
+        """
+        for service_id in changed_service_ids:
+            svc_desc = service_descriptors_map[service_id]
+            previous_svc_desc = previous_service_descriptors_map.get(service_id)
+            if previous_svc_desc is None:
+                if svc_desc.is_singleton and svc_desc.preload:
+                    return False
+                continue
+
+            if svc_desc.is_singleton != previous_svc_desc.is_singleton or (
+                svc_desc.is_singleton and svc_desc.preload != previous_svc_desc.preload
+            ):
+                return False
+
+            singleton_deps = self._get_singleton_dependencies(
                 svc_desc, service_descriptors_map
             )
+            previous_singleton_deps = self._get_singleton_dependencies(
+                previous_svc_desc, previous_service_descriptors_map
+            )
+            if {dep.service_id for dep in singleton_deps} != {
+                dep.service_id for dep in previous_singleton_deps
+            }:
+                return False
+
+        return True
+
+    def _get_slot_indices(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        base_slot_indices: Optional[_SlotIndices] = None,
+    ) -> _SlotIndices:
+        """
+        Returns the index of the slot of each singleton and scoped service when slots are enabled.
+        Services keep their slot in `base_slot_indices`, the slots of the class being derived from,
+        and other services get the next free slot
+        """
+        singleton_slot_indices: Dict[Any, int] = {}
+        scoped_slot_indices: Dict[Any, int] = {}
+        if not self._slots:
+            return singleton_slot_indices, scoped_slot_indices
+
+        if base_slot_indices is not None:
+            singleton_slot_indices.update(base_slot_indices[0])
+            scoped_slot_indices.update(base_slot_indices[1])
+        for svc_desc in service_descriptors_map.values():
+            if svc_desc.is_transient or svc_desc.imported:
+                continue
+
+            slot_indices = scoped_slot_indices
+            if svc_desc.is_singleton:
+                slot_indices = singleton_slot_indices
+            if svc_desc.service_id not in slot_indices:
+                slot_indices[svc_desc.service_id] = len(slot_indices)
+
+        return singleton_slot_indices, scoped_slot_indices
+
+    def _get_generation_context(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        slot_indices: Optional[_SlotIndices] = None,
+    ) -> _GenerationContext[ServiceId_T]:
+        """
+        `slot_indices` are the slots of the class the code is generated for, when it was created already
+        """
+        self._check_circular_dependencies(service_descriptors_map)
+        async_service_ids = self._get_async_service_ids(service_descriptors_map)
+        if slot_indices is None:
+            slot_indices = self._get_slot_indices(service_descriptors_map)
+        return _GenerationContext(
+            dependents=self._get_dependents(service_descriptors_map),
+            service_descriptors_map=service_descriptors_map,
+            preload_layers=self._get_preload_layers(
+                service_descriptors_map, async_service_ids
+            ),
+            async_service_ids=async_service_ids,
+            reinit_singleton_ids=self._get_reinit_singleton_ids(
+                service_descriptors_map
+            ),
+            singleton_slot_indices=dict(slot_indices[0]),
+            scoped_slot_indices=dict(slot_indices[1]),
+        )
+
+    def _gen_code_with_context(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str,
+    ) -> Tuple[str, _GenerationContext[ServiceId_T]]:
+        ctx = self._get_generation_context(service_descriptors_map)
+        imports_code = self._gen_imports_code(ctx)
+        class_code = self._gen_class_code(ctx, class_name)
+
+        getter_methods_code = "".join(
+            self._gen_getter_method_code(svc_desc, ctx)
+            for svc_desc in service_descriptors_map.values()
+        )
 
         code = f"""
 {imports_code}
+{self._gen_empty_slot_code()}
 {class_code}
 {getter_methods_code}
+{self._gen_dispatch_tables_code(ctx, class_name)}
 """
+        return code, ctx
+
+    def _gen_code(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str,
+    ) -> str:
+        """
+        Generates the unformatted code for a Container class with the services in `service_descriptors_map`
+        """
+        return self._gen_code_with_context(service_descriptors_map, class_name)[0]
+
+    def get_code_size(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str = "Container",
+    ) -> CodeSizeReport:
+        """
+        Returns the size of the unformatted code generated for a Container class with the services
+        in `service_descriptors_map`, useful to tune the inlining budget
+        """
+        code, ctx = self._gen_code_with_context(service_descriptors_map, class_name)
+        return CodeSizeReport(
+            characters=len(code),
+            lines=code.count("\n"),
+            getter_methods=len(service_descriptors_map) + len(ctx.async_service_ids),
+            outlined_services=len(ctx.outlined_service_ids),
+            largest_inline_size=max(
+                (size for size, _ in ctx.transient_inline_sizes.values()), default=0
+            ),
+            deepest_inline_depth=max(
+                (depth for _, depth in ctx.transient_inline_sizes.values()), default=0
+            ),
+        )
+
+    def get_code(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str = "Container",
+    ):
+        """
+        Generates and returns the code for a Container class with the services in `service_descriptors_map`
+
+        This is meant to be read by humans, so the code is formatted if a code formatter is configured
+        """
+        code = self._gen_code(service_descriptors_map, class_name)
 
         if self._code_formatter:
             code = self._code_formatter.format(code)
 
         return code
 
+    def _get_options(self) -> Mapping[str, Any]:
+        """
+        Returns the options that influence the generated code
+        """
+        inspector = self._inspector
+        # Caching does not change the results of the inspector
+        while isinstance(inspector, CachingInspector):
+            inspector = inspector.inspector
+
+        return {
+            "inspector": _get_fingerprint_reference(type(inspector)),
+            "preload_workers": self._preload_workers,
+            "thread_safe": self._thread_safe,
+            "scope_pool_size": self._scope_pool_size,
+            "inline_max_depth": self._inline_max_depth,
+            "inline_max_size": self._inline_max_size,
+            "instrument": self._instrument,
+            "ambient_scopes": self._ambient_scopes,
+            "overrides": self._overrides,
+            "slots": self._slots,
+            "container_svc_ids": sorted(
+                _get_fingerprint_reference(svc_id) for svc_id in self._container_svc_ids
+            ),
+        }
+
+    def get_fingerprint(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str = "Container",
+    ) -> str:
+        """
+        Returns a digest identifying the code generated for `service_descriptors_map`.
+
+        The digest covers service ids, providers, lifecycles, dependency kwargs, whether class providers
+        are disposable, generator options, the running python implementation and the meta_di sources,
+        so two builds with the same fingerprint are guaranteed to generate the same code.
+        """
+        parts = [
+            sys.implementation.cache_tag or sys.version,
+            _get_meta_di_stamp(),
+            class_name,
+            repr(sorted(self._get_options().items())),
+        ]
+        for svc_desc in service_descriptors_map.values():
+            deps = ",".join(
+                f"{kwarg}={_get_fingerprint_reference(dep)}"
+                for kwarg, dep in svc_desc.dependency_kwargs.items()
+            )
+            parts.append(
+                f"{_get_fingerprint_reference(svc_desc.service_id)}"
+                f"|{_get_fingerprint_reference(svc_desc.provider)}"
+                f"|{svc_desc.lifecycle.name}"
+                f"|{svc_desc.preload}"
+                f"|{svc_desc.pool_size}"
+                f"|{svc_desc.fork_policy.name}"
+                f"|{_get_fingerprint_reference(svc_desc.reset)}"
+                f"|{inspect.iscoroutinefunction(svc_desc.provider)}"
+                f"|{self._get_disposal_fingerprint(svc_desc)}"
+                f"|{svc_desc.member_of is not None}"
+                f"|{deps}"
+            )
+
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _get_disposal_fingerprint(self, svc_desc: ServiceDescriptor[Any]) -> str:
+        """
+        Whether instances of class providers are disposed is decided when the code is generated,
+        see `_gen_store_instance_code`, other providers are checked at runtime
+        """
+        if not isinstance(svc_desc.provider, type):
+            return "runtime"
+        return "disposable" if is_disposable(svc_desc.provider) else "not disposable"
+
+    def compile_code(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        class_name: str = "Container",
+    ):
+        """
+        Generates and compiles the code for a Container class with the services in `service_descriptors_map`
+
+        The code is compiled straight from the generator output, the code formatter is skipped
+        since nobody reads this code.
+
+        If a code cache is configured, the compiled code is looked up by fingerprint first and
+        stored there after a miss.
+        """
+        fingerprint = None
+        if self._code_cache is not None:
+            fingerprint = self.get_fingerprint(service_descriptors_map, class_name)
+            code = self._code_cache.load(fingerprint)
+            if code is not None:
+                return code
+
+        source = self._gen_code(service_descriptors_map, class_name)
+        code = compile(source, f"<meta_di {class_name}>", "exec")
+
+        if self._code_cache is not None and fingerprint is not None:
+            self._code_cache.store(fingerprint, code)
+
+        return code
+
     def create_class(
         self,
         service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
@@ -255,8 +1989,404 @@ class {class_name}({container_proto_reference}):
         Generates and executes the code for a Container class with the services in `service_descriptors_map`
         Returns the Type of the newly generated Container class
         """
-        code = self.get_code(service_descriptors_map, class_name)
+        code = self.compile_code(service_descriptors_map, class_name)
+
+        globs = {}
+        exec(code, globs)  # pylint: disable=exec-used
+        container_class = globs[class_name]
+        self._set_runtime_compilers(container_class, service_descriptors_map)
+        return container_class
+
+    def _set_runtime_compilers(
+        self,
+        container_class: Type[ContainerProto],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+    ) -> None:
+        """
+        Lets `container_class` generate batches and wrappers on demand for its services,
+        and find the services that depend on overridden services
+        """
+        service_descriptors_map = dict(service_descriptors_map)
+        # Generated classes define these attributes, ContainerProto does not
+        if self._overrides:
+            setattr(
+                container_class,
+                "_dependents",
+                self._get_dependents(service_descriptors_map),
+            )
+        slot_indices = None
+        if self._slots:
+            slot_indices = _get_class_slot_indices(container_class)
+        setattr(
+            container_class,
+            "_batch_compiler",
+            functools.partial(
+                self.compile_batch, service_descriptors_map, slot_indices=slot_indices
+            ),
+        )
+        setattr(
+            container_class,
+            "_wiring_compiler",
+            functools.partial(
+                self.compile_wiring, service_descriptors_map, slot_indices=slot_indices
+            ),
+        )
+
+    def _get_class_analysis(
+        self,
+        container_class: Type[ContainerProto],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+    ) -> _ClassAnalysis[ServiceId_T]:
+        analysis = self._class_analyses.get(container_class)
+        if analysis is None:
+            async_service_ids = self._get_async_service_ids(service_descriptors_map)
+            analysis = _ClassAnalysis(
+                async_service_ids=async_service_ids,
+                preload_layer_ids=[
+                    [svc_desc.service_id for svc_desc in layer]
+                    for layer in self._get_preload_layers(
+                        service_descriptors_map, async_service_ids
+                    )
+                ],
+                dependents=self._get_dependents(service_descriptors_map),
+                reinit_singleton_ids=self._get_reinit_singleton_ids(
+                    service_descriptors_map
+                ),
+            )
+            self._class_analyses[container_class] = analysis
+        return analysis
+
+    def update_class(
+        self,
+        container_class: Type[ContainerProto],
+        previous_service_descriptors_map: Mapping[
+            ServiceId_T, ServiceDescriptor[ServiceId_T]
+        ],
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        changed_service_ids: Iterable[ServiceId_T],
+        class_name: str = "Container",
+    ) -> Optional[Type[ContainerProto]]:
+        """
+        Returns a Container class with the services in `service_descriptors_map`, derived from
+        `container_class`, which was created for `previous_service_descriptors_map`.
+        `changed_service_ids` are the services added, replaced or removed since then.
+        Only the getters affected by the changes are generated, the rest are inherited,
+        so the cost depends on the changes rather than on the number of services.
+
+        Returns None when the changes affect the whole class and it must be created again:
+        services were removed, pooled or imported services changed, or the singletons to preload, the singletons
+        created again after forking or the services that must be created asynchronously changed.
+        """
+        changed_service_ids = [
+            service_id
+            for service_id in changed_service_ids
+            if previous_service_descriptors_map.get(service_id)
+            != service_descriptors_map.get(service_id)
+        ]
+        if any(
+            service_id not in service_descriptors_map
+            for service_id in changed_service_ids
+        ):
+            return None
+
+        # Pools and imports are set up by `__init__`, which derived classes inherit
+        if any(
+            svc_desc.is_pooled or svc_desc.imported
+            for service_id in changed_service_ids
+            for svc_desc in (
+                service_descriptors_map[service_id],
+                previous_service_descriptors_map.get(service_id),
+            )
+            if svc_desc is not None
+        ):
+            return None
+
+        analysis = self._get_class_analysis(
+            container_class, previous_service_descriptors_map
+        )
+        if not self._keeps_reinit_singletons(
+            analysis,
+            previous_service_descriptors_map,
+            service_descriptors_map,
+            changed_service_ids,
+        ):
+            return None
+
+        self._check_circular_dependencies(service_descriptors_map, changed_service_ids)
+        async_service_ids = self._get_updated_async_service_ids(
+            analysis,
+            previous_service_descriptors_map,
+            service_descriptors_map,
+            changed_service_ids,
+        )
+        if async_service_ids is None or not self._keeps_preload_layers(
+            previous_service_descriptors_map,
+            service_descriptors_map,
+            changed_service_ids,
+        ):
+            return None
+
+        ctx = _GenerationContext(
+            service_descriptors_map=service_descriptors_map,
+            preload_layers=[
+                [service_descriptors_map[service_id] for service_id in layer]
+                for layer in analysis.preload_layer_ids
+            ],
+            async_service_ids=async_service_ids,
+            reinit_singleton_ids=analysis.reinit_singleton_ids,
+            dependents=self._get_updated_dependents(
+                analysis, service_descriptors_map, changed_service_ids
+            ),
+        )
+        if self._slots:
+            (
+                ctx.singleton_slot_indices,
+                ctx.scoped_slot_indices,
+            ) = self._get_slot_indices(
+                service_descriptors_map, _get_class_slot_indices(container_class)
+            )
+        affected_service_ids = self._get_affected_service_ids(
+            analysis, service_descriptors_map, changed_service_ids
+        )
+        svc_descs = [
+            service_descriptors_map[service_id] for service_id in affected_service_ids
+        ]
+        getter_methods_code = "".join(
+            self._gen_getter_method_code(svc_desc, ctx) for svc_desc in svc_descs
+        )
+        source = f"""
+{self._gen_imports_code(ctx, self._get_referenced_service_descriptors(svc_descs, ctx))}
+
+{self._gen_empty_slot_code()}
+class {class_name}(_base_container_class):
+    {"__slots__ = ()" if self._slots else "pass"}
+{getter_methods_code}
+{self._gen_derived_dispatch_tables_code(ctx, svc_descs, class_name)}
+"""
+        code = compile(source, f"<meta_di {class_name}>", "exec")
+
+        globs = {"_base_container_class": container_class}
+        exec(code, globs)  # pylint: disable=exec-used
+        derived_class = globs[class_name]
+        self._set_runtime_compilers(derived_class, service_descriptors_map)
+        return derived_class
+
+    def _get_referenced_service_descriptors(
+        self,
+        svc_descs: Sequence[ServiceDescriptor[ServiceId_T]],
+        ctx: _GenerationContext[ServiceId_T],
+    ) -> List[ServiceDescriptor[ServiceId_T]]:
+        """
+        Returns the services referenced by the getters of `svc_descs`:
+        the services themselves, their dependencies and the dependencies of inlined transients
+        """
+        referenced: Dict[ServiceId_T, ServiceDescriptor[ServiceId_T]] = {}
+        expanded: Set[ServiceId_T] = set()
+        stack = list(svc_descs)
+        while stack:
+            svc_desc = stack.pop()
+            referenced[svc_desc.service_id] = svc_desc
+            if svc_desc.service_id in expanded:
+                continue
+
+            expanded.add(svc_desc.service_id)
+            for dep in svc_desc.dependency_kwargs.values():
+                if (
+                    self._is_container_reference(dep)
+                    or dep not in ctx.service_descriptors_map
+                ):
+                    continue
+
+                dep_svc_desc = ctx.service_descriptors_map[dep]
+                referenced[dep] = dep_svc_desc
+                if dep_svc_desc.is_transient:
+                    stack.append(dep_svc_desc)
+
+        return list(referenced.values())
+
+    def _gen_batch_code(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        service_ids: Sequence[ServiceId_T],
+        slot_indices: Optional[_SlotIndices] = None,
+    ) -> str:
+        """
+        Generates a `batch(self)` function that creates all `service_ids` and returns them as a tuple.
+        Transient services are inlined like in getters and every scoped/singleton instance
+        they need is loaded once, no matter how many of the requested services share it.
+        """
+        ctx = self._get_generation_context(service_descriptors_map, slot_indices)
+        ctx.hoisted_references = {}
+
+        instances_code = []
+        for service_id in service_ids:
+            if self._is_container_reference(service_id):
+                instances_code.append("self")
+                continue
+
+            svc_desc = service_descriptors_map.get(service_id)
+            # Members are only resolved through their collection, like by `get`
+            if svc_desc is None or svc_desc.member_of is not None:
+                raise MissingServiceError(service_id)
+
+            if ctx.is_async(svc_desc):
+                raise AsyncServiceError(service_id)
+
+            if svc_desc.is_transient:
+                instances_code.append(self._gen_requested_transient_code(svc_desc, ctx))
+            else:
+                instances_code.append(
+                    self._gen_instance_reference_code(
+                        svc_desc, ctx, inline_preloaded=True
+                    )
+                )
+
+        hoisted_code = "".join(
+            f"\n    {name} = {code}" for name, code in ctx.hoisted_references.values()
+        )
+        return f"""
+{self._gen_imports_code(ctx)}
+
+def batch(self):{hoisted_code}
+    return ({"".join(f"{chr(10)}        {instance_code}," for instance_code in instances_code)}
+    )
+"""
+
+    def compile_batch(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        service_ids: Sequence[ServiceId_T],
+        slot_indices: Optional[_SlotIndices] = None,
+    ) -> Callable[[Any], Tuple[Any, ...]]:
+        """
+        Generates and compiles a single function that creates all `service_ids` at once.
+        The function takes the container as its only argument and returns the instances as a tuple.
+        With slots, `slot_indices` must be the slots of the container class
+        """
+        source = self._gen_batch_code(
+            service_descriptors_map, service_ids, slot_indices
+        )
+        code = compile(source, "<meta_di batch>", "exec")
+
+        globs = {}
+        exec(code, globs)  # pylint: disable=exec-used
+        return globs["batch"]
+
+    def _gen_wiring_code(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        func: Callable[..., Any],
+        slot_indices: Optional[_SlotIndices] = None,
+    ) -> str:
+        """
+        Generates a `wiring(self, func)` function that returns a wrapper of `func`, which creates the
+        services `func` depends on and passes them as keyword arguments, along with the caller's arguments.
+        Services the caller passed, by keyword or positionally, are not created.
+        Dependencies that are not registered services, or that can only be passed positionally,
+        are left to the caller.
+        Services are created like in batches, so the wrapper does no lookups nor inspection per call.
+
+        Coroutine functions get an async wrapper, which can also create async services.
+        """
+        ctx = self._get_generation_context(service_descriptors_map, slot_indices)
+        ctx.hoisted_references = {}
+        is_async = inspect.iscoroutinefunction(func)
+        positions = get_keyword_positions(func)
+
+        kwargs_code = []
+        for kwarg, dep in self._inspector.get_dependencies(func).items():
+            if kwarg not in positions:
+                continue
+
+            if self._is_container_reference(dep):
+                kwargs_code.append((kwarg, "self", "self"))
+                continue
+
+            svc_desc = service_descriptors_map.get(dep)
+            if svc_desc is None or svc_desc.member_of is not None:
+                continue
+
+            if ctx.is_async(svc_desc) and not is_async:
+                raise AsyncServiceError(dep)
+
+            if svc_desc.is_transient:
+                code = self._gen_requested_transient_code(svc_desc, ctx)
+            else:
+                code = self._gen_instance_reference_code(
+                    svc_desc, ctx, inline_preloaded=True
+                )
+            kwargs_code.append((kwarg, code, self._gen_getter_call_code(svc_desc, ctx)))
+
+        await_code = "await " if is_async else ""
+        container_code = ""
+        self_code = ""
+        if self._ambient_scopes:
+            # Wrappers of the root container resolve services from the scope entered when they are called
+            container_code = """
+    root = self
+    ambient_scope = None if self._is_scope else self._ambient_scope"""
+            self_code = "\n        self = root if ambient_scope is None else ambient_scope.get(root)"
+
+        call_code = f"""
+        return {await_code}func(*args, **kwargs)"""
+        if kwargs_code:
+            # When the caller passed none of the services, they are all created like in batches,
+            # otherwise only the others are, through their getters
+            kwarg_names = tuple(kwarg for kwarg, _, _ in kwargs_code)
+            fast_path_condition = f"kwargs.keys().isdisjoint({kwarg_names!r})"
+            positional = [
+                position
+                for position in (positions[kwarg] for kwarg in kwarg_names)
+                if position is not None
+            ]
+            if positional:
+                fast_path_condition = (
+                    f"len(args) <= {min(positional)} and {fast_path_condition}"
+                )
+            hoisted_code = "".join(
+                f"\n            {name} = {code}"
+                for name, code in ctx.hoisted_references.values()
+            )
+            slow_path_code = ""
+            for kwarg, _, getter_code in kwargs_code:
+                condition = f'"{kwarg}" not in kwargs'
+                if positions[kwarg] is not None:
+                    condition += f" and len(args) <= {positions[kwarg]}"
+                slow_path_code += f"""
+        if {condition}:
+            kwargs["{kwarg}"] = {getter_code}"""
+            call_code = f"""
+        if {fast_path_condition}:{hoisted_code}
+            return {await_code}func(
+                *args,{"".join(f"{chr(10)}                {kwarg}={code}," for kwarg, code, _ in kwargs_code)}
+                **kwargs,
+            ){slow_path_code}{call_code}"""
+
+        return f"""
+{self._gen_imports_code(ctx)}
+import functools
+
+def wiring(self, func):{container_code}
+    @functools.wraps(func)
+    {"async " if is_async else ""}def wrapper(*args, **kwargs):{self_code}{call_code}
+
+    return wrapper
+"""
+
+    def compile_wiring(
+        self,
+        service_descriptors_map: Mapping[ServiceId_T, ServiceDescriptor[ServiceId_T]],
+        func: Callable[..., Any],
+        slot_indices: Optional[_SlotIndices] = None,
+    ) -> Callable[[Any, Callable[..., Any]], Callable[..., Any]]:
+        """
+        Generates and compiles the function that wraps `func` for a container, see `_gen_wiring_code`.
+        The function takes the container and `func` as arguments and returns the wrapper.
+        With slots, `slot_indices` must be the slots of the container class
+        """
+        source = self._gen_wiring_code(service_descriptors_map, func, slot_indices)
+        code = compile(source, "<meta_di wiring>", "exec")
 
         globs = {}
         exec(code, globs)  # pylint: disable=exec-used
-        return globs[class_name]
+        return globs["wiring"]
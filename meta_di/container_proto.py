@@ -1,15 +1,76 @@
-from typing import Any, Protocol, Type
+from typing import Any, Callable, Iterable, Protocol, Tuple, Type, TypeVar
 
 from meta_di.typing import T
 
+R = TypeVar("R")
+
 
 class ContainerProto(Protocol):
+    # Lets generated containers define their own `__slots__`
+    __slots__ = ()
+
     def get(self, service_id: Type[T]) -> T:
         """
         Returns an instance of the service identified by `service_id`.
         """
         ...
 
+    def get_all(self, service_id: Type[T]) -> Tuple[T, ...]:
+        """
+        Returns a tuple with an instance of each service registered with `multi=True` as `service_id`,
+        in registration order. The same collection is injected into `Sequence[service_id]` dependencies.
+        """
+        ...
+
+    def resolver(self, service_id: Type[T]) -> Callable[[], T]:
+        """
+        Returns a callable without arguments that resolves the service identified by `service_id`
+        from this container, skipping the lookup done by `get` on every call.
+        """
+        ...
+
+    def get_many(self, service_ids: Iterable[Any]) -> Tuple[Any, ...]:
+        """
+        Returns a tuple with an instance of each service in `service_ids`, in the same order.
+        All the services are created by a single generated function that loads shared
+        singleton and scoped instances only once.
+        Passing a tuple avoids a conversion on every call.
+        """
+        ...
+
+    def compile_batch(
+        self, service_ids: Iterable[Any]
+    ) -> Callable[[], Tuple[Any, ...]]:
+        """
+        Returns a callable without arguments that does the same as `get_many(service_ids)`
+        from this container, skipping the batch lookup.
+        """
+        ...
+
+    def wire(self, func: Callable[..., R]) -> Callable[..., R]:
+        """
+        Returns a wrapper of `func` that creates the services `func` depends on, as found by the inspector,
+        and passes them as keyword arguments along with the arguments given by the caller.
+        Parameters that are not registered services are left to the caller.
+        The wrapper is generated once per function and container class, so calls do no lookups.
+        Can be used as a decorator.
+        """
+        ...
+
+    async def aget(self, service_id: Type[T]) -> T:
+        """
+        Returns an instance of the service identified by `service_id`.
+        Unlike `get`, this also resolves services created by async providers.
+        """
+        ...
+
+    async def apreload(self) -> None:
+        """
+        Creates the singletons that must be created asynchronously.
+        Independent singletons are created concurrently.
+        """
+        ...
+
     def create_scope(self) -> "ContainerProto":
         """
         Creates and return a new scoped container instance.
@@ -22,14 +83,36 @@ class ContainerProto(Protocol):
         """
         ...
 
+    def close(self) -> None:
+        """
+        Disposes scoped instances, and singleton instances if this is not a scoped container,
+        in reverse creation order.
+        Instances are disposed with `close` or `__exit__`.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Same as `close`, but instances are disposed with `aclose` or `__aexit__` when available.
+        """
+        ...
+
     def __enter__(self) -> "ContainerProto":
         """Syntax sugar for `create_scope`"""
         ...
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+        """Closes the scoped container created by `__enter__`"""
+        ...
+
+    async def __aenter__(self) -> "ContainerProto":
         """Syntax sugar for `create_scope`"""
         ...
 
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+        """Closes the scoped container created by `__aenter__` with `aclose`"""
+        ...
+
     def __getitem__(self, service_id: Type[T]) -> T:
         """Syntax sugar for `get`"""
         ...
@@ -0,0 +1,79 @@
+import warnings
+from typing import Any, List, Optional, Sequence
+
+_SYNC_DISPOSE_METHODS = ("close", "__exit__")
+_ASYNC_DISPOSE_METHODS = ("aclose", "__aexit__")
+
+
+def is_disposable(obj: Any) -> bool:
+    """
+    Returns true if the given instance (or class) exposes a way to release its resources
+    """
+    return any(
+        hasattr(obj, method)
+        for method in (*_SYNC_DISPOSE_METHODS, *_ASYNC_DISPOSE_METHODS)
+    )
+
+
+def _dispose_sync(instance: Any) -> bool:
+    """
+    Disposes `instance` synchronously, returns false if it can only be disposed asynchronously
+    """
+    if hasattr(instance, "close"):
+        instance.close()
+    elif hasattr(instance, "__exit__"):
+        instance.__exit__(None, None, None)
+    else:
+        return False
+    return True
+
+
+def dispose(instances: Sequence[Any]) -> None:
+    """
+    Disposes instances in reverse creation order.
+    Every instance is disposed even if some fail, the first error is raised afterwards.
+    """
+    error: Optional[BaseException] = None
+    for instance in reversed(instances):
+        try:
+            if not _dispose_sync(instance):
+                warnings.warn(
+                    f"{instance!r} can only be disposed asynchronously, use aclose",
+                    RuntimeWarning,
+                    stacklevel=3,
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            error = error or exc
+
+    if error is not None:
+        raise error
+
+
+async def adispose(instances: Sequence[Any]) -> None:
+    """
+    Disposes instances in reverse creation order, awaiting async disposal methods.
+    Every instance is disposed even if some fail, the first error is raised afterwards.
+    """
+    error: Optional[BaseException] = None
+    for instance in reversed(instances):
+        try:
+            if hasattr(instance, "aclose"):
+                await instance.aclose()
+            elif hasattr(instance, "__aexit__"):
+                await instance.__aexit__(None, None, None)
+            else:
+                _dispose_sync(instance)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = error or exc
+
+    if error is not None:
+        raise error
+
+
+def pop_disposables(disposables: List[Any]) -> List[Any]:
+    """
+    Empties `disposables` in place and returns its previous content
+    """
+    popped = disposables[:]
+    disposables.clear()
+    return popped
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Sequence
 
 
 class MetaDIException(Exception):
@@ -21,3 +21,47 @@ class CannotReferenceError(MetaDIException):
     def __init__(self, service_or_provider: Any):
         self.message = f"Cannot create code reference for {service_or_provider}"
         super().__init__(self.message)
+
+
+class AsyncServiceError(MetaDIException):
+    def __init__(self, service: Any):
+        self.message = (
+            f"Service {service} must be created asynchronously, use aget to resolve it"
+        )
+        super().__init__(self.message)
+
+
+class CircularDependencyError(MetaDIException):
+    def __init__(self, path: Sequence[Any]):
+        self.path = list(path)
+        self.message = "Circular dependency detected: " + " -> ".join(
+            str(service) for service in self.path
+        )
+        super().__init__(self.message)
+
+
+class ServiceConflictError(MetaDIException):
+    def __init__(self, service: Any, reason: str):
+        self.message = f"Cannot register {service}: {reason}"
+        super().__init__(self.message)
+
+
+class InvalidBuilderTarget(MetaDIException):
+    def __init__(self, target: str, reason: str):
+        self.message = f"Invalid builder target {target!r}: {reason}"
+        super().__init__(self.message)
+
+
+class ModuleCompositionError(MetaDIException):
+    def __init__(self, reason: str):
+        self.message = f"Cannot compose modules: {reason}"
+        super().__init__(self.message)
+
+
+class ScopeContextError(MetaDIException):
+    def __init__(self) -> None:
+        self.message = (
+            "No scope entered with `with container:` in the current context. Scopes must be exited "
+            "in the thread or asyncio task that entered them, use create_scope() and close() otherwise"
+        )
+        super().__init__(self.message)
@@ -0,0 +1,43 @@
+import os
+import weakref
+from typing import Any, Dict, Iterable, List
+
+# Root containers with singletons that must be created again in forked child processes
+_containers: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def _reinit_in_child() -> None:
+    for container in list(_containers):
+        container._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_in_child)
+
+
+def reinit_after_fork(container: Any) -> None:
+    """
+    Calls `container._reinit_after_fork()` in every child process forked after this call,
+    for as long as the container exists. Does nothing where processes cannot be forked
+    """
+    _containers.add(container)
+
+
+def drop_instances(
+    instances: Dict[Any, Any], disposables: List[Any], service_ids: Iterable[Any]
+) -> None:
+    """
+    Drops the instances of `service_ids`, so their getters create them again on next use.
+
+    The instances are not disposed, since their resources may still be used by the parent process,
+    they are only removed from `disposables`
+    """
+    dropped = {
+        id(instances.pop(service_id))
+        for service_id in service_ids
+        if service_id in instances
+    }
+    if dropped:
+        disposables[:] = [
+            disposable for disposable in disposables if id(disposable) not in dropped
+        ]
@@ -1,9 +1,15 @@
 import inspect
-from typing import Any, Dict, Protocol
+import typing
+import weakref
+from typing import Any, Callable, Dict, NamedTuple, Protocol, TypeVar
 
 from meta_di.exceptions import CannotReferenceError
+from meta_di.lazy import Lazy, is_lazy_hint
+from meta_di.multi import is_collection_hint, normalize_collection_hint
 from meta_di.typing import Provider_T, ServiceId_T
 
+R = TypeVar("R")
+
 
 class InspectorProto(Protocol[ServiceId_T]):
     """
@@ -53,13 +59,17 @@ class InspectorProto(Protocol[ServiceId_T]):
 
 class BaseInspector(InspectorProto[ServiceId_T]):
     def requires_import(self, obj: Any) -> bool:
-        if isinstance(obj, type):
+        if isinstance(obj, type) or is_collection_hint(obj) or is_lazy_hint(obj):
             return True
         return False
 
     def get_reference(self, obj: Any) -> str:
         if isinstance(obj, str):
             return f'"{obj}"'
+        if is_collection_hint(obj):
+            return f"typing.Sequence[{self.get_reference(typing.get_args(obj)[0])}]"
+        if is_lazy_hint(obj):
+            return f"{self.get_full_name(Lazy)}[{self.get_reference(typing.get_args(obj)[0])}]"
         return self.get_full_name(obj)
 
     def get_module_name(self, obj: Any) -> str:
@@ -80,15 +90,18 @@ class BaseInspector(InspectorProto[ServiceId_T]):
 class TypeHintInspector(BaseInspector[type]):
     """
     DependencyResolver that uses the types extracted from type hints as ServiceId_T
+
+    `Sequence[T]` hints depend on the collection of the services registered with `multi=True` as T,
+    `Lazy[T]` hints depend on a handle that resolves T on first use
     """
 
     def get_dependencies(self, provider: Provider_T) -> Dict[str, type]:
         return {
-            arg_name: arg_type
+            arg_name: normalize_collection_hint(arg_type)
             for arg_name, arg_type in inspect.getfullargspec(
                 provider
             ).annotations.items()
-            if arg_name != "self" and arg_type
+            if arg_name not in ("self", "return") and arg_type
         }
 
 
@@ -105,3 +118,84 @@ class ArgNameInspector(BaseInspector[str]):
             and arg.kind
             not in (inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
         }
+
+
+class InspectorCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
+class CachingInspector(InspectorProto[ServiceId_T]):
+    """
+    Wraps any InspectorProto and caches its results per inspected object,
+    so each provider or service id is only inspected once, no matter how many builders use it.
+
+    Objects are referenced weakly, their cached results are dropped along with them.
+    Objects that cannot be weakly referenced, like str service ids, are not cached.
+    """
+
+    def __init__(self, inspector: InspectorProto[ServiceId_T]) -> None:
+        self.inspector = inspector
+        self._caches: Dict[str, "weakref.WeakKeyDictionary[Any, Any]"] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _get_cached(self, method_name: str, method: Callable[[Any], R], obj: Any) -> R:
+        cache = self._caches.setdefault(method_name, weakref.WeakKeyDictionary())
+        try:
+            result = cache[obj]
+        except KeyError:
+            pass
+        except TypeError:
+            return method(obj)
+        else:
+            self._hits += 1
+            return result
+
+        self._misses += 1
+        result = method(obj)
+        cache[obj] = result
+        return result
+
+    def requires_import(self, obj: Any) -> bool:
+        return self._get_cached("requires_import", self.inspector.requires_import, obj)
+
+    def get_reference(self, obj: Any) -> str:
+        return self._get_cached("get_reference", self.inspector.get_reference, obj)
+
+    def get_module_name(self, obj: Any) -> str:
+        return self._get_cached("get_module_name", self.inspector.get_module_name, obj)
+
+    def get_full_name(self, obj: Any) -> str:
+        return self._get_cached("get_full_name", self.inspector.get_full_name, obj)
+
+    def get_dependencies(self, provider: Provider_T) -> Dict[str, ServiceId_T]:
+        # Callers own the returned dict, so the cached one is never shared
+        return dict(
+            self._get_cached(
+                "get_dependencies", self.inspector.get_dependencies, provider
+            )
+        )
+
+    def cache_info(self) -> InspectorCacheInfo:
+        """
+        Returns the number of cache hits and misses, and the number of cached results
+        """
+        return InspectorCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            currsize=sum(len(cache) for cache in self._caches.values()),
+        )
+
+    def cache_clear(self) -> None:
+        """
+        Drops every cached result and resets the counters
+        """
+        self._caches.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+# Shared by every builder using the default inspector, so providers are only inspected once per process
+DEFAULT_INSPECTOR: CachingInspector[type] = CachingInspector(TypeHintInspector())
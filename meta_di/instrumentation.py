@@ -0,0 +1,57 @@
+import collections
+import time
+from typing import Any, DefaultDict, Dict, List, NamedTuple
+
+# Stats are kept per service as a mutable [resolves, creations, construction_ns] list,
+# so the generated code can update them in place
+StatsEntry = List[int]
+
+
+class ServiceStats(NamedTuple):
+    # Times an instance of the service was requested, by `get` or by a service that depends on it
+    resolves: int
+    # Instances created
+    creations: int
+    # Total time spent creating instances, including the creation of their dependencies
+    construction_ns: int
+
+    @property
+    def mean_construction_ns(self) -> float:
+        return self.construction_ns / self.creations if self.creations else 0.0
+
+
+def _new_stats_entry() -> StatsEntry:
+    return [0, 0, 0]
+
+
+def new_stats() -> DefaultDict[Any, StatsEntry]:
+    """
+    Returns an empty stats table, entries are added on first use
+    """
+    return collections.defaultdict(_new_stats_entry)
+
+
+def record_creation(entry: StatsEntry, start_ns: int, instance: Any) -> Any:
+    """
+    Records the creation of `instance`, started at `start_ns`, and returns it
+    """
+    entry[1] += 1
+    entry[2] += time.perf_counter_ns() - start_ns
+    return instance
+
+
+def record_transient(entry: StatsEntry, start_ns: int, instance: Any) -> Any:
+    """
+    Records the resolution and creation of a transient `instance`, started at `start_ns`, and returns it
+    """
+    entry[0] += 1
+    entry[1] += 1
+    entry[2] += time.perf_counter_ns() - start_ns
+    return instance
+
+
+def get_stats(stats: Dict[Any, StatsEntry]) -> Dict[Any, ServiceStats]:
+    """
+    Returns a snapshot of a stats table
+    """
+    return {service_id: ServiceStats(*entry) for service_id, entry in stats.items()}
@@ -0,0 +1,32 @@
+import typing
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+_UNRESOLVED: Any = object()
+
+
+class Lazy(Generic[T]):
+    """
+    Handle injected into `Lazy[T]` dependencies instead of an instance of T.
+    T is resolved through the container the first time `get` is called, later calls return the same instance
+    """
+
+    __slots__ = ("_resolve", "_instance")
+
+    def __init__(self, resolve: Callable[[], T]) -> None:
+        self._resolve = resolve
+        self._instance: Any = _UNRESOLVED
+
+    def get(self) -> T:
+        if self._instance is _UNRESOLVED:
+            self._instance = self._resolve()
+        return self._instance
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._instance is not _UNRESOLVED
+
+
+def is_lazy_hint(hint: Any) -> bool:
+    return typing.get_origin(hint) is Lazy
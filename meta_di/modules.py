@@ -0,0 +1,239 @@
+import contextvars
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from meta_di.container_proto import ContainerProto
+from meta_di.exceptions import (
+    CircularDependencyError,
+    MissingServiceError,
+    ModuleCompositionError,
+)
+from meta_di.multi import get_collection_id
+from meta_di.scopes import exit_scope
+from meta_di.wiring import create_wiring
+
+
+def imported_service() -> Any:
+    """
+    Provider of the services imported by a module. Imported services are resolved by the module
+    that exports them, so it is only called when the module is used outside of a CompositeContainer
+    """
+    raise ModuleCompositionError(
+        "imported services are created by the module exporting them, "
+        "resolve them through a CompositeContainer"
+    )
+
+
+@dataclass(frozen=True)
+class ContainerModule:
+    """
+    Container class compiled from the services of one slice of the graph, see `ContainerBuilder.build_module`.
+    Its `imports` are resolved by the modules that export them once composed by a CompositeContainer
+    """
+
+    name: str
+    container_class: Type[ContainerProto]
+    imports: Tuple[Any, ...]
+    exports: Tuple[Any, ...]
+
+
+def _sort_modules(modules: Sequence[ContainerModule]) -> List[ContainerModule]:
+    """
+    Returns `modules` sorted so that every module comes after the modules it imports services from.
+
+    Raises ModuleCompositionError if modules have the same name, a service is exported by several modules
+    or imported but not exported,
+    and CircularDependencyError, with the names of the modules, if modules import from each other
+    """
+    exporters: Dict[Any, ContainerModule] = {}
+    names: Set[str] = set()
+    for module in modules:
+        if module.name in names:
+            raise ModuleCompositionError(f"several modules are named {module.name}")
+        names.add(module.name)
+        for service_id in module.exports:
+            if service_id in exporters:
+                raise ModuleCompositionError(
+                    f"{service_id} is exported by {exporters[service_id].name} and {module.name}"
+                )
+            exporters[service_id] = module
+
+    sorted_modules: List[ContainerModule] = []
+    done: Set[str] = set()
+    for root_module in modules:
+        path: List[ContainerModule] = []
+        stack = [(root_module, False)]
+        while stack:
+            module, expanded = stack.pop()
+            if expanded:
+                path.pop()
+                if module.name not in done:
+                    done.add(module.name)
+                    sorted_modules.append(module)
+                continue
+
+            if module.name in done:
+                continue
+            if module in path:
+                cycle = path[path.index(module) :] + [module]
+                raise CircularDependencyError([module.name for module in cycle])
+
+            path.append(module)
+            stack.append((module, True))
+            for service_id in module.imports:
+                if service_id not in exporters:
+                    raise ModuleCompositionError(
+                        f"{service_id} is imported by {module.name} but no module exports it"
+                    )
+                stack.append((exporters[service_id], False))
+
+    return sorted_modules
+
+
+class CompositeContainer(ContainerProto):
+    """
+    Container composed of modules compiled separately, so a change in one module only requires building
+    that module again. Modules are instantiated after the modules they import services from, and the getters
+    of their imported services are linked to the exporting containers, without generating any code.
+
+    Only exported services can be resolved. Scopes create a scope of every module, linked to each other
+    """
+
+    _entered_scope: "contextvars.ContextVar[CompositeContainer]" = (
+        contextvars.ContextVar("CompositeContainer._entered_scope")
+    )
+
+    def __init__(self, modules: Sequence[ContainerModule]) -> None:
+        sorted_modules = _sort_modules(modules)
+        self._is_scope = False
+        # Token of the scope entered with `with`, reset when it is exited, see `meta_di.scopes.exit_scope`
+        self._exit_token: "Optional[contextvars.Token[CompositeContainer]]" = None
+        self._export_indices: Dict[Any, int] = {
+            service_id: index
+            for index, module in enumerate(sorted_modules)
+            for service_id in module.exports
+        }
+        # For each module, the services it imports along with the index of the module exporting them
+        self._links: Tuple[Tuple[Tuple[Any, int], ...], ...] = tuple(
+            tuple(
+                (service_id, self._export_indices[service_id])
+                for service_id in module.imports
+            )
+            for module in sorted_modules
+        )
+        # Parameters of wired functions that request a container are given the composite container
+        self._container_service_ids: FrozenSet[Any] = frozenset(
+            service_id
+            for module in sorted_modules
+            for service_id in getattr(
+                module.container_class, "_container_service_ids", ()
+            )
+        )
+        self._wirings: Dict[Callable[..., Any], Any] = {}
+        self._containers: List[ContainerProto] = []
+        for module, links in zip(sorted_modules, self._links):
+            if links:
+                container = module.container_class(imports=self._link(links))  # type: ignore
+            else:
+                container = module.container_class()
+            self._containers.append(container)
+
+    def _link(self, links: Sequence[Tuple[Any, int]]) -> Dict[Any, Callable[[], Any]]:
+        return {
+            service_id: self._containers[index].resolver(service_id)
+            for service_id, index in links
+        }
+
+    def _get_container(self, service_id: Any) -> ContainerProto:
+        try:
+            return self._containers[self._export_indices[service_id]]
+        except KeyError:
+            raise MissingServiceError(service_id) from None
+
+    def get(self, service_id: Any) -> Any:
+        return self._get_container(service_id).get(service_id)
+
+    __getitem__ = get
+
+    def get_all(self, service_id: Any) -> Tuple[Any, ...]:
+        try:
+            container = self._get_container(get_collection_id(service_id))
+        except MissingServiceError:
+            raise MissingServiceError(service_id) from None
+        return container.get_all(service_id)
+
+    def resolver(self, service_id: Any) -> Callable[[], Any]:
+        return self._get_container(service_id).resolver(service_id)
+
+    async def aget(self, service_id: Any) -> Any:
+        return await self._get_container(service_id).aget(service_id)
+
+    def get_many(self, service_ids: Any) -> Tuple[Any, ...]:
+        return tuple(self.get(service_id) for service_id in service_ids)
+
+    def compile_batch(self, service_ids: Any) -> Callable[[], Tuple[Any, ...]]:
+        resolvers = tuple(self.resolver(service_id) for service_id in service_ids)
+        return lambda: tuple(resolve() for resolve in resolvers)
+
+    def wire(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        wiring = self._wirings.get(func)
+        if wiring is None:
+            wiring = create_wiring(
+                self._export_indices.keys(), func, self._container_service_ids
+            )
+            self._wirings[func] = wiring
+        return wiring(self, func)
+
+    async def apreload(self) -> None:
+        for container in self._containers:
+            await container.apreload()
+
+    def create_scope(self) -> "CompositeContainer":
+        scope = object.__new__(self.__class__)
+        scope._is_scope = True
+        scope._exit_token = None
+        scope._export_indices = self._export_indices
+        scope._links = self._links
+        scope._container_service_ids = self._container_service_ids
+        scope._wirings = self._wirings
+        scope._containers = []
+        for container, links in zip(self._containers, self._links):
+            module_scope = container.create_scope()
+            if links:
+                module_scope._imports = scope._link(links)  # type: ignore
+            scope._containers.append(module_scope)
+        return scope
+
+    def close(self) -> None:
+        # Modules are closed before the modules they import services from
+        for container in reversed(self._containers):
+            container.close()
+
+    async def aclose(self) -> None:
+        for container in reversed(self._containers):
+            await container.aclose()
+
+    def __enter__(self) -> "CompositeContainer":
+        scope = self.create_scope()
+        scope._exit_token = self._entered_scope.set(scope)
+        return scope
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        exit_scope(self._entered_scope).close()
+
+    async def __aenter__(self) -> "CompositeContainer":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await exit_scope(self._entered_scope).aclose()
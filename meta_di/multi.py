@@ -0,0 +1,36 @@
+import collections.abc
+import typing
+from typing import Any, Sequence
+
+
+def get_collection_id(service_id: Any) -> Any:
+    """
+    Returns the service id of the collection of the services registered with `multi=True` as `service_id`:
+    `Sequence[service_id]` for types, so it can be injected with type hints, or `service_id` itself
+    for other ids, e.g. str ids injected by argument name
+    """
+    if isinstance(service_id, str):
+        return service_id
+    return Sequence[service_id]
+
+
+def get_member_id(service_id: Any, index: int) -> str:
+    """
+    Returns the service id of the `index`th service registered with `multi=True` as `service_id`
+    """
+    if isinstance(service_id, str):
+        return f"{service_id}[{index}]"
+    return f"{service_id.__module__}.{service_id.__qualname__}[{index}]"
+
+
+def is_collection_hint(hint: Any) -> bool:
+    return typing.get_origin(hint) is collections.abc.Sequence
+
+
+def normalize_collection_hint(hint: Any) -> Any:
+    """
+    Returns `typing.Sequence[T]` for `collections.abc.Sequence[T]`, so both can be used to inject collections
+    """
+    if is_collection_hint(hint):
+        return Sequence[typing.get_args(hint)[0]]
+    return hint
@@ -0,0 +1,73 @@
+import contextlib
+import inspect
+import weakref
+from typing import Any, Callable, Iterator, Mapping, Sequence, Set
+
+_MISSING: Any = object()
+
+
+def get_dependent_ids(
+    dependents: Mapping[Any, Sequence[Any]], service_id: Any
+) -> Set[Any]:
+    """
+    Returns the ids of the services that depend on `service_id`, either directly or through other services
+    """
+    dependent_ids: Set[Any] = set()
+    stack = [service_id]
+    while stack:
+        for dependent in dependents.get(stack.pop(), ()):
+            if dependent not in dependent_ids:
+                dependent_ids.add(dependent)
+                stack.append(dependent)
+    return dependent_ids
+
+
+def create_override(instance_or_provider: Any) -> Callable[[Any], Any]:
+    """
+    Returns the function called by getters, with the container, instead of creating an overridden service.
+    Getters cache what it returns like the instances of the service, so it is only called again for transients.
+    Classes and functions are providers, called with their dependencies injected by `container.wire`,
+    wired once per container. Anything else is an instance, returned as is
+    """
+    if inspect.isclass(instance_or_provider) or inspect.isroutine(instance_or_provider):
+        provider = instance_or_provider
+        wirings: "weakref.WeakKeyDictionary[Any, Callable[[], Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        def create(container: Any) -> Any:
+            wiring = wirings.get(container)
+            if wiring is None:
+                wiring = wirings[container] = container.wire(provider)
+            return wiring()
+
+        return create
+
+    instance = instance_or_provider
+    return lambda container: instance
+
+
+@contextlib.contextmanager
+def override(
+    container: Any, service_id: Any, instance_or_provider: Any
+) -> Iterator[None]:
+    """
+    Overrides `service_id` in `container`, its scoped containers and the containers it was created from,
+    until the context is exited, then restores the previous override, if any.
+
+    Cached instances of `service_id` and of the services depending on it are dropped when the context is entered
+    and exited, in the root container and in all its live scoped containers,
+    so they are created again with the override and then without it
+    """
+    overrides = container._overrides
+    previous = overrides.get(service_id, _MISSING)
+    overrides[service_id] = create_override(instance_or_provider)
+    container._drop_overridden(service_id)
+    try:
+        yield
+    finally:
+        if previous is _MISSING:
+            del overrides[service_id]
+        else:
+            overrides[service_id] = previous
+        container._drop_overridden(service_id)
@@ -0,0 +1,127 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from meta_di.disposal import dispose, is_disposable
+
+
+class PoolStats(NamedTuple):
+    # Idle instances kept in the pool
+    size: int
+    max_size: int
+    # Instances checked out by scopes
+    in_use: int
+    # Most instances checked out at once
+    high_water_mark: int
+    # Checkouts served by an idle instance
+    hits: int
+    # Checkouts that had to create a new instance
+    misses: int
+    # Returned instances dropped because the pool was full or their reset failed
+    discarded: int
+
+
+class ServicePool:
+    """
+    Bounded free list of the instances of a pooled service, shared by every scope of a container.
+
+    Scopes check an instance out on first use and return it when they are closed,
+    after calling the `reset` hook of the service if there is one.
+    Instances returned to a full pool, or whose reset failed, are disposed and dropped.
+    """
+
+    def __init__(
+        self, max_size: int, reset: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        self.max_size = max_size
+        self.reset = reset
+        self._free: List[Any] = []
+        self._in_use = 0
+        self._high_water_mark = 0
+        self._hits = 0
+        self._misses = 0
+        self._discarded = 0
+
+    def acquire(self) -> Any:
+        """
+        Takes an idle instance, returns None when the pool is empty and a new instance must be created
+        """
+        try:
+            instance = self._free.pop()
+        except IndexError:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return instance
+
+    def lease(self, instance: Any) -> "PoolLease":
+        """
+        Checks out `instance`, returns the disposable that gives it back to the pool
+        """
+        self._in_use += 1
+        if self._in_use > self._high_water_mark:
+            self._high_water_mark = self._in_use
+        return PoolLease(self, instance)
+
+    def release(self, instance: Any) -> None:
+        """
+        Gives a checked out `instance` back to the pool
+        """
+        self._in_use -= 1
+        if len(self._free) >= self.max_size:
+            self._discard(instance)
+            return
+
+        if self.reset is not None:
+            try:
+                self.reset(instance)
+            except BaseException:
+                self._discard(instance)
+                raise
+
+        self._free.append(instance)
+
+    def _discard(self, instance: Any) -> None:
+        self._discarded += 1
+        if is_disposable(instance):
+            dispose([instance])
+
+    def close(self) -> None:
+        """
+        Disposes and drops every idle instance
+        """
+        free = self._free
+        self._free = []
+        dispose([instance for instance in free if is_disposable(instance)])
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=len(self._free),
+            max_size=self.max_size,
+            in_use=self._in_use,
+            high_water_mark=self._high_water_mark,
+            hits=self._hits,
+            misses=self._misses,
+            discarded=self._discarded,
+        )
+
+
+class PoolLease:
+    """
+    Disposable tracked by a scope for each pooled instance it checked out,
+    disposing it gives the instance back to its pool
+    """
+
+    __slots__ = ("pool", "instance")
+
+    def __init__(self, pool: ServicePool, instance: Any) -> None:
+        self.pool = pool
+        self.instance = instance
+
+    def close(self) -> None:
+        self.pool.release(self.instance)
+
+
+def get_pool_stats(pools: Dict[Any, ServicePool]) -> Dict[Any, PoolStats]:
+    """
+    Returns a snapshot of the stats of every pool, by service id
+    """
+    return {service_id: pool.stats() for service_id, pool in pools.items()}
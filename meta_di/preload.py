@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence
+
+
+def preload_in_threads(
+    layers: Sequence[Sequence[Callable[[], Any]]], max_workers: int
+) -> None:
+    """
+    Calls the singleton getters of each layer concurrently in a thread pool.
+
+    A layer only starts once every getter of the previous layer returned,
+    so getters never race to create a shared dependency.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for layer in layers:
+            if len(layer) == 1:
+                layer[0]()
+                continue
+
+            futures = [executor.submit(getter) for getter in layer]
+            for future in futures:
+                future.result()
@@ -0,0 +1,24 @@
+import contextvars
+from typing import Any
+
+from meta_di.exceptions import ScopeContextError
+
+
+def exit_scope(entered_scope: "contextvars.ContextVar[Any]") -> Any:
+    """
+    Returns the scope entered by `with container:` in the current context and restores the scope entered before it.
+
+    The entered scope is tracked by a ContextVar, so concurrent threads and asyncio tasks can enter scopes
+    of the same container. Raises ScopeContextError when no scope was entered in the current context,
+    e.g. when `__exit__` runs in another thread than `__enter__`
+    """
+    scope = entered_scope.get(None)
+    if scope is None or getattr(scope, "_exit_token", None) is None:
+        raise ScopeContextError()
+    try:
+        entered_scope.reset(scope._exit_token)
+    except ValueError:
+        # The token was created in another context
+        raise ScopeContextError() from None
+    scope._exit_token = None
+    return scope
@@ -1,6 +1,6 @@
 import enum
 from dataclasses import dataclass
-from typing import Dict, Generic
+from typing import Any, Callable, Dict, Generic, Optional
 
 from meta_di.typing import Provider_T, ServiceId_T
 
@@ -9,6 +9,14 @@ class ServiceLifecycle(enum.Enum):
     TRANSIENT = enum.auto()
     SCOPED = enum.auto()
     SINGLETON = enum.auto()
+    POOLED = enum.auto()
+
+
+class ForkPolicy(enum.Enum):
+    # Forked child processes keep using the instance created by the parent, e.g. read-only data
+    SHARE = enum.auto()
+    # Forked child processes create their own instance on first use, e.g. for instances holding sockets
+    REINIT = enum.auto()
 
 
 @dataclass
@@ -21,6 +29,23 @@ class ServiceDescriptor(Generic[ServiceId_T]):
     provider: Provider_T
     dependency_kwargs: Dict[str, ServiceId_T]
     lifecycle: ServiceLifecycle
+    preload: bool = False
+    # Maximum number of idle instances kept by the pool of a pooled service
+    pool_size: int = 0
+    # Called with each pooled instance before it goes back to the pool
+    reset: Optional[Callable[[Any], Any]] = None
+    # What forked child processes do with the instance of a singleton created by the parent
+    fork_policy: ForkPolicy = ForkPolicy.SHARE
+    # For the collection of the services registered with `multi=True`, the service id they were registered as.
+    # Its dependencies are its members, in registration order
+    collection_of: Optional[Any] = None
+    # For the services registered with `multi=True`, the service id they were registered as.
+    # Members are only resolved through their collection
+    member_of: Optional[Any] = None
+    # For the `Lazy[T]` handles injected into lazy dependencies, T. They are created without resolving T
+    lazy_of: Optional[Any] = None
+    # Provided by another module of a composite container, which links it when the container is created
+    imported: bool = False
 
     @property
     def is_transient(self) -> bool:
@@ -33,3 +58,15 @@ class ServiceDescriptor(Generic[ServiceId_T]):
     @property
     def is_singleton(self) -> bool:
         return self.lifecycle == ServiceLifecycle.SINGLETON
+
+    @property
+    def is_pooled(self) -> bool:
+        return self.lifecycle == ServiceLifecycle.POOLED
+
+    @property
+    def is_collection(self) -> bool:
+        return self.collection_of is not None
+
+    @property
+    def is_lazy(self) -> bool:
+        return self.lazy_of is not None
@@ -0,0 +1,32 @@
+from typing import Any, Iterable, List, Mapping
+
+
+class _EmptySlot:
+    def __repr__(self) -> str:
+        return "EMPTY"
+
+
+# Value of the slots of instances that were not created yet, in containers generated with `slots=True`
+EMPTY: Any = _EmptySlot()
+
+
+def drop_slots(
+    slots: List[Any],
+    disposables: List[Any],
+    slot_indices: Mapping[Any, int],
+    service_ids: Iterable[Any],
+) -> None:
+    """
+    Like `meta_di.forking.drop_instances`, for instances stored in the slots of a container generated with
+    `slots=True`: `slot_indices` maps the service ids to their slot
+    """
+    dropped = set()
+    for service_id in service_ids:
+        index = slot_indices.get(service_id)
+        if index is not None and slots[index] is not EMPTY:
+            dropped.add(id(slots[index]))
+            slots[index] = EMPTY
+    if dropped:
+        disposables[:] = [
+            disposable for disposable in disposables if id(disposable) not in dropped
+        ]
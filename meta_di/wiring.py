@@ -0,0 +1,79 @@
+import functools
+import inspect
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+
+def get_keyword_positions(func: Callable[..., Any]) -> Dict[str, Optional[int]]:
+    """
+    Returns the parameters of `func` that can be passed as keyword arguments, along with their position,
+    so a parameter is given by the caller when more positional arguments are passed.
+    Keyword-only parameters have no position
+    """
+    positions: Dict[str, Optional[int]] = {}
+    for position, (name, parameter) in enumerate(
+        inspect.signature(func).parameters.items()
+    ):
+        if parameter.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD:
+            positions[name] = position
+        elif parameter.kind is inspect.Parameter.KEYWORD_ONLY:
+            positions[name] = None
+    return positions
+
+
+def create_wiring(
+    service_ids: Collection[Any],
+    func: Callable[..., Any],
+    container_service_ids: Collection[Any] = (),
+) -> Callable[[Any, Callable[..., Any]], Callable[..., Any]]:
+    """
+    Creates a function that wraps `func` for a container, the wrapper resolves the parameters
+    of `func` that are services with `container.get` and passes them as keyword arguments,
+    unless the caller passed them. Parameters are matched with `container_service_ids`,
+    which are given the container itself, and `service_ids` by annotation first, then by name.
+    Parameters that are not services, or can only be passed positionally, are left to the caller.
+
+    Used by container classes that were not created by a CodeGenerator, e.g. ahead-of-time compiled
+    modules, which cannot generate wrappers.
+    """
+    parameters = inspect.signature(func).parameters
+    # Position, service id and whether the container itself is injected, by parameter name
+    injected: Dict[str, Tuple[Optional[int], Any, bool]] = {}
+    for name, position in get_keyword_positions(func).items():
+        for service_id in (parameters[name].annotation, name):
+            try:
+                if service_id in container_service_ids:
+                    injected[name] = (position, service_id, True)
+                    break
+                if service_id in service_ids:
+                    injected[name] = (position, service_id, False)
+                    break
+            except TypeError:
+                continue
+
+    injected_items = tuple(
+        (name, *injected_values) for name, injected_values in injected.items()
+    )
+
+    def wiring(container: Any, func: Callable[..., Any]) -> Callable[..., Any]:
+        get = container.get
+        resolvers = tuple(
+            (
+                name,
+                position,
+                (lambda: container)
+                if is_container
+                else functools.partial(get, service_id),
+            )
+            for name, position, service_id, is_container in injected_items
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for name, position, resolve in resolvers:
+                if name not in kwargs and (position is None or position >= len(args)):
+                    kwargs[name] = resolve()
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return wiring
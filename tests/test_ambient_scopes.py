@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+async def create_async_service() -> object:
+    return object()
+
+
+@pytest.fixture
+def container():
+    return (
+        ContainerBuilder(ambient_scopes=True)
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+        .add_transient(ITransientService, TransientService)
+        .build()
+    )
+
+
+def test_ambient_scopes__root_container_resolves_from_the_entered_scope(container):
+    with container as scoped_container:
+        scoped = container.get(IScopedService)
+
+        assert scoped is scoped_container.get(IScopedService)
+        assert container.get(ITransientService).scoped is scoped
+        assert container[IScopedService] is scoped
+
+    with container as scoped_container:
+        assert container.get(IScopedService) is not scoped
+        assert container.get(IScopedService) is scoped_container.get(IScopedService)
+
+
+def test_ambient_scopes__nested_scopes_are_restored_on_exit(container):
+    with container as outer_scope:
+        with container as inner_scope:
+            assert container.get(IScopedService) is inner_scope.get(IScopedService)
+
+        assert container.get(IScopedService) is outer_scope.get(IScopedService)
+
+
+def test_ambient_scopes__without_entered_scope__then_root_container_resolves(
+    container,
+):
+    scoped = container.get(IScopedService)
+
+    assert container.get(IScopedService) is scoped
+
+    with container:
+        assert container.get(IScopedService) is not scoped
+
+    assert container.get(IScopedService) is scoped
+
+
+def test_ambient_scopes__explicit_scopes_resolve_from_themselves(container):
+    explicit_scope = container.create_scope()
+
+    with container as scoped_container:
+        assert explicit_scope.get(IScopedService) is not scoped_container.get(
+            IScopedService
+        )
+
+
+def test_ambient_scopes__containers_of_the_same_class_have_their_own_scopes(
+    container,
+):
+    other_container = container.__class__()
+
+    with container:
+        assert other_container.get(ISingletonService) is not container.get(
+            ISingletonService
+        )
+        assert other_container.get(IScopedService) is not container.get(IScopedService)
+
+
+def test_ambient_scopes__each_asyncio_task_sees_its_own_scope(container):
+    async def handle_request():
+        async with container as scoped_container:
+            scoped = container.get(IScopedService)
+            await asyncio.sleep(0)
+            assert container.get(IScopedService) is scoped
+            assert scoped_container.get(IScopedService) is scoped
+            return scoped
+
+    async def main():
+        return await asyncio.gather(*(handle_request() for _ in range(3)))
+
+    scoped_services = asyncio.run(main())
+
+    assert len({id(scoped) for scoped in scoped_services}) == 3
+
+
+def test_ambient_scopes__aget_resolves_async_services_from_the_entered_scope():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector(), ambient_scopes=True)
+        .add_scoped("service", create_async_service)
+        .build()
+    )
+
+    async def main():
+        async with container as scoped_container:
+            service = await container.aget("service")
+            assert service is await scoped_container.aget("service")
+
+    asyncio.run(main())
+
+
+def test_ambient_scopes__resolvers_and_batches_resolve_from_the_scope_entered_when_called(
+    container,
+):
+    resolve = container.resolver(IScopedService)
+    batch = container.compile_batch((IScopedService, ITransientService))
+
+    with container as scoped_container:
+        scoped = scoped_container.get(IScopedService)
+
+        assert resolve() is scoped
+        assert batch()[0] is scoped
+        assert container.get_many((IScopedService,)) == (scoped,)
+
+
+def test_ambient_scopes__wired_functions_resolve_from_the_scope_entered_when_called(
+    container,
+):
+    @container.wire
+    def handler(scoped: IScopedService):
+        return scoped
+
+    with container as scoped_container:
+        assert handler() is scoped_container.get(IScopedService)
+
+    with container as scoped_container:
+        assert handler() is scoped_container.get(IScopedService)
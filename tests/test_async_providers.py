@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+
+from meta_di import ContainerBuilder, MetaDIException
+
+
+class Config:
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+
+class Cache:
+    pass
+
+
+class Repository:
+    def __init__(self, pool: ConnectionPool, cache: Cache, config: Config) -> None:
+        self.pool = pool
+        self.cache = cache
+        self.config = config
+
+
+async def create_pool(config: Config) -> ConnectionPool:
+    await asyncio.sleep(0.1)
+    return ConnectionPool(config)
+
+
+async def create_cache() -> Cache:
+    await asyncio.sleep(0.1)
+    return Cache()
+
+
+def _get_builder():
+    return (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_singleton(ConnectionPool, create_pool)
+        .add_singleton(Cache, create_cache)
+        .add_transient(Repository)
+    )
+
+
+def test_aget__resolves_async_providers_and_their_dependents():
+    async def main():
+        container = await _get_builder().abuild()
+
+        repository1 = await container.aget(Repository)
+        repository2 = await container.aget(Repository)
+
+        assert repository1 is not repository2
+        assert repository1.pool is repository2.pool
+        assert repository1.pool is await container.aget(ConnectionPool)
+        assert repository1.config is container.get(Config)
+
+    asyncio.run(main())
+
+
+def test_apreload__creates_independent_async_singletons_concurrently():
+    async def main():
+        container = _get_builder().build()
+
+        start = time.perf_counter()
+        await container.apreload()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.18
+        assert isinstance(await container.aget(Cache), Cache)
+
+    asyncio.run(main())
+
+
+def test_aget__when_async_singletons_are_not_preloaded__then_they_are_created_on_first_use():
+    async def main():
+        container = _get_builder().build()
+
+        with container as scoped_container:
+            repository = await scoped_container.aget(Repository)
+
+        assert repository.cache is await container.aget(Cache)
+
+    asyncio.run(main())
+
+
+def test_get__when_service_is_async__then_error_is_raised():
+    container = _get_builder().build()
+
+    with pytest.raises(MetaDIException):
+        container.get(Repository)
+
+
+def test_aget__when_service_is_unregistered__then_error_is_raised():
+    container = _get_builder().build()
+
+    with pytest.raises(MetaDIException):
+        asyncio.run(container.aget(str))
+
+
+POOL_CREATIONS = []
+
+
+async def create_counted_pool(config: Config) -> ConnectionPool:
+    POOL_CREATIONS.append(config)
+    await asyncio.sleep(0.01)
+    return ConnectionPool(config)
+
+
+def test_aget__when_called_concurrently__then_async_instances_are_created_once():
+    async def main():
+        container = (
+            ContainerBuilder()
+            .add_singleton(Config)
+            .add_singleton(ConnectionPool, create_counted_pool)
+            .add_scoped(Cache, create_cache)
+            .build()
+        )
+
+        pool1, pool2 = await asyncio.gather(
+            container.aget(ConnectionPool), container.aget(ConnectionPool)
+        )
+        with container as scope:
+            cache1, cache2 = await asyncio.gather(scope.aget(Cache), scope.aget(Cache))
+        with container as other_scope:
+            other_cache = await other_scope.aget(Cache)
+
+        assert pool1 is pool2
+        assert len(POOL_CREATIONS) == 1
+        assert cache1 is cache2
+        assert other_cache is not cache1
+
+    asyncio.run(main())
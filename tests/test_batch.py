@@ -0,0 +1,101 @@
+import pytest
+
+from meta_di import ContainerBuilder, ContainerProto
+from meta_di.exceptions import AsyncServiceError, MissingServiceError
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+async def create_async_service() -> object:
+    return object()
+
+
+def test_get_many__returns_services_in_requested_order(container):
+    with container as scoped_container:
+        singleton, transient, scoped = scoped_container.get_many(
+            (ISingletonService, ITransientService, IScopedService)
+        )
+
+        assert isinstance(singleton, SingletonService)
+        assert isinstance(transient, TransientService)
+        assert isinstance(scoped, ScopedService)
+        assert scoped is scoped_container.get(IScopedService)
+
+
+def test_get_many__shared_dependencies_are_the_same_instances(container):
+    transient_a, transient_b, singleton, scoped = container.get_many(
+        [ITransientService, ITransientService, ISingletonService, IScopedService]
+    )
+
+    assert transient_a is not transient_b
+    assert transient_a.scoped is transient_b.scoped is scoped
+    assert transient_a.singleton is transient_b.singleton is singleton
+    assert scoped is container.get(IScopedService)
+
+
+def test_get_many__when_container_is_requested__then_it_is_returned():
+    container = ContainerBuilder(container_svc_ids=[ContainerProto]).build()
+
+    assert container.get_many((ContainerProto,)) == (container,)
+
+
+def test_get_many__when_service_is_missing__then_error_is_raised(container):
+    with pytest.raises(MissingServiceError):
+        container.get_many((ISingletonService, "missing"))
+
+
+def test_get_many__when_service_is_async__then_error_is_raised():
+    container = ContainerBuilder().add_scoped("async", create_async_service).build()
+
+    with pytest.raises(AsyncServiceError):
+        container.get_many(("async",))
+
+
+def test_compile_batch__resolves_from_the_container_it_was_created_from(
+    container_class,
+):
+    container = container_class()
+
+    with container as scoped_container:
+        batch = scoped_container.compile_batch((IScopedService, ITransientService))
+        scoped, transient = batch()
+
+        assert scoped is scoped_container.get(IScopedService)
+        assert transient.scoped is scoped
+
+
+def test_compile_batch__batches_are_shared_between_containers_of_a_class(
+    container_class,
+):
+    container_a = container_class()
+    container_b = container_class()
+
+    batch_a = container_a.compile_batch((ISingletonService,))
+    batch_b = container_b.compile_batch((ISingletonService,))
+
+    assert batch_a.__func__ is batch_b.__func__
+    assert batch_b() == (container_b.get(ISingletonService),)
+
+
+def test_get_many__when_class_has_no_batch_compiler__then_getters_are_used(
+    container_class,
+):
+    code = (
+        ContainerBuilder().add_singleton(ISingletonService, SingletonService).get_code()
+    )
+    globs = {}
+    exec(code, globs)  # pylint: disable=exec-used
+    container = globs["Container"]()
+
+    assert (
+        container.get_many((ISingletonService, ISingletonService))
+        == (container.get(ISingletonService),) * 2
+    )
+    with pytest.raises(MissingServiceError):
+        container.get_many(("missing",))
@@ -0,0 +1,117 @@
+import gc
+
+from meta_di import (
+    ArgNameInspector,
+    CachingInspector,
+    ContainerBuilder,
+    TypeHintInspector,
+)
+from meta_di.code_generator import CodeGenerator
+from meta_di.inspector import DEFAULT_INSPECTOR
+from tests.conftest import ISingletonService, ScopedService, SingletonService
+
+
+class CountingInspector(TypeHintInspector):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_dependencies(self, provider):
+        self.calls += 1
+        return super().get_dependencies(provider)
+
+
+def create_service(config, client):
+    return (config, client)
+
+
+def test_caching_inspector__each_object_is_inspected_once():
+    counting_inspector = CountingInspector()
+    inspector = CachingInspector(counting_inspector)
+
+    dependencies = inspector.get_dependencies(ScopedService)
+
+    assert inspector.get_dependencies(ScopedService) == dependencies
+    assert dependencies == {"singleton": ISingletonService}
+    assert counting_inspector.calls == 1
+    assert inspector.cache_info() == (1, 1, 1)
+
+
+def test_caching_inspector__returned_dependencies_are_not_shared():
+    inspector = CachingInspector(TypeHintInspector())
+
+    inspector.get_dependencies(ScopedService).clear()
+
+    assert inspector.get_dependencies(ScopedService) == {"singleton": ISingletonService}
+
+
+def test_caching_inspector__when_object_cannot_be_weakly_referenced__then_it_is_not_cached():
+    inspector = CachingInspector(TypeHintInspector())
+
+    assert inspector.get_reference("service") == '"service"'
+    assert inspector.cache_info() == (0, 0, 0)
+
+
+def test_caching_inspector__when_object_is_collected__then_its_results_are_dropped():
+    inspector = CachingInspector(TypeHintInspector())
+
+    class Service:
+        pass
+
+    inspector.requires_import(Service)
+    assert inspector.cache_info().currsize == 1
+
+    del Service
+    gc.collect()
+
+    assert inspector.cache_info().currsize == 0
+
+
+def test_caching_inspector__works_with_any_inspector():
+    inspector = CachingInspector(ArgNameInspector())
+
+    assert inspector.get_dependencies(create_service) == {
+        "config": "config",
+        "client": "client",
+    }
+    assert inspector.get_full_name(create_service) == (
+        "tests.test_caching_inspector.create_service"
+    )
+    assert inspector.get_full_name(create_service) == (
+        "tests.test_caching_inspector.create_service"
+    )
+    assert inspector.cache_info().hits == 1
+
+
+def test_caching_inspector__cache_clear_resets_results_and_counters():
+    inspector = CachingInspector(TypeHintInspector())
+    inspector.get_reference(SingletonService)
+
+    inspector.cache_clear()
+
+    assert inspector.cache_info() == (0, 0, 0)
+
+
+def test_caching_inspector__default_inspector_is_shared_by_builders():
+    builder_a = ContainerBuilder().add_singleton(ISingletonService, SingletonService)
+    builder_b = ContainerBuilder().add_singleton(ISingletonService, SingletonService)
+    builder_a.build()
+    hits = DEFAULT_INSPECTOR.cache_info().hits
+
+    builder_b.build()
+
+    assert DEFAULT_INSPECTOR.cache_info().hits > hits
+
+
+def test_caching_inspector__does_not_change_the_fingerprint():
+    def fingerprint(inspector):
+        code_generator = CodeGenerator(
+            code_formatter=None, inspector=inspector, container_svc_ids=None
+        )
+        return code_generator.get_fingerprint({})
+
+    assert fingerprint(CachingInspector(TypeHintInspector())) == fingerprint(
+        TypeHintInspector()
+    )
+    assert fingerprint(CachingInspector(ArgNameInspector())) != fingerprint(
+        TypeHintInspector()
+    )
@@ -0,0 +1,90 @@
+import importlib.util
+
+from meta_di import ContainerBuilder
+from meta_di.cli import main
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+builder = (
+    ContainerBuilder()
+    .add_singleton(ISingletonService, SingletonService)
+    .add_scoped(IScopedService, ScopedService)
+    .add_transient(ITransientService, TransientService)
+)
+
+
+def get_builder():
+    return builder
+
+
+def _import_file(path):
+    spec = importlib.util.spec_from_file_location("compiled_container", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compile__writes_importable_container_module(tmp_path):
+    output = tmp_path / "container.py"
+
+    assert main(["compile", "tests.test_cli:builder", "-o", str(output)]) == 0
+
+    container = _import_file(output).Container()
+    assert isinstance(container.get(ITransientService), TransientService)
+
+
+def test_compile__when_target_is_a_function__then_its_result_is_compiled(tmp_path):
+    output = tmp_path / "container.py"
+
+    assert (
+        main(
+            [
+                "compile",
+                "tests.test_cli:get_builder",
+                "-o",
+                str(output),
+                "--class-name",
+                "AppContainer",
+            ]
+        )
+        == 0
+    )
+
+    assert _import_file(output).AppContainer
+
+
+def test_compile_check__when_output_is_up_to_date__then_succeeds(tmp_path):
+    output = tmp_path / "container.py"
+    main(["compile", "tests.test_cli:builder", "-o", str(output)])
+
+    assert (
+        main(["compile", "tests.test_cli:builder", "-o", str(output), "--check"]) == 0
+    )
+
+
+def test_compile_check__when_output_is_stale__then_fails(tmp_path):
+    output = tmp_path / "container.py"
+    main(["compile", "tests.test_cli:builder", "-o", str(output)])
+    output.write_text(output.read_text() + "\n# edited\n")
+
+    assert (
+        main(["compile", "tests.test_cli:builder", "-o", str(output), "--check"]) == 1
+    )
+
+
+def test_compile_check__when_output_is_missing__then_fails(tmp_path):
+    output = tmp_path / "container.py"
+
+    assert (
+        main(["compile", "tests.test_cli:builder", "-o", str(output), "--check"]) == 1
+    )
+
+
+def test_compile__when_target_is_not_a_builder__then_fails():
+    assert main(["compile", "tests.conftest:SingletonService"]) == 2
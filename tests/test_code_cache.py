@@ -0,0 +1,89 @@
+from meta_di import ContainerBuilder, FileCodeCache
+from meta_di.code_generator import CodeGenerator
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+class Resource:
+    closed = False
+
+
+def _close_resource(resource: Resource) -> None:
+    resource.closed = True
+
+
+def _get_builder(code_cache=None):
+    return (
+        ContainerBuilder(code_cache=code_cache)
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+        .add_transient(ITransientService, TransientService)
+    )
+
+
+def test_code_cache__when_fingerprint_is_cached__then_code_is_not_generated(
+    tmp_path, monkeypatch
+):
+    code_cache = FileCodeCache(str(tmp_path))
+    _get_builder(code_cache).build_class()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("code should not be generated on a cache hit")
+
+    monkeypatch.setattr(CodeGenerator, "_gen_code", fail)
+    container = _get_builder(code_cache).build()
+
+    assert isinstance(container.get(ITransientService), TransientService)
+
+
+def test_code_cache__when_lifecycle_changes__then_fingerprint_changes(tmp_path):
+    code_cache = FileCodeCache(str(tmp_path))
+    _get_builder(code_cache).build_class()
+
+    container = (
+        _get_builder(code_cache).add_transient(ISingletonService, SingletonService)
+    ).build()
+
+    assert container.get(ISingletonService) is not container.get(ISingletonService)
+
+
+def test_code_cache__when_class_provider_becomes_disposable__then_fingerprint_changes(
+    tmp_path, monkeypatch
+):
+    code_cache = FileCodeCache(str(tmp_path))
+    ContainerBuilder(code_cache=code_cache).add_scoped(Resource).build_class()
+
+    monkeypatch.setattr(Resource, "close", _close_resource, raising=False)
+    container = ContainerBuilder(code_cache=code_cache).add_scoped(Resource).build()
+    with container as scope:
+        resource = scope.get(Resource)
+
+    assert resource.closed
+
+
+def test_code_cache__when_entry_is_corrupted__then_code_is_regenerated(tmp_path):
+    code_cache = FileCodeCache(str(tmp_path))
+    _get_builder(code_cache).build_class()
+
+    for entry in tmp_path.iterdir():
+        entry.write_bytes(b"corrupted")
+
+    container = _get_builder(code_cache).build()
+
+    assert isinstance(container.get(ISingletonService), SingletonService)
+
+
+def test_get_code__imports_are_sorted():
+    imports = [
+        line
+        for line in _get_builder().get_code().splitlines()
+        if line.startswith("import ")
+    ]
+
+    assert imports == sorted(imports)
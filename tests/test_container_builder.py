@@ -1,6 +1,7 @@
 import pytest
 
-from meta_di import ContainerBuilder, ContainerProto, MetaDIException
+from meta_di import ArgNameInspector, ContainerBuilder, ContainerProto, MetaDIException
+from meta_di.exceptions import CircularDependencyError
 from tests.conftest import ISingletonService, SingletonService, TransientService
 
 
@@ -74,3 +75,108 @@ def test_build_container__scoped_container_is_injected_as_singleton():
         assert scoped_container.get(SingletonService) is scoped_container.get(
             SingletonService
         )
+
+
+class RecordingCodeFormatter:
+    def __init__(self):
+        self.calls = 0
+
+    def format(self, code: str) -> str:
+        self.calls += 1
+        return code
+
+
+def test_build_container__code_formatter_is_only_used_by_get_code():
+    code_formatter = RecordingCodeFormatter()
+    builder = ContainerBuilder(code_formatter=code_formatter).add_singleton(
+        SingletonService
+    )
+
+    builder.build()
+    assert code_formatter.calls == 0
+
+    builder.get_code()
+    assert code_formatter.calls == 1
+
+
+def create_self_dependent(self_dependent):
+    return self_dependent
+
+
+def create_a(b):
+    return b
+
+
+def create_b(c):
+    return c
+
+
+def create_c(a):
+    return a
+
+
+def test_build_container__when_service_depends_on_itself__then_error_is_raised():
+    builder = ContainerBuilder(inspector=ArgNameInspector()).add_transient(
+        "self_dependent", create_self_dependent
+    )
+
+    with pytest.raises(CircularDependencyError) as error:
+        builder.build_class()
+
+    assert error.value.path == ["self_dependent", "self_dependent"]
+
+
+@pytest.mark.parametrize("lifecycle", ["transient", "scoped", "singleton"])
+def test_build_container__when_dependencies_are_circular__then_error_shows_the_cycle(
+    lifecycle,
+):
+    builder = ContainerBuilder(inspector=ArgNameInspector()).add_singleton(
+        "singleton", get_123
+    )
+    getattr(builder, f"add_{lifecycle}")("a", create_a)
+    builder.add_transient("b", create_b).add_transient("c", create_c)
+
+    with pytest.raises(CircularDependencyError) as error:
+        builder.build_class()
+
+    assert len(error.value.path) == 4
+    assert error.value.path[0] == error.value.path[-1]
+    assert set(error.value.path) == {"a", "b", "c"}
+    assert " -> ".join(error.value.path) in str(error.value)
+
+
+class DiamondBase:
+    pass
+
+
+class DiamondLeft:
+    def __init__(self, base: DiamondBase) -> None:
+        self.base = base
+
+
+class DiamondRight:
+    def __init__(self, base: DiamondBase) -> None:
+        self.base = base
+
+
+class DiamondTop:
+    def __init__(self, left: DiamondLeft, right: DiamondRight) -> None:
+        self.left = left
+        self.right = right
+
+
+def test_build_container__when_transients_share_dependencies__then_each_one_gets_its_own_instance():
+    container = (
+        ContainerBuilder()
+        .add_transient(DiamondTop)
+        .add_transient(DiamondLeft)
+        .add_transient(DiamondRight)
+        .add_transient(DiamondBase)
+        .build()
+    )
+
+    top = container.get(DiamondTop)
+
+    assert isinstance(top.left.base, DiamondBase)
+    assert isinstance(top.right.base, DiamondBase)
+    assert top.left.base is not top.right.base
@@ -0,0 +1,62 @@
+import pytest
+
+from meta_di import ContainerBuilder, MetaDIException
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+def test_resolver__resolves_from_the_container_it_was_created_from(
+    container_class,
+):
+    container = container_class()
+    resolve_singleton = container.resolver(ISingletonService)
+
+    with container as scoped_container:
+        resolve_scoped = scoped_container.resolver(IScopedService)
+        assert resolve_scoped() is scoped_container.get(IScopedService)
+
+    assert resolve_singleton() is container.get(ISingletonService)
+
+
+def test_resolver__when_service_is_transient__then_new_instances_are_created(
+    container,
+):
+    resolve = container.resolver(ITransientService)
+
+    assert isinstance(resolve(), TransientService)
+    assert resolve() is not resolve()
+
+
+def test_resolver__when_service_is_unregistered__then_error_is_raised():
+    container = ContainerBuilder().build()
+
+    with pytest.raises(MetaDIException):
+        container.resolver(ISingletonService)
+
+
+def raise_key_error():
+    raise KeyError("inner")
+
+
+def test_get__when_getter_raises_key_error__then_it_is_not_reported_as_missing_service():
+    container = ContainerBuilder().add_transient("service", raise_key_error).build()
+
+    with pytest.raises(KeyError):
+        container.get("service")
+
+
+def test_getitem__is_the_same_as_get():
+    container = (
+        ContainerBuilder()
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+        .build()
+    )
+
+    assert container[ISingletonService] is container.get(ISingletonService)
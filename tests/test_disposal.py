@@ -0,0 +1,150 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from meta_di import ContainerBuilder
+from meta_di.exceptions import ScopeContextError
+
+events = []
+
+
+class Connection:
+    def close(self) -> None:
+        events.append(("close", type(self)))
+
+
+class Session:
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        events.append(("exit", type(self)))
+
+
+class AsyncClient:
+    async def aclose(self) -> None:
+        events.append(("aclose", type(self)))
+
+
+class Plain:
+    pass
+
+
+def create_connection() -> Connection:
+    return Connection()
+
+
+class FailingResource:
+    def close(self) -> None:
+        raise RuntimeError("failed to close")
+
+
+def setup_function():
+    events.clear()
+
+
+def test_scope_exit__disposes_scoped_instances_in_reverse_creation_order():
+    container = (
+        ContainerBuilder()
+        .add_scoped(Connection, create_connection)
+        .add_scoped(Session)
+        .add_scoped(Plain)
+        .build()
+    )
+
+    with container as scoped_container:
+        scoped_container.get(Session)
+        scoped_container.get(Plain)
+        assert not events
+
+    assert events == [("exit", Session), ("close", Connection)]
+
+
+def test_scope_exit__singletons_are_only_disposed_when_container_is_closed():
+    container = ContainerBuilder().add_singleton(Connection).add_scoped(Session).build()
+
+    with container as scoped_container:
+        scoped_container.get(Session)
+
+    assert events == [("exit", Session)]
+
+    container.close()
+
+    assert events == [("exit", Session), ("close", Connection)]
+
+
+def test_scope_exit__nested_scopes_are_closed_in_order():
+    container = ContainerBuilder().add_scoped(Connection).build()
+
+    with container as outer_scope:
+        outer_connection = outer_scope.get(Connection)
+        with container as inner_scope:
+            inner_connection = inner_scope.get(Connection)
+
+        assert events == [("close", Connection)]
+        assert outer_connection is not inner_connection
+
+    assert len(events) == 2
+
+
+@pytest.mark.parametrize("ambient_scopes", [False, True])
+def test_scope_exit__when_exited_in_another_thread__then_error_is_raised(
+    ambient_scopes,
+):
+    container = (
+        ContainerBuilder(ambient_scopes=ambient_scopes).add_scoped(Connection).build()
+    )
+    scope = container.__enter__()
+    scope.get(Connection)
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(container.__exit__, None, None, None)
+        with pytest.raises(ScopeContextError):
+            future.result()
+
+    assert events == []
+    container.__exit__(None, None, None)
+    assert events == [("close", Connection)]
+
+
+def test_scope_exit__when_exited_twice__then_error_is_raised():
+    container = ContainerBuilder().add_scoped(Connection).build()
+
+    with container:
+        pass
+
+    with pytest.raises(ScopeContextError):
+        container.__exit__(None, None, None)
+
+
+def test_close__when_disposal_fails__then_other_instances_are_still_disposed():
+    container = (
+        ContainerBuilder().add_scoped(Connection).add_scoped(FailingResource).build()
+    )
+    scope = container.create_scope()
+    scope.get(Connection)
+    scope.get(FailingResource)
+
+    with pytest.raises(RuntimeError):
+        scope.close()
+
+    assert events == [("close", Connection)]
+
+
+def test_async_scope_exit__awaits_async_disposal():
+    container = (
+        ContainerBuilder().add_scoped(AsyncClient).add_scoped(Connection).build()
+    )
+
+    async def main():
+        async with container as scoped_container:
+            scoped_container.get(AsyncClient)
+            scoped_container.get(Connection)
+
+    asyncio.run(main())
+
+    assert events == [("close", Connection), ("aclose", AsyncClient)]
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from meta_di import ContainerBuilder, ForkPolicy
+from meta_di.forking import _reinit_in_child
+
+
+class Config:
+    pass
+
+
+class Connection:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Repository:
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+
+
+class Handler:
+    def __init__(self, repository: Repository, config: Config) -> None:
+        self.repository = repository
+        self.config = config
+
+
+@pytest.fixture
+def builder():
+    return (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_singleton(Connection, fork_policy=ForkPolicy.REINIT)
+        .add_singleton(Repository)
+        .add_transient(Handler)
+    )
+
+
+def test_reinit__singletons_are_dropped_and_created_again_after_fork(builder):
+    container = builder.build()
+    config = container.get(Config)
+    connection = container.get(Connection)
+    repository = container.get(Repository)
+
+    _reinit_in_child()
+
+    assert container.get(Config) is config
+    assert container.get(Connection) is not connection
+    assert not connection.closed
+    # Repository depends on Connection, so it is created again as well
+    assert container.get(Repository) is not repository
+    assert container.get(Repository).connection is container.get(Connection)
+    assert container.get(Handler).repository is container.get(Repository)
+
+
+def test_reinit__dropped_singletons_are_not_disposed_by_the_child(builder):
+    container = builder.build()
+    connection = container.get(Connection)
+
+    _reinit_in_child()
+    new_connection = container.get(Connection)
+    container.close()
+
+    assert not connection.closed
+    assert new_connection.closed
+
+
+def test_reinit__scoped_containers_see_the_new_instances(builder):
+    container = builder.build()
+    connection = container.get(Connection)
+
+    with container as scoped_container:
+        _reinit_in_child()
+
+        assert scoped_container.get(Connection) is not connection
+        assert scoped_container.get(Connection) is container.get(Connection)
+
+
+def test_reinit__when_no_singleton_is_reinit__then_code_is_unchanged():
+    builder = ContainerBuilder().add_singleton(Config)
+
+    assert "_reinit_after_fork" not in builder.get_code()
+
+
+def test_reinit__when_reinit_singleton_is_added_after_building__then_class_is_rebuilt():
+    builder = ContainerBuilder().add_singleton(Config).add_singleton(Connection)
+    builder.build()
+
+    container = builder.add_singleton(Connection, fork_policy=ForkPolicy.REINIT).build()
+    connection = container.get(Connection)
+    _reinit_in_child()
+
+    assert container.get(Connection) is not connection
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_reinit__forked_child_creates_its_own_instances(builder):
+    container = builder.build()
+    config = container.get(Config)
+    connection = container.get(Connection)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_fd)
+        ok = (
+            container.get(Config) is config
+            and container.get(Connection) is not connection
+        )
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert result == b"1"
+    assert container.get(Connection) is connection
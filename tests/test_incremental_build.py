@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder
+from meta_di.exceptions import CircularDependencyError
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+class OtherSingletonService(ISingletonService):
+    ...
+
+
+class OtherScopedService:
+    def __init__(self, singleton: ISingletonService) -> None:
+        self.singleton = singleton
+
+
+class Plugin:
+    def __init__(self, transient: ITransientService) -> None:
+        self.transient = transient
+
+
+class UnrelatedService:
+    pass
+
+
+def _builder():
+    return (
+        ContainerBuilder()
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+        .add_transient(ITransientService, TransientService)
+        .add_transient(UnrelatedService)
+    )
+
+
+def _getter_names(container_class):
+    return {name for name in vars(container_class) if name.startswith("get_")}
+
+
+def test_incremental_build__when_service_is_added__then_only_its_getter_is_generated():
+    builder = _builder()
+    container_class = builder.build_class()
+
+    builder.add_transient(Plugin)
+    new_container_class = builder.build_class()
+
+    assert issubclass(new_container_class, container_class)
+    assert _getter_names(new_container_class) == {
+        "get_tests_test_incremental_build_Plugin"
+    }
+    with new_container_class() as scoped_container:
+        plugin = scoped_container.get(Plugin)
+        assert plugin.transient.scoped is scoped_container.get(IScopedService)
+
+
+def test_incremental_build__when_dependency_is_replaced__then_dependents_use_the_new_provider():
+    builder = _builder()
+    builder.build_class()
+
+    builder.add_scoped(IScopedService, OtherScopedService)
+    container = builder.build()
+
+    with container as scoped_container:
+        transient = scoped_container.get(ITransientService)
+        assert isinstance(transient.scoped, OtherScopedService)
+        assert transient.scoped.singleton is container.get(ISingletonService)
+    assert _getter_names(type(container)) == {
+        "get_tests_conftest_IScopedService",
+        "get_tests_conftest_ITransientService",
+    }
+
+
+def test_incremental_build__when_inlined_transient_is_replaced__then_its_dependents_are_regenerated():
+    builder = _builder().add_transient(Plugin)
+    builder.build_class()
+
+    builder.add_transient(ITransientService, UnrelatedService)
+    container = builder.build()
+
+    assert isinstance(container.get(Plugin).transient, UnrelatedService)
+    assert container.get_many((ITransientService, Plugin))[0].__class__ is (
+        UnrelatedService
+    )
+
+
+def test_incremental_build__builds_derive_from_the_first_class():
+    builder = _builder()
+    container_class = builder.build_class()
+
+    builder.add_transient(Plugin)
+    builder.build_class()
+    builder.add_transient(UnrelatedService)
+    new_container_class = builder.build_class()
+
+    assert new_container_class.__bases__ == (container_class,)
+    assert "get_tests_test_incremental_build_Plugin" in vars(new_container_class)
+    assert isinstance(new_container_class().get(Plugin), Plugin)
+
+
+def test_incremental_build__when_preloaded_singleton_is_replaced__then_it_is_preloaded():
+    builder = _builder()
+    builder.build_class()
+
+    builder.add_singleton(ISingletonService, OtherSingletonService)
+    container = builder.build()
+
+    assert isinstance(container.get(ISingletonService), OtherSingletonService)
+    assert container.get(IScopedService).singleton is container.get(ISingletonService)
+
+
+def test_incremental_build__when_preloaded_singletons_change__then_class_is_created_again():
+    builder = _builder()
+    container_class = builder.build_class()
+
+    builder.add_singleton(UnrelatedService)
+    new_container_class = builder.build_class()
+
+    assert not issubclass(new_container_class, container_class)
+    container = new_container_class()
+    assert container.get(UnrelatedService) is container.get(UnrelatedService)
+
+
+def test_incremental_build__previous_classes_are_not_changed():
+    builder = _builder()
+    container_class = builder.build_class()
+
+    builder.add_scoped(IScopedService, OtherScopedService)
+    builder.build_class()
+
+    with container_class() as scoped_container:
+        assert isinstance(scoped_container.get(IScopedService), ScopedService)
+        assert isinstance(scoped_container.get(ITransientService).scoped, ScopedService)
+
+
+def create_plugin(plugin_dependency):
+    return plugin_dependency
+
+
+def create_plugin_dependency():
+    return "sync"
+
+
+def create_circular_plugin_dependency(plugin):
+    return plugin
+
+
+async def create_async_plugin_dependency():
+    return "async"
+
+
+def _plugin_builder():
+    return (
+        ContainerBuilder(inspector=ArgNameInspector())
+        .add_transient("plugin", create_plugin)
+        .add_transient("plugin_dependency", create_plugin_dependency)
+    )
+
+
+def test_incremental_build__when_change_adds_a_cycle__then_error_is_raised():
+    builder = _plugin_builder()
+    builder.build_class()
+
+    builder.add_transient("plugin_dependency", create_circular_plugin_dependency)
+
+    with pytest.raises(CircularDependencyError):
+        builder.build_class()
+
+
+def test_incremental_build__when_service_becomes_async__then_class_is_created_again():
+    builder = _plugin_builder()
+    container_class = builder.build_class()
+
+    builder.add_scoped("plugin_dependency", create_async_plugin_dependency)
+    new_container_class = builder.build_class()
+
+    assert not issubclass(new_container_class, container_class)
+    assert asyncio.run(new_container_class().aget("plugin")) == "async"
@@ -0,0 +1,157 @@
+import pytest
+
+from meta_di import ContainerBuilder
+
+
+class Base:
+    pass
+
+
+class Left:
+    def __init__(self, base: Base) -> None:
+        self.base = base
+
+
+class Right:
+    def __init__(self, base: Base) -> None:
+        self.base = base
+
+
+class Top:
+    def __init__(self, left: Left, right: Right) -> None:
+        self.left = left
+        self.right = right
+
+
+def _make_chain(length: int):
+    chain = [type("ChainLink0", (), {"__module__": __name__})]
+    for index in range(1, length):
+
+        def __init__(self, previous) -> None:
+            self.previous = previous
+
+        __init__.__annotations__["previous"] = chain[-1]
+        chain.append(
+            type(
+                f"ChainLink{index}",
+                (),
+                {"__init__": __init__, "__module__": __name__},
+            )
+        )
+    globals().update({link.__name__: link for link in chain})
+    return chain
+
+
+CHAIN = _make_chain(300)
+
+
+def _make_diamonds(depth: int):
+    """
+    Returns the levels of a graph where both services of each level depend on both services of the next one
+    """
+    levels = [[type(f"Diamond{depth}Base", (), {"__module__": __name__})]]
+    for index in range(1, depth):
+        level = []
+        for side in ("Left", "Right"):
+
+            def __init__(self, left, right) -> None:
+                self.left = left
+                self.right = right
+
+            __init__.__annotations__.update(left=levels[-1][0], right=levels[-1][-1])
+            level.append(
+                type(
+                    f"Diamond{depth}{side}{index}",
+                    (),
+                    {"__init__": __init__, "__module__": __name__},
+                )
+            )
+        levels.append(level)
+    globals().update(
+        {service.__name__: service for level in levels for service in level}
+    )
+    return levels
+
+
+def _diamonds_builder(levels):
+    builder = ContainerBuilder()
+    for level in levels:
+        for service in level:
+            builder.add_transient(service)
+    return builder
+
+
+def _diamond_builder(**kwargs):
+    return (
+        ContainerBuilder(**kwargs)
+        .add_transient(Top)
+        .add_transient(Left)
+        .add_transient(Right)
+        .add_transient(Base)
+    )
+
+
+@pytest.mark.parametrize(
+    "budget",
+    [{}, {"inline_max_size": 1}, {"inline_max_size": 2}, {"inline_max_depth": 1}],
+)
+def test_inline_budget__services_are_created_the_same_way_with_any_budget(budget):
+    container = _diamond_builder(**budget).build()
+
+    top = container.get(Top)
+
+    assert isinstance(top.left.base, Base)
+    assert isinstance(top.right.base, Base)
+    assert top.left.base is not top.right.base
+
+
+def test_inline_budget__when_unlimited__then_every_transient_is_inlined():
+    code_size = _diamond_builder(inline_max_depth=None).get_code_size()
+
+    assert code_size.getter_methods == 4
+    assert code_size.outlined_services == 0
+    assert code_size.largest_inline_size == 5
+    assert code_size.deepest_inline_depth == 3
+
+
+def test_inline_budget__when_transient_exceeds_the_size__then_its_getter_is_called():
+    unlimited_size = _diamond_builder().get_code_size()
+    code_size = _diamond_builder(inline_max_size=2).get_code_size()
+
+    assert code_size.outlined_services == 2
+    assert code_size.largest_inline_size == 2
+    assert code_size.characters < unlimited_size.characters
+
+
+def test_inline_budget__when_transient_exceeds_the_depth__then_its_getter_is_called():
+    code_size = _diamond_builder(inline_max_depth=2).get_code_size()
+
+    assert code_size.outlined_services == 2
+    assert code_size.deepest_inline_depth == 2
+
+
+def test_inline_budget__deep_transient_chains_can_be_built():
+    builder = ContainerBuilder()
+    for link in CHAIN:
+        builder.add_transient(link)
+
+    link = builder.build().get(CHAIN[-1])
+    for _ in range(len(CHAIN) - 1):
+        link = link.previous
+
+    assert isinstance(link, CHAIN[0])
+    assert builder.get_code_size().deepest_inline_depth == 32
+
+
+def test_inline_budget__code_of_deep_diamonds_grows_linearly():
+    levels = _make_diamonds(20)
+    size = _diamonds_builder(levels[:10]).get_code_size()
+    twice_deep_size = _diamonds_builder(levels).get_code_size()
+
+    # Transients are not shared, so resolving the top of the graph would create 2 ** 20 instances
+    service = _diamonds_builder(levels).build().get(levels[8][0])
+    for _ in range(7):
+        service = service.right
+    assert isinstance(service.left, levels[0][0])
+    assert twice_deep_size.characters < 2.5 * size.characters
+    assert twice_deep_size.largest_inline_size <= size.largest_inline_size
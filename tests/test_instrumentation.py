@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from meta_di import ContainerBuilder
+from meta_di.instrumentation import ServiceStats
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+class Handler:
+    def __init__(self, transient: ITransientService) -> None:
+        self.transient = transient
+
+
+async def create_async_service(singleton: ISingletonService) -> object:
+    return object()
+
+
+def _builder(**kwargs):
+    return (
+        ContainerBuilder(**kwargs)
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+        .add_transient(ITransientService, TransientService)
+        .add_transient(Handler)
+    )
+
+
+@pytest.mark.parametrize("options", [{}, {"thread_safe": True}, {"scope_pool_size": 2}])
+def test_stats__counts_resolutions_and_creations_of_every_service(options):
+    container = _builder(instrument=True, **options).build()
+
+    with container as scoped_container:
+        scoped_container.get(Handler)
+        scoped_container.get(Handler)
+
+    stats = container.stats()
+    assert stats[Handler][:2] == (2, 2)
+    # Inlined in Handler
+    assert stats[ITransientService][:2] == (2, 2)
+    assert stats[IScopedService][:2] == (2, 1)
+    # Preloaded when the container was created, then injected into ScopedService and both TransientServices
+    assert stats[ISingletonService][:2] == (4, 1)
+
+
+def test_stats__construction_time_includes_dependencies():
+    container = _builder(instrument=True).build()
+
+    container.get(Handler)
+
+    stats = container.stats()
+    assert stats[Handler].construction_ns >= stats[ITransientService].construction_ns
+    assert stats[Handler].construction_ns > 0
+    assert stats[Handler].mean_construction_ns == stats[Handler].construction_ns
+
+
+def test_stats__are_shared_with_scoped_containers_and_batches():
+    container = _builder(instrument=True).build()
+
+    with container as scoped_container:
+        scoped_container.get_many((Handler, ITransientService))
+        assert scoped_container.stats() == container.stats()
+
+    assert container.stats()[ITransientService].creations == 2
+
+
+def test_stats__when_service_is_async__then_it_is_counted():
+    container = (
+        _builder(instrument=True).add_scoped("async", create_async_service).build()
+    )
+
+    async def resolve_twice():
+        with container as scoped_container:
+            await scoped_container.aget("async")
+            await scoped_container.aget("async")
+
+    asyncio.run(resolve_twice())
+
+    assert container.stats()["async"][:2] == (2, 1)
+
+
+def test_stats__when_service_is_added_incrementally__then_it_is_counted():
+    builder = _builder(instrument=True)
+    builder.build_class()
+
+    builder.add_transient("handler", Handler)
+    container = builder.build()
+    container.get("handler")
+
+    assert container.stats()["handler"] == ServiceStats(
+        1, 1, container.stats()["handler"].construction_ns
+    )
+
+
+def test_stats__when_not_instrumenting__then_containers_have_no_stats():
+    container = _builder().build()
+
+    assert not hasattr(container, "stats")
+    assert "perf_counter_ns" not in _builder().get_code()
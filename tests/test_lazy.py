@@ -0,0 +1,133 @@
+import pytest
+
+from meta_di import ContainerBuilder, ForkPolicy, Lazy
+from meta_di.exceptions import AsyncServiceError, MissingServiceError
+from meta_di.forking import _reinit_in_child
+
+
+class Report:
+    instances = 0
+
+    def __init__(self) -> None:
+        Report.instances += 1
+
+
+class Handler:
+    def __init__(self, report: Lazy[Report]) -> None:
+        self.report = report
+
+
+class Parent:
+    def __init__(self, child: "Child") -> None:
+        self.child = child
+
+
+class Child:
+    def __init__(self, parent: Lazy[Parent]) -> None:
+        self.parent = parent
+
+
+Parent.__init__.__annotations__["child"] = Child
+
+
+class Connection:
+    pass
+
+
+class Repository:
+    def __init__(self, connection: Lazy[Connection]) -> None:
+        self.connection = connection
+
+
+async def create_report() -> Report:
+    return Report()
+
+
+def test_lazy__service_is_created_on_first_use_only():
+    container = ContainerBuilder().add_transient(Report).add_transient(Handler).build()
+    instances = Report.instances
+
+    handler = container.get(Handler)
+
+    assert Report.instances == instances
+    assert not handler.report.is_resolved
+
+    report = handler.report.get()
+
+    assert isinstance(report, Report)
+    assert handler.report.get() is report
+    assert Report.instances == instances + 1
+
+
+def test_lazy__each_dependent_gets_its_own_handle():
+    container = ContainerBuilder().add_transient(Report).add_transient(Handler).build()
+
+    assert container.get(Handler).report is not container.get(Handler).report
+
+
+def test_lazy__handles_resolve_services_with_their_lifecycle():
+    container = ContainerBuilder().add_scoped(Report).add_transient(Handler).build()
+
+    with container as scoped_container:
+        report = scoped_container.get(Handler).report.get()
+
+        assert report is scoped_container.get(Report)
+        assert scoped_container.get(Handler).report.get() is report
+
+
+def test_lazy__handle_is_inlined_with_the_getter_of_the_service():
+    builder = (
+        ContainerBuilder(code_formatter=None)
+        .add_transient(Report)
+        .add_transient(Handler)
+    )
+
+    code = builder.get_code()
+
+    assert "report=meta_di.lazy.Lazy(self.get_tests_test_lazy_Report)," in code
+
+
+def test_lazy__breaks_circular_dependencies():
+    container = ContainerBuilder().add_singleton(Parent).add_singleton(Child).build()
+
+    parent = container.get(Parent)
+
+    assert parent.child.parent.get() is parent
+
+
+def test_lazy__handles_can_be_injected_into_wired_functions():
+    container = ContainerBuilder().add_transient(Report).add_transient(Handler).build()
+
+    @container.wire
+    def handle(report: Lazy[Report]):
+        return report
+
+    assert isinstance(handle().get(), Report)
+
+
+def test_lazy__when_service_is_missing__then_error_is_raised():
+    with pytest.raises(MissingServiceError):
+        ContainerBuilder().add_transient(Handler).build()
+
+
+def test_lazy__when_service_is_async__then_error_is_raised():
+    with pytest.raises(AsyncServiceError):
+        ContainerBuilder().add_transient(Report, create_report).add_transient(
+            Handler
+        ).build()
+
+
+def test_lazy__singletons_resolved_by_handles_of_reinit_singletons_are_reinit():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Connection, fork_policy=ForkPolicy.REINIT)
+        .add_singleton(Repository)
+        .build()
+    )
+    repository = container.get(Repository)
+    repository.connection.get()
+
+    _reinit_in_child()
+
+    assert container.get(Repository) is not repository
+    assert container.get(Repository).connection.get() is container.get(Connection)
@@ -0,0 +1,214 @@
+import pytest
+
+from meta_di import CompositeContainer, ContainerBuilder, ContainerProto
+from meta_di.exceptions import (
+    CircularDependencyError,
+    MissingServiceError,
+    ModuleCompositionError,
+)
+from meta_di.modules import imported_service
+
+
+class Database:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Session:
+    def __init__(self, database: Database) -> None:
+        self.database = database
+
+
+class UserRepository:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+
+class UserService:
+    def __init__(self, users: UserRepository, session: Session) -> None:
+        self.users = users
+        self.session = session
+
+
+class FakeUserService:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+
+class Billing:
+    def __init__(self, users: UserService, session: Session) -> None:
+        self.users = users
+        self.session = session
+
+
+def build_database_module():
+    return (
+        ContainerBuilder()
+        .add_singleton(Database)
+        .add_scoped(Session)
+        .build_module("database", exports=[Session])
+    )
+
+
+def build_users_module():
+    return (
+        ContainerBuilder()
+        .add_import(Session)
+        .add_transient(UserRepository)
+        .add_transient(UserService)
+        .build_module("users", exports=[UserService])
+    )
+
+
+def build_billing_module():
+    return (
+        ContainerBuilder()
+        .add_import(Session)
+        .add_import(UserService)
+        .add_transient(Billing)
+        .build_module("billing", exports=[Billing])
+    )
+
+
+@pytest.fixture
+def container():
+    # Modules are given in any order, they are instantiated after the modules they import from
+    return CompositeContainer(
+        [build_billing_module(), build_users_module(), build_database_module()]
+    )
+
+
+def test_composite__imported_services_are_resolved_by_the_exporting_module(
+    container,
+):
+    billing = container.get(Billing)
+
+    assert billing.session is container.get(Session)
+    assert billing.users.session is billing.session
+    assert billing.users.users.session is billing.session
+
+
+def test_composite__scopes_of_modules_are_linked_to_each_other(container):
+    root_session = container.get(Session)
+
+    with container as scoped_container:
+        billing = scoped_container.get(Billing)
+
+        assert billing.session is scoped_container.get(Session)
+        assert billing.session is not root_session
+        assert billing.users.session is billing.session
+        assert billing.session.database is root_session.database
+
+
+def test_composite__only_exported_services_can_be_resolved(container):
+    with pytest.raises(MissingServiceError):
+        container.get(UserRepository)
+
+
+def test_composite__batches_and_wiring_resolve_exported_services(container):
+    @container.wire
+    def handler(billing: Billing, session: Session):
+        return billing, session
+
+    billing, session = handler()
+
+    assert billing.session is session
+    assert container.get_many((Session,)) == (session,)
+    assert container.compile_batch((Session, Billing))()[0] is session
+
+
+def test_composite__wiring_injects_the_composite_container(container):
+    def handler(di: ContainerProto, session: Session):
+        return di, session
+
+    with container as scoped_container:
+        assert scoped_container.wire(handler)() == (
+            scoped_container,
+            scoped_container.get(Session),
+        )
+    assert container.wire(handler)(session="passed") == (container, "passed")
+
+
+def test_composite__modules_are_closed(container):
+    database = container.get(Session).database
+
+    container.close()
+
+    assert database.closed
+
+
+def test_composite__modules_can_be_built_again_on_their_own():
+    database_module = build_database_module()
+    users_module = build_users_module()
+    container = CompositeContainer([database_module, users_module])
+    assert isinstance(container.get(UserService), UserService)
+
+    fake_users_module = (
+        ContainerBuilder()
+        .add_import(Session)
+        .add_transient(UserService, FakeUserService)
+        .build_module("users", exports=[UserService])
+    )
+    container = CompositeContainer([database_module, fake_users_module])
+
+    assert isinstance(container.get(UserService), FakeUserService)
+    assert container.get(UserService).session is container.get(Session)
+
+
+def test_module__when_used_without_composing__then_imports_are_missing():
+    users_module = build_users_module()
+
+    with pytest.raises(MissingServiceError):
+        users_module.container_class().get(UserService)
+
+
+def test_module__when_imported_service_provider_is_called__then_error_is_raised():
+    with pytest.raises(ModuleCompositionError, match="CompositeContainer"):
+        imported_service()
+
+
+def test_module__when_export_is_not_registered__then_error_is_raised():
+    with pytest.raises(MissingServiceError):
+        ContainerBuilder().build_module("empty", exports=[Session])
+
+
+@pytest.mark.parametrize(
+    "build_modules",
+    [
+        lambda: [build_users_module()],
+        lambda: [build_database_module(), build_database_module()],
+        lambda: [
+            build_database_module(),
+            ContainerBuilder()
+            .add_scoped(Session, Session)
+            .add_singleton(Database)
+            .build_module("other_database", exports=[Session]),
+        ],
+    ],
+)
+def test_composite__when_modules_do_not_fit__then_error_is_raised(build_modules):
+    with pytest.raises(ModuleCompositionError):
+        CompositeContainer(build_modules())
+
+
+def test_composite__when_modules_import_from_each_other__then_error_is_raised():
+    users_module = (
+        ContainerBuilder()
+        .add_import(Billing)
+        .add_import(Session)
+        .add_transient(UserService, FakeUserService)
+        .build_module("users", exports=[UserService])
+    )
+
+    with pytest.raises(CircularDependencyError) as error:
+        CompositeContainer(
+            [build_database_module(), build_billing_module(), users_module]
+        )
+
+    assert error.value.path in (
+        ["billing", "users", "billing"],
+        ["users", "billing", "users"],
+    )
@@ -0,0 +1,206 @@
+import collections.abc
+import sys
+from typing import Sequence
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder
+from meta_di.exceptions import MissingServiceError, ServiceConflictError
+from meta_di.multi import get_member_id
+
+
+class Config:
+    pass
+
+
+class IValidator:
+    pass
+
+
+class LengthValidator(IValidator):
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+
+class EmailValidator(IValidator):
+    pass
+
+
+class Form:
+    def __init__(self, validators: Sequence[IValidator]) -> None:
+        self.validators = validators
+
+
+if sys.version_info >= (3, 9):
+
+    class AbcForm:
+        def __init__(self, validators: collections.abc.Sequence[IValidator]) -> None:
+            self.validators = validators
+
+else:
+    AbcForm = None
+
+
+def create_validators_report(validators):
+    return len(validators)
+
+
+def test_get_all__returns_services_in_registration_order():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_transient(IValidator, LengthValidator, multi=True)
+        .add_transient(IValidator, EmailValidator, multi=True)
+        .build()
+    )
+
+    length_validator, email_validator = container.get_all(IValidator)
+
+    assert isinstance(length_validator, LengthValidator)
+    assert length_validator.config is container.get(Config)
+    assert isinstance(email_validator, EmailValidator)
+
+
+def test_multi__members_keep_their_lifecycle():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_transient(IValidator, LengthValidator, multi=True)
+        .add_singleton(IValidator, EmailValidator, multi=True)
+        .build()
+    )
+
+    first = container.get_all(IValidator)
+    second = container.get_all(IValidator)
+
+    assert first is not second
+    assert first[0] is not second[0]
+    assert first[1] is second[1]
+
+
+def test_multi__when_all_members_are_singletons__then_collection_is_cached():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_singleton(IValidator, LengthValidator, multi=True)
+        .add_singleton(IValidator, EmailValidator, multi=True)
+        .build()
+    )
+
+    assert container.get_all(IValidator) is container.get_all(IValidator)
+
+
+def test_multi__when_no_member_is_transient__then_collection_is_cached_per_scope():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_scoped(IValidator, LengthValidator, multi=True)
+        .add_singleton(IValidator, EmailValidator, multi=True)
+        .build()
+    )
+
+    with container as scope_a, container as scope_b:
+        assert scope_a.get_all(IValidator) is scope_a.get_all(IValidator)
+        assert scope_a.get_all(IValidator) is not scope_b.get_all(IValidator)
+
+
+@pytest.mark.parametrize(
+    "form_class",
+    [
+        Form,
+        pytest.param(
+            AbcForm,
+            marks=pytest.mark.skipif(
+                sys.version_info < (3, 9), reason="requires subscriptable abc"
+            ),
+        ),
+    ],
+)
+def test_multi__collection_is_injected_into_sequence_hints(form_class):
+    container = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_transient(IValidator, LengthValidator, multi=True)
+        .add_transient(IValidator, EmailValidator, multi=True)
+        .add_transient(form_class)
+        .build()
+    )
+
+    validators = container.get(form_class).validators
+
+    assert isinstance(validators, tuple)
+    assert [type(validator) for validator in validators] == [
+        LengthValidator,
+        EmailValidator,
+    ]
+
+
+def test_multi__collection_is_created_by_a_tuple_display():
+    builder = (
+        ContainerBuilder(code_formatter=None)
+        .add_singleton(Config)
+        .add_transient(IValidator, LengthValidator, multi=True)
+        .add_transient(Form)
+    )
+
+    code = builder.get_code()
+
+    assert "validators=(\ntests.test_multi_binding.LengthValidator(" in code
+
+
+def test_multi__str_ids_are_injected_by_name():
+    builder = ContainerBuilder(inspector=ArgNameInspector())
+    builder.add_transient("validators", EmailValidator, multi=True)
+    builder.add_transient("validators", EmailValidator, multi=True)
+    builder.add_transient("report", create_validators_report)
+    container = builder.build()
+
+    assert container.get("report") == 2
+    assert len(container.get_all("validators")) == 2
+
+
+def test_multi__members_added_after_building_are_included():
+    builder = (
+        ContainerBuilder()
+        .add_singleton(Config)
+        .add_transient(IValidator, LengthValidator, multi=True)
+        .add_transient(Form)
+    )
+    builder.build()
+
+    container = builder.add_transient(IValidator, EmailValidator, multi=True).build()
+
+    assert len(container.get(Form).validators) == 2
+    assert len(container.get_all(IValidator)) == 2
+
+
+def test_get_all__when_nothing_was_registered__then_error_is_raised():
+    container = ContainerBuilder().build()
+
+    with pytest.raises(MissingServiceError):
+        container.get_all(IValidator)
+
+
+def test_multi__when_str_id_is_registered_with_and_without_multi__then_error_is_raised():
+    builder = ContainerBuilder(inspector=ArgNameInspector())
+    builder.add_transient("validators", EmailValidator)
+    with pytest.raises(ServiceConflictError):
+        builder.add_transient("validators", EmailValidator, multi=True)
+
+    builder = ContainerBuilder(inspector=ArgNameInspector())
+    builder.add_transient("validators", EmailValidator, multi=True)
+    with pytest.raises(ServiceConflictError):
+        builder.add_transient("validators", EmailValidator)
+
+
+def test_multi__members_are_only_resolved_through_their_collection():
+    container = (
+        ContainerBuilder().add_transient(IValidator, EmailValidator, multi=True).build()
+    )
+    member_id = get_member_id(IValidator, 0)
+
+    assert member_id not in container._service_getter_map
+    with pytest.raises(MissingServiceError):
+        container.get(member_id)
+    with pytest.raises(MissingServiceError):
+        container.get_many((member_id,))
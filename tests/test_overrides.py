@@ -0,0 +1,215 @@
+import asyncio
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder
+from meta_di.exceptions import MissingServiceError
+
+
+class Config:
+    pass
+
+
+class Repository:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+
+class FakeRepository:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+
+class Service:
+    def __init__(self, repository: Repository) -> None:
+        self.repository = repository
+
+
+class Handler:
+    def __init__(self, service: Service, repository: Repository) -> None:
+        self.service = service
+        self.repository = repository
+
+
+async def create_service() -> object:
+    return object()
+
+
+@pytest.fixture(scope="module")
+def container_class():
+    return (
+        ContainerBuilder(overrides=True)
+        .add_singleton(Config)
+        .add_transient(Repository)
+        .add_singleton(Service)
+        .add_transient(Handler)
+        .build_class()
+    )
+
+
+def test_override__replaces_the_service_and_its_inlined_uses(container_class):
+    container = container_class()
+    fake = object()
+
+    with container.override(Repository, fake):
+        handler = container.get(Handler)
+
+        assert container.get(Repository) is fake
+        assert handler.repository is fake
+        assert handler.service.repository is fake
+
+    assert isinstance(container.get(Handler).repository, Repository)
+
+
+def test_override__dependents_are_created_again_on_enter_and_exit(container_class):
+    container = container_class()
+    service = container.get(Service)
+
+    with container.override(Repository, object()):
+        overridden_service = container.get(Service)
+
+        assert overridden_service is not service
+
+    assert container.get(Service) is not overridden_service
+    assert isinstance(container.get(Service).repository, Repository)
+
+
+def test_override__providers_are_called_with_their_dependencies(container_class):
+    container = container_class()
+
+    with container.override(Repository, FakeRepository):
+        repository = container.get(Repository)
+
+        assert isinstance(repository, FakeRepository)
+        assert repository.config is container.get(Config)
+        assert container.get(Repository) is not repository
+
+
+class FakeConfig:
+    pass
+
+
+def test_override__singletons_overridden_by_a_provider_are_created_once(
+    container_class,
+):
+    container = container_class()
+    config = container.get(Config)
+
+    with container.override(Config, FakeConfig), container as scoped_container:
+        fake = container.get(Config)
+
+        assert isinstance(fake, FakeConfig)
+        assert container.get(Config) is fake
+        assert scoped_container.get(Config) is fake
+        assert container.get(Repository).config is fake
+
+    assert isinstance(container.get(Config), Config)
+    assert container.get(Config) is not config
+
+
+def test_override__scoped_services_overridden_by_a_provider_are_created_once_per_scope():
+    container = (
+        ContainerBuilder(overrides=True)
+        .add_singleton(Config)
+        .add_transient(Repository)
+        .add_scoped(Service)
+        .build()
+    )
+
+    with container.override(Service, FakeRepository):
+        with container as scope_a, container as scope_b:
+            service = scope_a.get(Service)
+
+            assert isinstance(service, FakeRepository)
+            assert scope_a.get(Service) is service
+            assert scope_b.get(Service) is not service
+
+
+def test_override__applies_to_scoped_containers(container_class):
+    container = container_class()
+    fake = object()
+
+    with container.override(Repository, fake), container as scoped_container:
+        assert scoped_container.get(Handler).repository is fake
+
+
+def test_override__scoped_dependents_cached_by_live_scopes_are_created_again():
+    container = (
+        ContainerBuilder(overrides=True)
+        .add_singleton(Config)
+        .add_transient(Repository)
+        .add_scoped(Service)
+        .build()
+    )
+    fake = object()
+
+    with container as scoped_container:
+        service = scoped_container.get(Service)
+        with container.override(Repository, fake):
+            assert scoped_container.get(Service).repository is fake
+
+        assert scoped_container.get(Service) is not service
+        assert isinstance(scoped_container.get(Service).repository, Repository)
+
+
+def test_override__applies_to_batches_and_wirings(container_class):
+    container = container_class()
+    fake = object()
+
+    def handle(repository: Repository, handler: Handler) -> Repository:
+        return repository
+
+    with container.override(Repository, fake):
+        (repository,) = container.get_many((Repository,))
+        batch_repository, batch_handler = container.compile_batch(
+            (Repository, Handler)
+        )()
+
+        assert repository is fake
+        assert batch_repository is fake
+        assert batch_handler.repository is fake
+        assert container.wire(handle)() is fake
+
+
+def test_override__nested_overrides_are_restored(container_class):
+    container = container_class()
+    outer, inner = object(), object()
+
+    with container.override(Repository, outer):
+        with container.override(Repository, inner):
+            assert container.get(Repository) is inner
+
+        assert container.get(Repository) is outer
+
+
+def test_override__containers_of_the_same_class_are_not_affected(container_class):
+    container = container_class()
+    other_container = container_class()
+
+    with container.override(Repository, object()):
+        assert isinstance(other_container.get(Repository), Repository)
+
+
+def test_override__async_services_can_be_overridden():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector(), overrides=True)
+        .add_singleton("service", create_service)
+        .build()
+    )
+    fake = object()
+
+    with container.override("service", fake):
+        assert asyncio.run(container.aget("service")) is fake
+        assert container.get("service") is fake
+
+
+def test_override__when_service_is_missing__then_error_is_raised(container_class):
+    with pytest.raises(MissingServiceError):
+        container_class().override(int, 1)
+
+
+def test_override__when_disabled__then_code_has_no_overrides():
+    builder = ContainerBuilder().add_transient(Config)
+
+    assert "self._overrides" not in builder.get_code()
+    assert not hasattr(builder.build(), "override")
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder
+from meta_di.pooling import PoolStats, ServicePool
+
+
+class Parser:
+    def __init__(self) -> None:
+        self.buffer = []
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Handler:
+    def __init__(self, parser: Parser) -> None:
+        self.parser = parser
+
+
+def reset_parser(parser: Parser) -> None:
+    parser.buffer.clear()
+
+
+def fail_reset(parser: Parser) -> None:
+    raise ValueError("cannot reset")
+
+
+async def create_async_parser() -> Parser:
+    return Parser()
+
+
+def test_pooled__instance_is_shared_within_a_scope():
+    container = ContainerBuilder().add_pooled(Parser).add_transient(Handler).build()
+
+    with container as scoped_container:
+        parser = scoped_container.get(Parser)
+
+        assert scoped_container.get(Parser) is parser
+        assert scoped_container.get(Handler).parser is parser
+
+
+def test_pooled__instance_is_reused_by_later_scopes():
+    container = ContainerBuilder().add_pooled(Parser).build()
+
+    with container as scoped_container:
+        parser = scoped_container.get(Parser)
+
+    with container as scoped_container:
+        assert scoped_container.get(Parser) is parser
+        assert not parser.closed
+
+
+def test_pooled__concurrent_scopes_get_different_instances():
+    container = ContainerBuilder().add_pooled(Parser).build()
+
+    with container as scope_a, container as scope_b:
+        assert scope_a.get(Parser) is not scope_b.get(Parser)
+
+
+def test_pooled__reset_is_called_before_the_instance_goes_back_to_the_pool():
+    container = ContainerBuilder().add_pooled(Parser, reset=reset_parser).build()
+
+    with container as scoped_container:
+        scoped_container.get(Parser).buffer.append("data")
+
+    with container as scoped_container:
+        assert scoped_container.get(Parser).buffer == []
+
+
+def test_pooled__when_reset_fails__then_instance_is_discarded():
+    container = ContainerBuilder().add_pooled(Parser, reset=fail_reset).build()
+
+    scoped_container = container.create_scope()
+    parser = scoped_container.get(Parser)
+    with pytest.raises(ValueError):
+        scoped_container.close()
+
+    assert parser.closed
+    assert container.pool_stats()[Parser].discarded == 1
+    assert container.create_scope().get(Parser) is not parser
+
+
+def test_pooled__when_pool_is_full__then_instances_are_disposed():
+    container = ContainerBuilder().add_pooled(Parser, pool_size=1).build()
+
+    with container as scope_a, container as scope_b:
+        parser_a = scope_a.get(Parser)
+        parser_b = scope_b.get(Parser)
+
+    assert parser_a.closed != parser_b.closed
+    assert container.pool_stats()[Parser].size == 1
+
+
+def test_pooled__stats():
+    container = ContainerBuilder().add_pooled(Parser, pool_size=4).build()
+
+    with container as scope_a, container as scope_b:
+        scope_a.get(Parser)
+        scope_b.get(Parser)
+        assert container.pool_stats()[Parser].in_use == 2
+
+    with container as scoped_container:
+        scoped_container.get(Parser)
+
+    assert container.pool_stats() == {
+        Parser: PoolStats(
+            size=2,
+            max_size=4,
+            in_use=0,
+            high_water_mark=2,
+            hits=1,
+            misses=2,
+            discarded=0,
+        )
+    }
+
+
+def test_pooled__when_container_is_closed__then_idle_instances_are_disposed():
+    container = ContainerBuilder().add_pooled(Parser).build()
+
+    with container as scoped_container:
+        parser = scoped_container.get(Parser)
+
+    container.close()
+
+    assert parser.closed
+    assert container.pool_stats()[Parser].size == 0
+
+
+def test_pooled__async_provider():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector())
+        .add_pooled("parser", create_async_parser)
+        .build()
+    )
+
+    async def main():
+        async with container as scoped_container:
+            parser = await scoped_container.aget("parser")
+            assert await scoped_container.aget("parser") is parser
+
+        async with container as scoped_container:
+            assert await scoped_container.aget("parser") is parser
+
+    asyncio.run(main())
+
+
+def test_pooled__thread_safe():
+    container = ContainerBuilder(thread_safe=True).add_pooled(Parser).build()
+
+    with container as scoped_container:
+        parser = scoped_container.get(Parser)
+
+    with container as scoped_container:
+        assert scoped_container.get(Parser) is parser
+
+
+def test_pooled__when_service_becomes_pooled_after_building__then_class_is_rebuilt():
+    builder = ContainerBuilder().add_scoped(Parser).add_transient(Handler)
+    builder.build()
+
+    container = builder.add_pooled(Parser).build()
+
+    with container as scoped_container:
+        parser = scoped_container.get(Handler).parser
+
+    with container as scoped_container:
+        assert scoped_container.get(Handler).parser is parser
+
+
+def test_service_pool__when_pool_is_empty__then_acquire_returns_none():
+    pool = ServicePool(max_size=1)
+
+    assert pool.acquire() is None
+
+    parser = Parser()
+    pool.lease(parser).close()
+
+    assert pool.acquire() is parser
@@ -0,0 +1,49 @@
+from meta_di import ContainerBuilder
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ScopedService,
+    SingletonService,
+)
+
+
+def _get_builder(**kwargs):
+    return (
+        ContainerBuilder(**kwargs)
+        .add_singleton(ISingletonService, SingletonService)
+        .add_scoped(IScopedService, ScopedService)
+    )
+
+
+def test_create_scope__getter_table_is_shared_by_the_class():
+    container = _get_builder().build()
+    scope = container.create_scope()
+
+    assert "_service_getter_map" not in vars(scope)
+    assert scope.get(ISingletonService) is container.get(ISingletonService)
+
+
+def test_create_scope__when_pooling__then_closed_scopes_are_reused():
+    container = _get_builder(scope_pool_size=1).build()
+
+    with container as scope1:
+        scoped1 = scope1.get(IScopedService)
+
+    with container as scope2:
+        scoped2 = scope2.get(IScopedService)
+
+    assert scope1 is scope2
+    assert scoped1 is not scoped2
+
+
+def test_create_scope__when_pool_is_full__then_closed_scopes_are_dropped():
+    container = _get_builder(scope_pool_size=1).build()
+    scope1 = container.create_scope()
+    scope2 = container.create_scope()
+
+    scope1.close()
+    scope2.close()
+    scope1.close()
+
+    assert container.create_scope() is scope1
+    assert container.create_scope() is not scope2
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from meta_di import ContainerBuilder
+
+created = []
+
+
+class SlowService:
+    def __init__(self) -> None:
+        time.sleep(0.2)
+        created.append((type(self), threading.get_ident()))
+
+
+class SlowServiceA(SlowService):
+    ...
+
+
+class SlowServiceB(SlowService):
+    ...
+
+
+class SlowServiceC(SlowService):
+    ...
+
+
+class Config:
+    def __init__(self) -> None:
+        created.append((type(self), threading.get_ident()))
+
+
+class Client:
+    def __init__(self, config: Config) -> None:
+        created.append((type(self), threading.get_ident()))
+        self.config = config
+
+
+class Repository:
+    def __init__(self, client: Client) -> None:
+        created.append((type(self), threading.get_ident()))
+        self.client = client
+
+
+class DependsOnSlowServices:
+    def __init__(self, a: SlowServiceA, b: SlowServiceB, c: SlowServiceC) -> None:
+        created.append((type(self), threading.get_ident()))
+
+
+def _created_types():
+    return [service_type for service_type, _ in created]
+
+
+def setup_function():
+    created.clear()
+
+
+def test_preload__when_singleton_is_lazy__then_it_is_created_on_first_use():
+    container = ContainerBuilder().add_singleton(Config, preload=False).build()
+
+    assert not created
+
+    assert container.get(Config) is container.get(Config)
+    assert _created_types() == [Config]
+
+
+def test_preload__when_builder_default_is_lazy__then_preload_can_be_enabled_per_service():
+    container = (
+        ContainerBuilder(preload_singleton_instances=False)
+        .add_singleton(Config)
+        .add_singleton(Client, preload=True)
+        .build()
+    )
+
+    assert _created_types() == [Config, Client]
+    assert container.get(Client).config is container.get(Config)
+
+
+def test_preload__dependencies_are_created_first_regardless_of_registration_order():
+    container = (
+        ContainerBuilder()
+        .add_singleton(Repository)
+        .add_transient(Client)
+        .add_singleton(Config)
+        .build()
+    )
+
+    assert _created_types() == [Config, Client, Repository]
+    assert container.get(Repository).client.config is container.get(Config)
+
+
+def test_preload__when_singleton_is_created_by_a_scope__then_it_is_shared():
+    container = ContainerBuilder().add_singleton(Config, preload=False).build()
+
+    with container as scoped_container:
+        config = scoped_container.get(Config)
+
+    assert container.get(Config) is config
+
+
+def test_preload__when_using_workers__then_independent_singletons_are_created_concurrently():
+    start = time.perf_counter()
+    container = (
+        ContainerBuilder(preload_workers=3)
+        .add_singleton(DependsOnSlowServices)
+        .add_singleton(SlowServiceA)
+        .add_singleton(SlowServiceB)
+        .add_singleton(SlowServiceC)
+        .build()
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert _created_types()[-1] is DependsOnSlowServices
+    assert len({thread_id for _, thread_id in created[:-1]}) == 3
+    assert isinstance(container.get(DependsOnSlowServices), DependsOnSlowServices)
@@ -0,0 +1,165 @@
+import pytest
+
+from meta_di import ContainerBuilder, ForkPolicy
+from meta_di.forking import _reinit_in_child
+from meta_di.slots import EMPTY
+
+
+class Config:
+    pass
+
+
+class Connection:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Repository:
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+
+
+class Handler:
+    def __init__(self, repository: Repository, config: Config) -> None:
+        self.repository = repository
+        self.config = config
+
+
+class Plugin:
+    def __init__(self, repository: Repository) -> None:
+        self.repository = repository
+
+
+def create_nothing() -> None:
+    return None
+
+
+class NoneHolder:
+    pass
+
+
+def _builder(**kwargs):
+    return (
+        ContainerBuilder(slots=True, **kwargs)
+        .add_singleton(Config)
+        .add_singleton(Connection, preload=False)
+        .add_scoped(Repository)
+        .add_transient(Handler)
+    )
+
+
+def test_slots__singleton_and_scoped_instances_are_cached():
+    container = _builder().build()
+
+    with container as scope:
+        repository = scope.get(Repository)
+
+        assert scope.get(Repository) is repository
+        assert scope.get(Handler).repository is repository
+        assert scope.get(Connection) is container.get(Connection)
+    with container as other_scope:
+        assert other_scope.get(Repository) is not repository
+
+
+def test_slots__none_instances_are_cached():
+    container = (
+        ContainerBuilder(slots=True)
+        .add_singleton(NoneHolder, create_nothing, preload=False)
+        .build()
+    )
+
+    assert container.get(NoneHolder) is None
+    assert container.get(NoneHolder) is None
+    assert EMPTY not in container._singleton_instances
+
+
+def test_slots__instances_are_stored_in_lists_and_scopes_have_no_dict():
+    container = _builder().build()
+    scope = container.create_scope()
+
+    assert isinstance(scope._scoped_instances, list)
+    assert isinstance(scope._singleton_instances, list)
+    assert not hasattr(scope, "__dict__")
+
+
+def test_slots__scoped_instances_are_dropped_on_close():
+    container = _builder().build()
+    scope = container.create_scope()
+    repository = scope.get(Repository)
+
+    scope.close()
+
+    assert scope._scoped_instances == [EMPTY]
+    assert scope.get(Repository) is not repository
+
+
+def test_slots__generated_code_loads_instances_by_index():
+    code = _builder().get_code()
+
+    assert "is not _EMPTY" in code
+    assert "self._singleton_instances[tests" not in code
+    assert "__slots__" in code
+
+
+def test_slots__incremental_build_gives_new_services_new_slots():
+    builder = _builder()
+    builder.build_class()
+    builder.add_scoped(Plugin)
+    container = builder.build()
+
+    with container as scope:
+        plugin = scope.get(Plugin)
+
+        assert scope.get(Plugin) is plugin
+        assert plugin.repository is scope.get(Repository)
+        assert len(scope._scoped_instances) == 2
+
+
+def test_slots__batches_and_wirings_use_the_slots_of_the_class():
+    container = _builder().build()
+    config = container.get(Config)
+
+    def handle(handler: Handler, config: Config) -> Config:
+        return config
+
+    with container as scope:
+        repository, handler = scope.get_many((Repository, Handler))
+
+        assert handler.repository is repository
+        assert handler.config is config
+        assert scope.wire(handle)() is config
+
+
+def test_slots__reinit_drops_the_slots_of_reinit_singletons():
+    container = (
+        ContainerBuilder(slots=True)
+        .add_singleton(Config)
+        .add_singleton(Connection, fork_policy=ForkPolicy.REINIT)
+        .build()
+    )
+    config = container.get(Config)
+    connection = container.get(Connection)
+
+    _reinit_in_child()
+    container.close()
+
+    assert container.get(Config) is config
+    assert container.get(Connection) is not connection
+    assert not connection.closed
+
+
+@pytest.mark.parametrize("thread_safe", [False, True])
+def test_slots__overrides_drop_the_slots_of_dependents(thread_safe):
+    container = _builder(overrides=True, thread_safe=thread_safe).build()
+    fake = Connection(Config())
+
+    with container as scope:
+        repository = scope.get(Repository)
+        with scope.override(Connection, fake):
+            assert scope.get(Repository).connection is fake
+        assert scope.get(Repository) is not repository
+        assert scope.get(Repository).connection is not fake
@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from meta_di import ContainerBuilder
+
+THREADS = 8
+
+
+class ExpensiveService:
+    instances = 0
+
+    def __init__(self) -> None:
+        time.sleep(0.05)
+        ExpensiveService.instances += 1
+
+
+def _resolve_concurrently(container):
+    barrier = threading.Barrier(THREADS)
+
+    def resolve(_):
+        barrier.wait()
+        return container.get(ExpensiveService)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(resolve, range(THREADS)))
+
+
+def setup_function():
+    ExpensiveService.instances = 0
+
+
+def test_thread_safe__lazy_singleton_is_created_once():
+    container = (
+        ContainerBuilder(thread_safe=True)
+        .add_singleton(ExpensiveService, preload=False)
+        .build()
+    )
+
+    instances = _resolve_concurrently(container)
+
+    assert ExpensiveService.instances == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_thread_safe__singleton_is_created_once_across_scopes():
+    container = (
+        ContainerBuilder(thread_safe=True)
+        .add_singleton(ExpensiveService, preload=False)
+        .build()
+    )
+    scopes = [container.create_scope() for _ in range(THREADS)]
+    barrier = threading.Barrier(THREADS)
+
+    def resolve(scope):
+        barrier.wait()
+        return scope.get(ExpensiveService)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        instances = list(executor.map(resolve, scopes))
+
+    assert ExpensiveService.instances == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_thread_safe__scoped_service_is_created_once_per_scope():
+    container = ContainerBuilder(thread_safe=True).add_scoped(ExpensiveService).build()
+
+    with container as scoped_container:
+        instances = _resolve_concurrently(scoped_container)
+
+    assert ExpensiveService.instances == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+class OtherExpensiveService:
+    def __init__(self) -> None:
+        time.sleep(0.2)
+
+
+class SlowService:
+    def __init__(self) -> None:
+        time.sleep(0.2)
+
+
+def test_thread_safe__different_singletons_are_created_concurrently():
+    container = (
+        ContainerBuilder(thread_safe=True, preload_workers=2)
+        .add_singleton(OtherExpensiveService)
+        .add_singleton(SlowService)
+        .build_class()
+    )
+
+    start = time.perf_counter()
+    container()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
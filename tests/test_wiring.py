@@ -0,0 +1,270 @@
+import asyncio
+
+import pytest
+
+from meta_di import ArgNameInspector, ContainerBuilder, ContainerProto
+from meta_di.exceptions import AsyncServiceError
+from meta_di.wiring import create_wiring
+from tests.conftest import (
+    IScopedService,
+    ISingletonService,
+    ITransientService,
+    ScopedService,
+    SingletonService,
+    TransientService,
+)
+
+
+class Request:
+    pass
+
+
+async def create_async_service() -> object:
+    return object()
+
+
+def handler(
+    request: Request,
+    singleton: ISingletonService,
+    scoped: IScopedService,
+    transient: ITransientService,
+):
+    return request, singleton, scoped, transient
+
+
+def test_wire__injects_services_and_passes_caller_arguments(container):
+    request = Request()
+
+    with container as scoped_container:
+        wired_request, singleton, scoped, transient = scoped_container.wire(handler)(
+            request
+        )
+
+        assert wired_request is request
+        assert isinstance(singleton, SingletonService)
+        assert scoped is scoped_container.get(IScopedService)
+        assert isinstance(transient, TransientService)
+        assert transient.scoped is scoped
+        assert transient.singleton is singleton
+
+
+def test_wire__when_services_are_passed_by_keyword__then_they_are_not_injected(
+    container,
+):
+    singleton = SingletonService()
+    transient = object()
+
+    with container as scoped_container:
+        result = scoped_container.wire(handler)(
+            Request(), transient=transient, singleton=singleton
+        )
+
+        assert result[1] is singleton
+        assert result[2] is scoped_container.get(IScopedService)
+        assert result[3] is transient
+
+
+def test_wire__when_services_are_passed_positionally__then_they_are_not_injected(
+    container,
+):
+    request, singleton, scoped = Request(), SingletonService(), object()
+
+    with container as scoped_container:
+        result = scoped_container.wire(handler)(request, singleton, scoped)
+
+        assert result[:3] == (request, singleton, scoped)
+        assert isinstance(result[3], TransientService)
+        assert result[3].scoped is scoped_container.get(IScopedService)
+
+
+def test_wire__keyword_only_services_are_injected_unless_passed(container):
+    def keyword_only_handler(*args, singleton: ISingletonService):
+        return args, singleton
+
+    singleton = SingletonService()
+    wrapper = container.wire(keyword_only_handler)
+
+    assert wrapper(1, 2) == ((1, 2), container.get(ISingletonService))
+    assert wrapper(1, singleton=singleton) == ((1,), singleton)
+
+
+def test_wire__keeps_the_metadata_of_the_function(container):
+    wrapper = container.wire(handler)
+
+    assert wrapper.__name__ == "handler"
+    assert wrapper.__wrapped__ is handler
+
+
+def test_wire__can_be_used_as_decorator(container):
+    @container.wire
+    def get_singleton(singleton: ISingletonService):
+        return singleton
+
+    assert get_singleton() is container.get(ISingletonService)
+
+
+def test_wire__wrappers_resolve_from_the_container_they_were_created_from(
+    container_class,
+):
+    container = container_class()
+
+    with container as scope_a, container as scope_b:
+        _, _, scoped_a, _ = scope_a.wire(handler)(Request())
+        _, _, scoped_b, _ = scope_b.wire(handler)(Request())
+
+        assert scoped_a is scope_a.get(IScopedService)
+        assert scoped_b is scope_b.get(IScopedService)
+        assert scoped_a is not scoped_b
+
+
+def test_wire__wirings_are_shared_between_containers_of_a_class(container_class):
+    container_class().wire(handler)
+    container_class().wire(handler)
+
+    assert list(container_class._wirings) == [handler]
+
+
+def test_wire__when_container_is_requested_by_annotation__then_it_is_injected(
+    container,
+):
+    def get_container(di: ContainerProto, singleton: ISingletonService):
+        return di, singleton
+
+    assert container.wire(get_container)() == (
+        container,
+        container.get(ISingletonService),
+    )
+
+
+def test_wire__when_container_is_requested__then_it_is_injected():
+    container = ContainerBuilder(
+        inspector=ArgNameInspector(), container_svc_ids={"di_container"}
+    ).build()
+
+    def get_container(di_container):
+        return di_container
+
+    assert container.wire(get_container)() is container
+
+
+def test_wire__when_service_is_async_and_function_is_sync__then_error_is_raised():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector())
+        .add_scoped("service", create_async_service)
+        .build()
+    )
+
+    def sync_handler(service):
+        return service
+
+    with pytest.raises(AsyncServiceError):
+        container.wire(sync_handler)
+
+
+def test_wire__when_function_is_async__then_async_services_are_injected():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector())
+        .add_scoped("service", create_async_service)
+        .build()
+    )
+
+    async def async_handler(service):
+        return service
+
+    async def main():
+        async with container as scoped_container:
+            service = await scoped_container.wire(async_handler)()
+            assert service is await scoped_container.aget("service")
+
+    asyncio.run(main())
+
+
+def test_wire__when_function_is_async_and_a_service_is_passed__then_others_are_injected():
+    container = (
+        ContainerBuilder(inspector=ArgNameInspector())
+        .add_scoped("service", create_async_service)
+        .add_scoped("other", create_async_service)
+        .build()
+    )
+
+    async def async_handler(service, other):
+        return service, other
+
+    async def main():
+        async with container as scoped_container:
+            service, other = await scoped_container.wire(async_handler)(other="passed")
+            assert service is await scoped_container.aget("service")
+            assert other == "passed"
+
+    asyncio.run(main())
+
+
+def test_wire__after_incremental_build__then_new_services_are_injected():
+    builder = ContainerBuilder().add_singleton(ISingletonService, SingletonService)
+    builder.build().wire(handler)
+
+    builder.add_scoped(IScopedService, ScopedService)
+    container = builder.build()
+
+    _, _, scoped, _ = container.wire(handler)(Request(), transient=None)
+
+    assert isinstance(scoped, ScopedService)
+
+
+def test_create_wiring__matches_services_by_annotation_or_name():
+    class FakeContainer:
+        def get(self, service_id):
+            return service_id
+
+    wiring = create_wiring({ISingletonService, "request"}, handler)
+    wrapper = wiring(FakeContainer(), handler)
+
+    assert wrapper(scoped="scoped", transient="transient") == (
+        "request",
+        ISingletonService,
+        "scoped",
+        "transient",
+    )
+    assert wrapper("passed", scoped="scoped", transient="transient") == (
+        "passed",
+        ISingletonService,
+        "scoped",
+        "transient",
+    )
+
+
+def test_create_wiring__injects_the_container_and_skips_passed_services():
+    class FakeContainer:
+        def get(self, service_id):
+            return service_id
+
+    def get_container(container: ContainerProto, singleton: ISingletonService):
+        return container, singleton
+
+    container = FakeContainer()
+    wrapper = create_wiring({ISingletonService}, get_container, {ContainerProto})(
+        container, get_container
+    )
+
+    assert wrapper() == (container, ISingletonService)
+    assert wrapper(singleton="passed") == (container, "passed")
+
+
+def test_wire__when_container_class_has_no_wiring_compiler__then_getters_are_used(
+    container_class,
+):
+    def get_container(di: ContainerProto):
+        return di
+
+    class PrecompiledContainer(container_class):
+        _wiring_compiler = None
+        _wirings = {}
+
+    container = PrecompiledContainer()
+
+    _, singleton, _, transient = container.wire(handler)(Request())
+
+    assert singleton is container.get(ISingletonService)
+    assert isinstance(transient, TransientService)
+    assert container.wire(get_container)() is container
+    assert container.wire(handler)(Request(), transient="passed")[3] == "passed"